@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from hospital_management.database import tune_sqlite
+        from hospital_management.fragments import connect_signals
+        connection_created.connect(tune_sqlite)
+        connect_signals()
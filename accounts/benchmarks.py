@@ -0,0 +1,178 @@
+# accounts/benchmarks.py
+"""
+Benchmarks for the busiest pages.
+
+For each scale the suite creates a throwaway test database, seeds it with
+LoadDataGenerator, logs in a superuser and requests every page in
+BENCHMARKS several times with the test client. Each page gets latency
+percentiles (p50/p90/p95/max, in milliseconds) and its query count, measured
+with hospital_management.profiling.profile.
+
+``find_regressions`` compares a run with the baseline stored in
+benchmarks/baseline.json: a page fails when it does not answer 200, when it
+runs more queries than before, or when its p50 slows down by more than the
+tolerance. A query count that grows with the data between the
+smallest and largest scale is reported too, since that is what an N+1 looks
+like, unless the baseline already grew by as much.
+"""
+import math
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import reverse
+
+from hospital_management.profiling import profile
+
+from .load_data import LoadDataGenerator
+
+DEFAULT_SCALES = (0.01, 0.05)
+DEFAULT_REPEAT = 10
+LATENCY_TOLERANCE = 0.5
+# Differences below this are timer noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 10.0
+
+# (benchmark name, url name, url args)
+BENCHMARKS = [
+    ('dashboard', 'dashboard', []),
+    ('patient_list', 'patients:patient_list', []),
+    ('bill_list', 'billing:bill_list', []),
+    ('appointment_list', 'appointments:appointment_list', []),
+    ('medical_record_list', 'medical_records:medical_record_list', []),
+    ('medicine_list', 'pharmacy:medicine_list', []),
+    ('reports_home', 'reports:reports_home', []),
+    ('daily_appointments_report', 'reports:daily_appointments_report', []),
+    ('daily_billing_report', 'reports:daily_billing_report', []),
+    ('medicine_stock_report', 'reports:medicine_stock_report', []),
+    ('doctor_appointments_report', 'reports:doctor_appointments_report', []),
+    ('attendance_report', 'attendance:attendance_report', []),
+    ('financial_dashboard', 'financial:financial_dashboard', []),
+    ('supplier_performance', 'suppliers:supplier_performance', []),
+    ('export_pdf_medicine_stock', 'reports:export_report_pdf', ['medicine_stock']),
+    ('export_pdf_daily_appointments', 'reports:export_report_pdf', ['daily_appointments']),
+    ('export_excel_medicine_stock', 'reports:export_report_excel', ['medicine_stock']),
+    ('export_excel_daily_appointments', 'reports:export_report_excel', ['daily_appointments']),
+    ('export_csv_medicine_stock', 'reports:export_report_csv', ['medicine_stock']),
+]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def fetch(client, url):
+    """GET ``url``, reading a streamed body too: its rows are queried and rendered as it is read."""
+    response = client.get(url)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def benchmark_page(client, url, repeat):
+    """Time ``repeat`` GETs of ``url`` after one warm-up request."""
+    response = fetch(client, url)
+    if response.status_code != 200:
+        return {'url': url, 'status': response.status_code}
+
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        with profile(url) as stats:
+            started = time.perf_counter()
+            fetch(client, url)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, stats.query_count)
+    return {
+        'url': url,
+        'status': 200,
+        'queries': queries,
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p90_ms': round(percentile(timings, 0.90), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'max_ms': round(max(timings), 2),
+    }
+
+
+def run_scale(scale, repeat=DEFAULT_REPEAT, seed=0, log=None):
+    """Seed a fresh test database at ``scale`` and benchmark every page in it."""
+    log = log or (lambda message: None)
+    old_config = setup_databases(verbosity=0, interactive=False)
+    # An in-memory SQLite test database outlives teardown while widget threads keep connections to it
+    call_command('flush', interactive=False, verbosity=0)
+    cache.clear()  # Cached pages from a previous scale would refer to other rows
+    try:
+        started = time.perf_counter()
+        counts = LoadDataGenerator.scaled(scale, seed=seed).run()
+        log(f'Scale {scale}: seeded {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s')
+
+        user, _ = User.objects.get_or_create(
+            username='benchmark', defaults={'email': 'benchmark@example.com', 'is_staff': True, 'is_superuser': True},
+        )
+        client = Client()
+        client.force_login(user)
+        results = {}
+        for name, url_name, args in BENCHMARKS:
+            results[name] = benchmark_page(client, reverse(url_name, args=args), repeat)
+            result = results[name]
+            if result['status'] == 200:
+                log(f"  {name}: p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, {result['queries']} queries")
+            else:
+                log(f"  {name}: FAILED (HTTP {result['status']})")
+        return {'rows': counts, 'pages': results}
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+def run_suite(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, seed=0, log=None):
+    return {
+        'repeat': repeat,
+        'seed': seed,
+        'scales': {str(scale): run_scale(scale, repeat, seed, log) for scale in scales},
+    }
+
+
+def find_regressions(results, baseline=None, latency_tolerance=LATENCY_TOLERANCE):
+    """Return a list of human-readable regressions (empty when everything is within bounds)."""
+    regressions = []
+
+    for scale, run in results['scales'].items():
+        previous = (baseline or {}).get('scales', {}).get(scale, {}).get('pages', {})
+        for name, page in run['pages'].items():
+            if page['status'] != 200:
+                regressions.append(f"{name} @ scale {scale}: HTTP {page['status']}")
+                continue
+            before = previous.get(name)
+            if not before or before.get('status') != 200:
+                continue
+            if page['queries'] > before['queries']:
+                regressions.append(f"{name} @ scale {scale}: {page['queries']} queries (baseline {before['queries']})")
+            slower = page['p50_ms'] - before['p50_ms']
+            if slower > MIN_LATENCY_DELTA_MS and page['p50_ms'] > before['p50_ms'] * (1 + latency_tolerance):
+                regressions.append(f"{name} @ scale {scale}: p50 {page['p50_ms']}ms (baseline {before['p50_ms']}ms)")
+
+    # Query counts should not depend on how much data there is; growth the baseline already had is accepted
+    for name, growth in _query_growth(results).items():
+        accepted = _query_growth(baseline).get(name, 0) if baseline else 0
+        if growth > accepted:
+            regressions.append(f'{name}: runs {growth} more queries at the largest scale than at the smallest')
+    return regressions
+
+
+def _query_growth(results):
+    """{page: extra queries at the largest scale compared with the smallest} for pages that grow."""
+    scales = sorted(results.get('scales', {}), key=float)
+    if len(scales) < 2:
+        return {}
+    smallest = results['scales'][scales[0]]['pages']
+    largest = results['scales'][scales[-1]]['pages']
+    growth = {}
+    for name, page in largest.items():
+        small = smallest.get(name, {})
+        if page['status'] == 200 and small.get('status') == 200 and page['queries'] > small['queries']:
+            growth[name] = page['queries'] - small['queries']
+    return growth
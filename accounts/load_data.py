@@ -0,0 +1,619 @@
+# accounts/load_data.py
+"""
+Synthetic data for load and benchmark testing.
+
+LoadDataGenerator fills every app with realistic rows at a chosen volume:
+users, doctors, patients and employees, appointments, medical records and
+bills spread over the last few years, medicines with batches and dispensing
+history, suppliers with purchase orders, daily attendance, leaves, salaries
+and ledger transactions. Rows are built in memory one chunk at a time and
+written with bulk_create, so memory stays flat at any volume.
+
+The data only depends on the seed and the anchor date it ends on
+(ANCHOR_DATE unless ``today`` is given): all randomness comes from one
+seeded random.Random, and usernames and document numbers are the seed's
+tag followed by a count, so the same seed produces the same rows in any
+database. Loading more data into one database takes another seed. Every
+generated user shares one password hashed once up front, which keeps
+generation I/O-bound instead of spending most of its time in PBKDF2.
+
+For a small demo database, run ``generate_load_data --scale 0.001`` and
+``createsuperuser``.
+
+bulk_create skips save() and signals, so derived tables (search index,
+vitals, term index, supplier performance, reorder suggestions) are rebuilt
+afterwards by their own commands; see ``generate_load_data --rebuild``.
+"""
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Sum, Q, Value, DecimalField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from appointments.models import Appointment
+from attendance.models import Attendance, Leave
+from billing.models import Bill
+from doctors.models import Doctor
+from employees.models import Employee, Salary
+from financial.models import Account, Transaction
+from hospital_management.fragments import bump
+from medical_records.models import MedicalRecord
+from patients.models import Patient
+from pharmacy.models import Medicine, MedicineBatch, StockMovement
+from suppliers.models import Supplier, PurchaseOrder, PurchaseOrderItem
+
+from .models import UserProfile
+
+CHUNK_SIZE = 5000
+PASSWORD = 'loadtest123'
+# Generated dates end here, so a seed gives the same data whenever it is run
+ANCHOR_DATE = date(2025, 1, 1)
+# The seed is part of every generated ID; larger ones would not fit the ID columns
+MAX_SEED = 9999
+
+# Volumes at scale 1; ``scale`` multiplies every row count (not attendance_days or years)
+DEFAULT_VOLUMES = {
+    'doctors': 50,
+    'patients': 10000,
+    'appointments': 100000,
+    'medical_records': 30000,
+    'bills': 30000,
+    'employees': 100,
+    'attendance_days': 365,
+    'medicines': 500,
+    'dispenses': 50000,
+    'suppliers': 50,
+    'purchase_orders': 1000,
+    'transactions': 20000,
+    'years': 3,
+}
+UNSCALED = {'attendance_days', 'years'}
+
+FIRST_NAMES = ['Rahim', 'Karim', 'Abdul', 'Nusrat', 'Farhana', 'Tanvir', 'Sadia', 'Mahmud', 'Rafiq', 'Ayesha',
+               'Imran', 'Sumaiya', 'Hasan', 'Nadia', 'Arif', 'Sharmin', 'Jahid', 'Tania', 'Shakil', 'Rupa',
+               'Mehedi', 'Fatema', 'Sabbir', 'Mim', 'Rakib', 'Lamia', 'Zahid', 'Riya', 'Asif', 'Munni']
+LAST_NAMES = ['Hossain', 'Rahman', 'Islam', 'Ahmed', 'Chowdhury', 'Khan', 'Uddin', 'Akter', 'Sarkar', 'Talukder',
+              'Mia', 'Begum', 'Haque', 'Karim', 'Alam', 'Sultana', 'Biswas', 'Das', 'Roy', 'Saha']
+CITIES = ['Dhaka', 'Chattogram', 'Khulna', 'Rajshahi', 'Sylhet', 'Barishal', 'Rangpur', 'Mymensingh', 'Cumilla', 'Gazipur']
+SPECIALIZATIONS = ['Medicine', 'Cardiology', 'Pediatrics', 'Gynecology', 'Orthopedics', 'Dermatology', 'ENT',
+                   'Neurology', 'Psychiatry', 'Ophthalmology', 'Urology', 'Gastroenterology']
+QUALIFICATIONS = ['MBBS', 'MBBS, FCPS', 'MBBS, MD', 'MBBS, MS', 'MBBS, FRCS', 'MBBS, DCH']
+APPOINTMENT_TYPES = ['Consultation', 'Follow-up', 'Routine Checkup', 'Vaccination', 'Emergency', 'Lab Review']
+SYMPTOMS = ['Fever', 'Cough', 'Headache', 'Chest pain', 'Back pain', 'Abdominal pain', 'Shortness of breath',
+            'Dizziness', 'Skin rash', 'Joint pain', 'Fatigue', 'Sore throat', 'Vomiting', 'Diarrhoea']
+DIAGNOSES = ['Viral fever', 'Hypertension', 'Type 2 Diabetes', 'Acute Bronchitis', 'Gastritis', 'Migraine',
+             'Dengue fever', 'Typhoid', 'Asthma', 'Urinary tract infection', 'Allergic rhinitis', 'Anaemia',
+             'Osteoarthritis', 'Peptic ulcer', 'Pneumonia', 'Hypothyroidism', 'Sinusitis', 'Dermatitis']
+LAB_TESTS = ['CBC', 'ESR', 'RBS', 'FBS', 'Lipid profile', 'Serum creatinine', 'Urine R/E', 'Chest X-ray', 'ECG',
+             'SGPT', 'TSH', 'HbA1c', 'Dengue NS1', 'Widal test']
+DRUGS = [('Napa', 'Tab.', '500mg'), ('Seclo', 'Cap.', '20mg'), ('Amdocal', 'Tab.', '5mg'), ('Metfo', 'Tab.', '500mg'),
+         ('Fexo', 'Tab.', '120mg'), ('Azithrocin', 'Tab.', '500mg'), ('Monas', 'Tab.', '10mg'), ('Tusca', 'Syp.', '100ml'),
+         ('Ceftron', 'Inj.', '1g'), ('Losectil', 'Cap.', '20mg'), ('Bislol', 'Tab.', '2.5mg'), ('Entacyd', 'Susp.', '200ml'),
+         ('Ace', 'Tab.', '500mg'), ('Alatrol', 'Tab.', '10mg'), ('Thyrox', 'Tab.', '50mcg'), ('Filwel', 'Tab.', '')]
+MEDICINE_CATEGORIES = ['Analgesic', 'Antibiotic', 'Antihistamine', 'Antacid', 'Antidiabetic', 'Antihypertensive',
+                       'Vitamin', 'Cough & Cold', 'Hormone', 'Dermatological']
+MANUFACTURERS = ['Square', 'Beximco', 'Incepta', 'Renata', 'ACI', 'Eskayef', 'Opsonin', 'Healthcare', 'Aristopharma']
+STATUS_WEIGHTS = {'COMPLETED': 70, 'CANCELLED': 10, 'CONFIRMED': 10, 'PENDING': 10}
+
+
+def _chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create keep the created_at values we generate instead of stamping now()."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _field(model, name):
+    return model._meta.get_field(name)
+
+
+class LoadDataGenerator:
+    """Generate ``volumes`` (see DEFAULT_VOLUMES) of rows with a fixed ``seed``."""
+
+    def __init__(self, volumes=None, seed=0, chunk_size=CHUNK_SIZE, today=None, log=None):
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f'The seed must be between 0 and {MAX_SEED}.')
+        self.volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+        self.random = random.Random(seed)
+        self.tag = f'L{seed}'
+        self._next_numbers = {}
+        self.chunk_size = chunk_size
+        self.today = today or ANCHOR_DATE
+        self.start_date = self.today - timedelta(days=365 * self.volumes['years'])
+        self.log = log or (lambda message: None)
+        self.password = make_password(PASSWORD)
+        self.counts = {}
+
+    @classmethod
+    def scaled(cls, scale=1.0, overrides=None, **kwargs):
+        volumes = {
+            name: value if name in UNSCALED else max(int(value * scale), 1)
+            for name, value in DEFAULT_VOLUMES.items()
+        }
+        volumes.update({name: value for name, value in (overrides or {}).items() if value is not None})
+        return cls(volumes, **kwargs)
+
+    def is_loaded(self):
+        """Whether this seed's data is already in the database."""
+        return User.objects.filter(
+            Q(username__startswith=self._username('DOC', '')) | Q(username__startswith=self._username('PAT', ''))
+            | Q(username__startswith=self._username('EMP', ''))
+        ).exists()
+
+    def run(self):
+        """Generate everything in dependency order. Returns {model name: rows written}."""
+        self.doctor_ids = self.generate_doctors(self.volumes['doctors'])
+        self.patient_ids = self.generate_patients(self.volumes['patients'])
+        self.employee_ids = self.generate_employees(self.volumes['employees'])
+        self.generate_appointments(self.volumes['appointments'])
+        self.generate_medical_records(self.volumes['medical_records'])
+        self.generate_bills(self.volumes['bills'])
+        self.medicine_names = self.generate_medicines(self.volumes['medicines'])
+        self.medicine_ids = list(self.medicine_names)
+        self.generate_dispenses(self.volumes['dispenses'])
+        self.generate_suppliers(self.volumes['suppliers'], self.volumes['purchase_orders'])
+        self.generate_attendance(self.volumes['attendance_days'])
+        self.generate_salaries()
+        self.generate_transactions(self.volumes['transactions'])
+        return self.counts
+
+    # Helpers
+
+    def _write(self, model, objects):
+        with transaction.atomic():
+            created = model.objects.bulk_create(objects, batch_size=1000)
+            transaction.on_commit(lambda: bump(model._meta.label))  # bulk_create sends no post_save
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def _numbers(self, name, count):
+        """The next ``count`` numbers for ``name``, counted per generator rather than by the database."""
+        start = self._next_numbers.get(name, 1)
+        self._next_numbers[name] = start + count
+        return range(start, start + count)
+
+    def _id(self, prefix, number, width):
+        return f'{prefix}-{self.tag}-{number:0{width}d}'
+
+    def _username(self, kind, number):
+        return f'{kind}-{self.tag}-{number}'.lower()
+
+    def _date(self, start=None, end=None):
+        start = start or self.start_date
+        end = end or self.today
+        return start + timedelta(days=self.random.randint(0, (end - start).days))
+
+    def _moment(self, day):
+        return datetime.combine(day, time(self.random.randint(8, 20), self.random.randint(0, 59)), tzinfo=dt_timezone.utc)
+
+    def _money(self, low, high, step=10):
+        return Decimal(self.random.randrange(low, high, step))
+
+    def _phone(self):
+        return f'01{self.random.choice("3456789")}{self.random.randint(10000000, 99999999)}'
+
+    def _create_users(self, kind, numbers):
+        """Bulk-create a user for each of ``numbers`` and return them with their pks."""
+        users = []
+        for number in numbers:
+            first, last = self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+            username = self._username(kind, number)
+            users.append(User(
+                username=username, first_name=first, last_name=last,
+                email=f'{username}@example.com', password=self.password,
+            ))
+        created = self._write(User, users)
+        if created and created[0].pk is None:
+            # Backends that cannot return ids from a bulk insert
+            ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk'))
+            for user in created:
+                user.pk = ids[user.username]
+        return created
+
+    # People
+
+    def generate_doctors(self, count):
+        self.log(f'Doctors: {count}')
+        ids = []
+        for _, size in _chunks(count, self.chunk_size):
+            numbers = self._numbers('DOC', size)
+            users = self._create_users('DOC', numbers)
+            self._write(UserProfile, [UserProfile(user=user, role='DOCTOR', phone_number=self._phone()) for user in users])
+            doctors = self._write(Doctor, [
+                Doctor(
+                    user=user,
+                    employee_id=self._id('DOC', number, 7),
+                    specialization=self.random.choice(SPECIALIZATIONS),
+                    qualification=self.random.choice(QUALIFICATIONS),
+                    experience_years=self.random.randint(1, 35),
+                    consultation_fee=self._money(300, 2000, 100),
+                    phone_number=self._phone(),
+                    room_number=str(self.random.randint(100, 599)),
+                    available_days='Sat-Thu',
+                    available_time='9:00 AM - 5:00 PM',
+                )
+                for number, user in zip(numbers, users)
+            ])
+            ids += [doctor.pk for doctor in doctors]
+        return ids
+
+    def generate_patients(self, count):
+        self.log(f'Patients: {count}')
+        ids = []
+        for _, size in _chunks(count, self.chunk_size):
+            numbers = self._numbers('PAT', size)
+            users = self._create_users('PAT', numbers)
+            patients = self._write(Patient, [
+                Patient(
+                    user=user,
+                    patient_id=self._id('PAT', number, 9),
+                    date_of_birth=self._date(date(1940, 1, 1), self.today - timedelta(days=30)),
+                    gender=self.random.choice('MF'),
+                    blood_group=self.random.choice(['A+', 'A-', 'B+', 'B-', 'O+', 'O-', 'AB+', 'AB-']),
+                    phone_number=self._phone(),
+                    address=f'{self.random.randint(1, 200)} Road {self.random.randint(1, 30)}, {self.random.choice(CITIES)}',
+                    emergency_contact=self._phone(),
+                )
+                for number, user in zip(numbers, users)
+            ])
+            ids += [patient.pk for patient in patients]
+        return ids
+
+    def generate_employees(self, count):
+        self.log(f'Employees: {count}')
+        ids = []
+        departments = [choice for choice, _ in Employee.DEPARTMENT_CHOICES]
+        designations = [choice for choice, _ in Employee.DESIGNATION_CHOICES]
+        for _, size in _chunks(count, self.chunk_size):
+            numbers = self._numbers('EMP', size)
+            users = self._create_users('EMP', numbers)
+            employees = self._write(Employee, [
+                Employee(
+                    user=user,
+                    employee_id=self._id('EMP', number, 7),
+                    date_of_birth=self._date(date(1965, 1, 1), date(2002, 12, 31)),
+                    gender=self.random.choice('MF'),
+                    phone=self._phone(),
+                    emergency_contact=self._phone(),
+                    address=self.random.choice(CITIES),
+                    department=self.random.choice(departments),
+                    designation=self.random.choice(designations),
+                    join_date=self._date(date(2010, 1, 1), self.start_date),
+                    salary=self._money(15000, 120000, 500),
+                )
+                for number, user in zip(numbers, users)
+            ])
+            ids += [employee.pk for employee in employees]
+        return ids
+
+    # Clinical
+
+    def generate_appointments(self, count):
+        self.log(f'Appointments: {count}')
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        upcoming_end = self.today + timedelta(days=30)
+        with explicit_timestamps(_field(Appointment, 'created_at')):
+            for _, size in _chunks(count, self.chunk_size):
+                appointments = []
+                for number in self._numbers('APT', size):
+                    day = self._date(end=upcoming_end)
+                    status = self.random.choices(statuses, weights)[0] if day < self.today else \
+                        self.random.choice(['PENDING', 'CONFIRMED'])
+                    appointments.append(Appointment(
+                        appointment_id=self._id('APT', number, 9),
+                        patient_id=self.random.choice(self.patient_ids),
+                        doctor_id=self.random.choice(self.doctor_ids),
+                        appointment_date=day,
+                        appointment_time=time(self.random.randint(9, 20), self.random.choice([0, 15, 30, 45])),
+                        appointment_type=self.random.choice(APPOINTMENT_TYPES),
+                        symptoms=', '.join(self.random.sample(SYMPTOMS, self.random.randint(1, 3))),
+                        status=status,
+                        created_at=self._moment(max(day - timedelta(days=self.random.randint(0, 14)), self.start_date)),
+                    ))
+                self._write(Appointment, appointments)
+
+    def _prescription(self):
+        lines = []
+        for name, form, strength in self.random.sample(DRUGS, self.random.randint(1, 4)):
+            dose = self.random.choice(['1+0+1', '1+1+1', '0+0+1', '1+0+0'])
+            lines.append(f'{form} {name} {strength} {dose} x {self.random.choice([3, 5, 7, 10, 30])} days'.replace('  ', ' '))
+        return '\n'.join(f'{index}. {line}' for index, line in enumerate(lines, 1))
+
+    def generate_medical_records(self, count):
+        self.log(f'Medical records: {count}')
+        visit_types = [choice for choice, _ in MedicalRecord.VISIT_TYPE_CHOICES]
+        for _, size in _chunks(count, self.chunk_size):
+            self._write(MedicalRecord, [
+                MedicalRecord(
+                    patient_id=self.random.choice(self.patient_ids),
+                    doctor_id=self.random.choice(self.doctor_ids),
+                    visit_date=self._date(),
+                    visit_type=self.random.choice(visit_types),
+                    temperature=Decimal(self.random.randint(970, 1030)) / 10,
+                    blood_pressure=f'{self.random.randint(95, 170)}/{self.random.randint(60, 105)}',
+                    heart_rate=self.random.randint(55, 120),
+                    weight=Decimal(self.random.randint(3000, 11000)) / 100,
+                    chief_complaint=self.random.choice(SYMPTOMS),
+                    symptoms=', '.join(self.random.sample(SYMPTOMS, self.random.randint(1, 4))),
+                    diagnosis=', '.join(self.random.sample(DIAGNOSES, self.random.choice([1, 1, 1, 2]))),
+                    prescription=self._prescription(),
+                    lab_tests=', '.join(self.random.sample(LAB_TESTS, self.random.randint(0, 3))),
+                )
+                for _ in range(size)
+            ])
+
+    def generate_bills(self, count):
+        self.log(f'Bills: {count}')
+        with explicit_timestamps(_field(Bill, 'created_at')):
+            for _, size in _chunks(count, self.chunk_size):
+                bills = []
+                for number in self._numbers('BILL', size):
+                    consultation = self._money(300, 2000, 100)
+                    medicine = self._money(0, 5000)
+                    lab = self._money(0, 8000, 50)
+                    discount = self.random.choice([Decimal(0), Decimal(0), Decimal(100), Decimal(200)])
+                    total = consultation + medicine + lab - discount
+                    paid = self.random.choice([total, total, total, Decimal(0), (total / 2).quantize(Decimal('1'))])
+                    status = 'PAID' if paid >= total else 'PARTIAL' if paid > 0 else 'UNPAID'
+                    bills.append(Bill(
+                        bill_number=self._id('BILL', number, 9),
+                        patient_id=self.random.choice(self.patient_ids),
+                        consultation_fee=consultation,
+                        medicine_charges=medicine,
+                        lab_charges=lab,
+                        discount=discount,
+                        total_amount=total,
+                        amount_paid=paid,
+                        balance=total - paid,
+                        status=status,
+                        created_at=self._moment(self._date()),
+                    ))
+                self._write(Bill, bills)
+
+    # Pharmacy and suppliers
+
+    def generate_medicines(self, count):
+        self.log(f'Medicines: {count}')
+        names = {}
+        units = [choice for choice, _ in Medicine.UNIT_CHOICES]
+        for _, size in _chunks(count, self.chunk_size):
+            medicines = []
+            for number in self._numbers('MED', size):
+                name, _, strength = self.random.choice(DRUGS)
+                purchase = Decimal(self.random.randint(50, 5000)) / 100
+                medicines.append(Medicine(
+                    medicine_id=self._id('MED', number, 7),
+                    name=f'{name} {strength}'.strip() if number % 3 else f'{name} {number}',
+                    category=self.random.choice(MEDICINE_CATEGORIES),
+                    manufacturer=self.random.choice(MANUFACTURERS),
+                    stock_quantity=0,
+                    unit=self.random.choice(units),
+                    expiry_date=self._date(self.today - timedelta(days=60), self.today + timedelta(days=900)),
+                    purchase_price=purchase,
+                    selling_price=(purchase * Decimal('1.25')).quantize(Decimal('0.01')),
+                    reorder_level=self.random.choice([10, 20, 50, 100]),
+                ))
+            medicines = self._write(Medicine, medicines)
+            names.update((medicine.pk, medicine.name) for medicine in medicines)
+
+            # Two lots per medicine, opening stock recorded as movements
+            batches = []
+            for medicine in medicines:
+                for lot in range(2):
+                    batches.append(MedicineBatch(
+                        medicine=medicine,
+                        lot_number=f'L{lot + 1}-{medicine.medicine_id}',
+                        quantity=self.random.randint(0, 2000),
+                        expiry_date=medicine.expiry_date + timedelta(days=180 * lot),
+                        cost_price=medicine.purchase_price,
+                    ))
+            batches = self._write(MedicineBatch, batches)
+            self._write(StockMovement, [
+                StockMovement(medicine_id=batch.medicine_id, batch=batch, delta=batch.quantity, reason='OPENING',
+                              note='Generated opening stock')
+                for batch in batches if batch.quantity
+            ])
+            in_batches = MedicineBatch.objects.filter(medicine=OuterRef('pk')).order_by().values('medicine') \
+                .annotate(total=Sum('quantity')).values('total')
+            Medicine.objects.filter(pk__in=[medicine.pk for medicine in medicines]).update(
+                stock_quantity=Coalesce(Subquery(in_batches), 0),
+            )
+        return names
+
+    def generate_dispenses(self, count):
+        """Dispensing history; stock is not reduced, it stands for stock already replenished."""
+        self.log(f'Dispenses: {count}')
+        recent_start = self.today - timedelta(days=90)
+        with explicit_timestamps(_field(StockMovement, 'created_at')):
+            for _, size in _chunks(count, self.chunk_size):
+                self._write(StockMovement, [
+                    StockMovement(
+                        medicine_id=self.random.choice(self.medicine_ids),
+                        delta=-self.random.randint(1, 30),
+                        reason='DISPENSE',
+                        note='Generated dispense',
+                        created_at=self._moment(self._date(start=recent_start)),
+                    )
+                    for _ in range(size)
+                ])
+
+    def generate_suppliers(self, supplier_count, order_count):
+        self.log(f'Suppliers: {supplier_count}, purchase orders: {order_count}')
+        categories = [choice for choice, _ in Supplier.CATEGORY_CHOICES]
+        suppliers = []
+        for number in self._numbers('SUP', supplier_count):
+            company = f'{self.random.choice(MANUFACTURERS)} {self.random.choice(["Traders", "Distribution", "Supplies", "Pharma"])}'
+            suppliers.append(Supplier(
+                supplier_id=self._id('SUP', number, 6),
+                company_name=f'{company} {number}',
+                contact_person=f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}',
+                category=self.random.choice(categories[:1] * 3 + categories),
+                email=f'sales{number}@example.com',
+                phone=self._phone(),
+                address=self.random.choice(CITIES),
+                rating=Decimal(self.random.randint(200, 500)) / 100,
+            ))
+        supplier_ids = [supplier.pk for supplier in self._write(Supplier, suppliers)]
+
+        statuses = ['DELIVERED'] * 7 + ['PENDING', 'APPROVED', 'CANCELLED']
+        for _, size in _chunks(order_count, self.chunk_size):
+            orders = []
+            for number in self._numbers('PO', size):
+                ordered = self._date()
+                status = self.random.choice(statuses)
+                received = ordered + timedelta(days=self.random.randint(1, 21))
+                orders.append(PurchaseOrder(
+                    order_number=self._id('PO', number, 8),
+                    supplier_id=self.random.choice(supplier_ids),
+                    order_date=ordered,
+                    expected_delivery=ordered + timedelta(days=self.random.randint(3, 14)),
+                    status=status,
+                    received_at=self._moment(received) if status == 'DELIVERED' and received <= self.today else None,
+                ))
+            orders = self._write(PurchaseOrder, orders)
+
+            items = []
+            totals = {}
+            for order in orders:
+                for medicine_id in self.random.sample(self.medicine_ids, min(self.random.randint(1, 5), len(self.medicine_ids))):
+                    quantity = self.random.randint(10, 500)
+                    price = Decimal(self.random.randint(50, 5000)) / 100
+                    items.append(PurchaseOrderItem(
+                        purchase_order=order, medicine_id=medicine_id, item_name=self.medicine_names[medicine_id],
+                        quantity=quantity, unit_price=price, total_price=quantity * price,
+                    ))
+                    totals[order.pk] = totals.get(order.pk, 0) + quantity * price
+            self._write(PurchaseOrderItem, items)
+            for order in orders:
+                order.total_amount = totals.get(order.pk, 0)
+            PurchaseOrder.objects.bulk_update(orders, ['total_amount'], batch_size=1000)
+
+    # Staff
+
+    def generate_attendance(self, days):
+        self.log(f'Attendance: {days} days for {len(self.employee_ids)} employees')
+        first_day = self.today - timedelta(days=days - 1)
+        rows = []
+        leaves = []
+        for employee_id in self.employee_ids:
+            leave_days = set()
+            for _ in range(max(days // 120, 1)):
+                start = self._date(first_day, self.today)
+                length = self.random.randint(1, 5)
+                leaves.append(Leave(
+                    employee_id=employee_id,
+                    leave_type=self.random.choice(['SICK', 'CASUAL', 'ANNUAL']),
+                    start_date=start,
+                    end_date=start + timedelta(days=length - 1),
+                    reason='Generated leave',
+                    status=self.random.choice(['APPROVED', 'APPROVED', 'PENDING', 'REJECTED']),
+                ))
+                if leaves[-1].status == 'APPROVED':
+                    leave_days.update(start + timedelta(days=offset) for offset in range(length))
+
+            for offset in range(days):
+                day = first_day + timedelta(days=offset)
+                if day.weekday() == 4:  # Friday
+                    status = 'HOLIDAY'
+                elif day in leave_days:
+                    status = 'LEAVE'
+                else:
+                    status = self.random.choices(['PRESENT', 'ABSENT', 'HALF_DAY'], [90, 5, 5])[0]
+                check_in = check_out = None
+                if status in ('PRESENT', 'HALF_DAY'):
+                    check_in = time(8 + self.random.randint(0, 1), self.random.randint(0, 59))
+                    check_out = time(13 if status == 'HALF_DAY' else 17 + self.random.randint(0, 2), self.random.randint(0, 59))
+                rows.append(Attendance(employee_id=employee_id, date=day, status=status,
+                                       check_in=check_in, check_out=check_out))
+                if len(rows) >= self.chunk_size:
+                    self._write(Attendance, rows)
+                    rows = []
+        if rows:
+            self._write(Attendance, rows)
+        self._write(Leave, leaves)
+
+    def generate_salaries(self):
+        months = []
+        month = self.start_date.replace(day=1)
+        while month <= self.today:
+            months.append(month)
+            month = (month + timedelta(days=32)).replace(day=1)
+        self.log(f'Salaries: {len(months)} months for {len(self.employee_ids)} employees')
+
+        basic = dict(Employee.objects.filter(pk__in=self.employee_ids).values_list('pk', 'salary'))
+        rows = []
+        for employee_id in self.employee_ids:
+            for month in months:
+                bonus = self.random.choice([Decimal(0)] * 5 + [Decimal(2000), Decimal(5000)])
+                deductions = self.random.choice([Decimal(0)] * 4 + [Decimal(500)])
+                total = basic[employee_id] + bonus - deductions
+                current = month.year == self.today.year and month.month == self.today.month
+                rows.append(Salary(
+                    employee_id=employee_id, month=month, basic_salary=basic[employee_id], bonus=bonus,
+                    deductions=deductions, total_amount=total, amount_paid=0 if current else total,
+                    payment_date=None if current else month + timedelta(days=self.random.randint(27, 34)),
+                    payment_status='UNPAID' if current else 'PAID',
+                ))
+                if len(rows) >= self.chunk_size:
+                    self._write(Salary, rows)
+                    rows = []
+        if rows:
+            self._write(Salary, rows)
+
+    # Ledger
+
+    def generate_transactions(self, count):
+        self.log(f'Transactions: {count}')
+        accounts = self._write(Account, [
+            Account(account_number=self._id('LOAD', number, 6), account_name=name, account_type=kind, bank_name=bank)
+            for number, (name, kind, bank) in zip(self._numbers('ACCOUNT', 3), [
+                ('Main Operating Account', 'BANK', 'Sonali Bank'),
+                ('Cash Counter', 'CASH', ''),
+                ('bKash Merchant', 'MOBILE_BANKING', ''),
+            ])
+        ])
+        income = ['CONSULTATION', 'MEDICINE_SALE', 'LAB_TEST', 'ADMISSION', 'OTHER_INCOME']
+        expense = ['SALARY', 'PURCHASE', 'UTILITY', 'RENT', 'MAINTENANCE', 'MEDICINE_PURCHASE', 'EQUIPMENT', 'OTHER_EXPENSE']
+        methods = [choice for choice, _ in Transaction.PAYMENT_METHOD_CHOICES]
+        for _, size in _chunks(count, self.chunk_size):
+            transactions = []
+            for number in self._numbers('TXN', size):
+                kind = self.random.choices(['INCOME', 'EXPENSE'], [65, 35])[0]
+                category = self.random.choice(income if kind == 'INCOME' else expense)
+                transactions.append(Transaction(
+                    transaction_id=self._id('TXN', number, 9),
+                    account=self.random.choice(accounts),
+                    transaction_type=kind,
+                    category=category,
+                    amount=self._money(100, 50000),
+                    payment_method=self.random.choice(methods),
+                    reference=f'REF{number}',
+                    description=f'Generated {category.lower().replace("_", " ")}',
+                    date=self._date(),
+                ))
+            self._write(Transaction, transactions)
+
+        # Transaction.save() keeps balances; bulk_create does not, so settle them in one pass
+        zero = Value(0, output_field=DecimalField(max_digits=12, decimal_places=2))
+        for account in Account.objects.filter(pk__in=[account.pk for account in accounts]).annotate(
+            income=Coalesce(Sum('transactions__amount', filter=Q(transactions__transaction_type='INCOME')), zero),
+            expense=Coalesce(Sum('transactions__amount', filter=Q(transactions__transaction_type='EXPENSE')), zero),
+        ):
+            Account.objects.filter(pk=account.pk).update(balance=account.income - account.expense)
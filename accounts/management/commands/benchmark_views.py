@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.benchmarks import run_suite, find_regressions, DEFAULT_SCALES, DEFAULT_REPEAT, LATENCY_TOLERANCE
+
+BENCHMARK_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the main pages against freshly seeded test databases, write the results as JSON '
+            'and fail if a page regressed past the stored baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                            help='Comma-separated generate_load_data scales to seed')
+        parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed requests per page')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default=str(BENCHMARK_DIR / 'latest.json'))
+        parser.add_argument('--baseline', default=str(BENCHMARK_DIR / 'baseline.json'))
+        parser.add_argument('--tolerance', type=float, default=LATENCY_TOLERANCE,
+                            help='Allowed p50 slowdown as a fraction of the baseline')
+        parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [float(scale) for scale in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError('--scales must be comma-separated numbers, e.g. 0.01,0.1')
+
+        results = run_suite(scales, options['repeat'], options['seed'], log=self.stdout.write)
+        self._write(options['output'], results)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            self._write(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline updated: {baseline_path}'))
+            return
+
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}; run with --update-baseline to store one'))
+
+        regressions = find_regressions(results, baseline, options['tolerance'])
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def _write(self, path, results):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
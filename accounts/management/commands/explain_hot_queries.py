@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.query_plans import HOT_QUERIES, check_plans
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN for every registered hot query and report full table scans and temporary sorts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Hot queries to explain (default: all)')
+        parser.add_argument('--analyze', action='store_true',
+                            help='Refresh the planner statistics first (ANALYZE)')
+        parser.add_argument('--show-plans', action='store_true', help='Print every plan, not only the flagged ones')
+        parser.add_argument('--fail-on-scan', action='store_true', help='Exit with an error if any query scans a table')
+
+    def handle(self, *args, **options):
+        unknown = sorted(set(options['names']) - set(HOT_QUERIES))
+        if unknown:
+            raise CommandError(f"Unknown hot queries: {', '.join(unknown)}. Choose from: {', '.join(HOT_QUERIES)}")
+
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        scanning = []
+        for result in check_plans(options['names']):
+            problems = []
+            if result['full_scans']:
+                problems.append(f"full scan of {', '.join(result['full_scans'])}")
+                scanning.append(result['name'])
+            if result['temp_sort']:
+                problems.append('sorts in a temporary B-tree')
+
+            if problems:
+                self.stdout.write(self.style.WARNING(f"{result['name']}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(f"{result['name']}: ok")
+            if problems or options['show_plans']:
+                self.stdout.write('    ' + result['plan'].replace('\n', '\n    '))
+
+        if scanning and options['fail_on_scan']:
+            raise CommandError(f"{len(scanning)} hot queries scan a full table: {', '.join(scanning)}")
+        if not scanning:
+            self.stdout.write(self.style.SUCCESS('No full table scans'))
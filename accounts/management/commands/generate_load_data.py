@@ -0,0 +1,65 @@
+import time
+from datetime import date
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.load_data import LoadDataGenerator, ANCHOR_DATE, DEFAULT_VOLUMES, CHUNK_SIZE, MAX_SEED, PASSWORD
+
+# Commands that rebuild tables bulk_create does not keep current
+REBUILD_COMMANDS = [
+    'rebuild_search_index',
+    'backfill_vitals',
+    'index_medical_terms',
+    'refresh_supplier_performance',
+    'generate_reorder_suggestions',
+    'sweep_expired_stock',
+]
+
+
+class Command(BaseCommand):
+    help = ('Fill every app with synthetic data for load testing, e.g. '
+            '--patients 1000000 --appointments 10000000 --attendance-days 1825')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every default row count')
+        parser.add_argument('--seed', type=int, default=0,
+                            help=f'Random seed from 0 to {MAX_SEED}; the same seed gives the same data')
+        parser.add_argument('--date', type=date.fromisoformat, default=ANCHOR_DATE,
+                            help=f'Day the generated history ends on, YYYY-MM-DD (default {ANCHOR_DATE})')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows built in memory per write')
+        for name, value in DEFAULT_VOLUMES.items():
+            parser.add_argument(f'--{name.replace("_", "-")}', type=int, dest=name,
+                                help=f'Override the row count (default {value} at scale 1)')
+        parser.add_argument('--rebuild', action='store_true', help='Rebuild search, vitals and other derived tables afterwards')
+
+    def handle(self, *args, **options):
+        try:
+            generator = LoadDataGenerator.scaled(
+                options['scale'],
+                overrides={name: options[name] for name in DEFAULT_VOLUMES},
+                seed=options['seed'],
+                chunk_size=options['chunk_size'],
+                today=options['date'],
+                log=self.stdout.write,
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        if generator.is_loaded():
+            raise CommandError(f"Seed {options['seed']} is already loaded; use another --seed to add more data")
+        started = time.perf_counter()
+        counts = generator.run()
+        elapsed = time.perf_counter() - started
+
+        for model, count in sorted(counts.items()):
+            self.stdout.write(f'  {model}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {sum(counts.values())} rows in {elapsed:.1f}s; users log in with password "{PASSWORD}"'
+        ))
+
+        if options['rebuild']:
+            for command in REBUILD_COMMANDS:
+                self.stdout.write(f'Running {command}...')
+                call_command(command, stdout=self.stdout)
+        else:
+            self.stdout.write('Derived tables were not rebuilt; run with --rebuild or: ' + ', '.join(REBUILD_COMMANDS))
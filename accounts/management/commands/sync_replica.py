@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from hospital_management.routers import replica_alias
+
+
+class Command(BaseCommand):
+    help = ('Copy the default SQLite database into the SQLite replica file, '
+            'standing in for replication in local development')
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError('No replica configured; set DATABASE_REPLICA_URL')
+        source, target = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+            raise CommandError('sync_replica only copies SQLite files; use the server\'s replication otherwise')
+
+        source.ensure_connection()
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+        self.stdout.write(self.style.SUCCESS(f"Copied {source.settings_dict['NAME']} to {target.settings_dict['NAME']}"))
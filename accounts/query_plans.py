@@ -0,0 +1,164 @@
+# accounts/query_plans.py
+"""
+Query plans for the hottest filters and sorts.
+
+Each function in HOT_QUERIES builds the queryset one busy page runs (same
+filters, same ordering, same slice) and ``check_plans`` asks the database
+how it would execute it. A plan that reads a whole table instead of
+searching an index is reported as a full scan; sorting in a temporary
+B-tree is reported too, since an index in the sort order would avoid it.
+
+Plans depend on the statistics the database holds, so run
+``explain_hot_queries`` against realistic data (see generate_load_data)
+after ANALYZE for results that match production.
+"""
+import re
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+
+HOT_QUERIES = {}
+
+
+def hot_query(name):
+    """Register a function returning the queryset to explain under ``name``."""
+    def register(build):
+        HOT_QUERIES[name] = build
+        return build
+    return register
+
+
+@hot_query('dashboard: appointments today')
+def _appointments_today():
+    from appointments.models import Appointment
+    return Appointment.objects.filter(appointment_date=timezone.localdate())
+
+
+@hot_query('dashboard: recent appointments')
+def _recent_appointments():
+    from appointments.models import Appointment
+    return Appointment.objects.order_by('-created_at')[:5]
+
+
+@hot_query('appointment list')
+def _appointment_list():
+    from appointments.models import Appointment
+    return Appointment.objects.select_related('patient__user', 'doctor__user')[:25]
+
+
+@hot_query('daily appointments report: status count')
+def _appointments_by_status():
+    from appointments.models import Appointment
+    return Appointment.objects.filter(appointment_date=timezone.localdate(), status='COMPLETED')
+
+
+@hot_query('doctor appointments report')
+def _doctor_appointments():
+    from appointments.models import Appointment
+    today = timezone.localdate()
+    return Appointment.objects.filter(doctor_id=1, appointment_date__gte=today - timedelta(days=30),
+                                      appointment_date__lte=today)
+
+
+@hot_query('dashboard: paid revenue')
+def _paid_revenue():
+    from billing.models import Bill
+    return Bill.objects.filter(status='PAID').values('status').annotate(total=Sum('total_amount'))
+
+
+@hot_query('bill list')
+def _bill_list():
+    from billing.models import Bill
+    return Bill.objects.select_related('patient__user')[:25]
+
+
+@hot_query('daily billing report')
+def _bills_of_day():
+    from billing.models import Bill
+    start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return Bill.objects.filter(created_at__gte=start, created_at__lt=start + timedelta(days=1)).order_by('-created_at')
+
+
+@hot_query('attendance: present today')
+def _present_today():
+    from attendance.models import Attendance
+    return Attendance.objects.filter(date=timezone.localdate(), status='PRESENT')
+
+
+@hot_query('attendance report: weekly range')
+def _attendance_week():
+    from attendance.models import Attendance
+    today = timezone.localdate()
+    return Attendance.objects.filter(date__gte=today - timedelta(days=7), date__lte=today, status='PRESENT')
+
+
+@hot_query('dashboard: low stock medicines')
+def _low_stock():
+    from pharmacy.models import Medicine
+    return Medicine.objects.filter(stock_quantity__lt=10)
+
+
+@hot_query('medicine stock report: in stock')
+def _in_stock():
+    from pharmacy.models import Medicine
+    return Medicine.objects.filter(stock_quantity__gt=0)
+
+
+@hot_query('patient medical history')
+def _patient_history():
+    from medical_records.models import MedicalRecord
+    return MedicalRecord.objects.filter(patient_id=1).order_by('-visit_date')
+
+
+@hot_query('medical record list')
+def _medical_record_list():
+    from medical_records.models import MedicalRecord
+    return MedicalRecord.objects.select_related('patient__user', 'doctor__user')[:25]
+
+
+@hot_query('account transactions')
+def _account_transactions():
+    from financial.models import Transaction
+    return Transaction.objects.filter(account_id=1).order_by('-date', '-created_at')[:50]
+
+
+@hot_query('financial dashboard: monthly income')
+def _monthly_income():
+    from financial.models import Transaction
+    today = timezone.localdate()
+    return Transaction.objects.filter(transaction_type='INCOME', date__month=today.month, date__year=today.year)
+
+
+def _full_scans(plan):
+    """Tables read in full, from SQLite's ``SCAN <table>`` or PostgreSQL's ``Seq Scan on <table>`` lines."""
+    if connection.vendor == 'sqlite':
+        # "SCAN t USING [COVERING] INDEX i" walks an index in order, which a LIMIT can cut short
+        return re.findall(r'\bSCAN (\w+)\b(?! USING)', plan)
+    return re.findall(r'Seq Scan on (\w+)', plan)
+
+
+def _temp_sorts(plan):
+    if connection.vendor == 'sqlite':
+        return 'USE TEMP B-TREE FOR ORDER BY' in plan
+    return bool(re.search(r'^\s*(->\s*)?Sort\b', plan, re.MULTILINE))
+
+
+def check_plans(names=None):
+    """
+    Explain the registered hot queries (all of them, or ``names``) and return
+    [{'name', 'plan', 'full_scans', 'temp_sort'}] in registration order.
+    """
+    results = []
+    for name, build in HOT_QUERIES.items():
+        if names and name not in names:
+            continue
+        plan = build().explain()
+        results.append({
+            'name': name,
+            'plan': plan,
+            'full_scans': _full_scans(plan),
+            'temp_sort': _temp_sorts(plan),
+        })
+    return results
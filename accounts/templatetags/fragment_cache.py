@@ -0,0 +1,58 @@
+from django import template
+from django.apps import apps
+from django.core.cache import cache
+
+from hospital_management.fragments import fragment_key, fragment_timeout, versioned_labels
+
+register = template.Library()
+
+
+class VersionedCacheNode(template.Node):
+
+    def __init__(self, nodelist, name, labels, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.labels = labels
+        self.vary_on = vary_on
+
+    def render(self, context):
+        key = fragment_key(self.name, self.labels, [var.resolve(context) for var in self.vary_on])
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, fragment_timeout())
+        return value
+
+
+@register.tag('versioned_cache')
+def do_versioned_cache(parser, token):
+    """
+    Cache the enclosed fragment until one of the listed models is written:
+
+        {% versioned_cache 'name' 'app.Model' ... [vary expr ...] %} ... {% endversioned_cache %}
+    """
+    nodelist = parser.parse(('endversioned_cache',))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    vary_on = []
+    if 'vary' in bits:
+        vary_on = [parser.compile_filter(bit) for bit in bits[bits.index('vary') + 1:]]
+        bits = bits[:bits.index('vary')]
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' needs a fragment name and at least one model label")
+    name, *labels = [_literal(bits[0], bit) for bit in bits[1:]]
+    tracked = versioned_labels()
+    for label in labels:
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            raise template.TemplateSyntaxError(f"'{bits[0]}': unknown model {label!r}")
+        if model._meta.label not in tracked:
+            raise template.TemplateSyntaxError(f"'{bits[0]}': add {label!r} to FRAGMENT_CACHE_MODELS")
+    return VersionedCacheNode(nodelist, name, labels, vary_on)
+
+
+def _literal(tag_name, bit):
+    if len(bit) < 2 or bit[0] != bit[-1] or bit[0] not in '\'"':
+        raise template.TemplateSyntaxError(f"'{tag_name}' takes quoted names and model labels, got {bit}")
+    return bit[1:-1]
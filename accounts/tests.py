@@ -1,3 +1,81 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from appointments.models import Appointment
+from hospital_management.testing import LOCAL_CACHES, REQUEST_QUERIES, SampleDataMixin
+
+from .benchmarks import find_regressions
+from .load_data import LoadDataGenerator
+from .query_plans import check_plans
+
+
+class HotQueryPlanTests(TestCase):
+
+    def test_hot_queries_use_indexes(self):
+        scans = {result['name']: result['full_scans'] for result in check_plans() if result['full_scans']}
+        self.assertEqual(scans, {})
+
+
+class FindRegressionsTests(SimpleTestCase):
+
+    def results(self, **pages):
+        return {'scales': {'0.01': {'pages': pages}}}
+
+    def page(self, queries, p50_ms=5.0):
+        return {'status': 200, 'queries': queries, 'p50_ms': p50_ms}
+
+    def test_failed_pages_and_extra_queries_are_regressions(self):
+        baseline = self.results(dashboard=self.page(10), bill_list=self.page(5))
+        results = self.results(dashboard=self.page(12), bill_list={'url': '/billing/', 'status': 500})
+        self.assertEqual(find_regressions(results, baseline), [
+            'dashboard @ scale 0.01: 12 queries (baseline 10)',
+            'bill_list @ scale 0.01: HTTP 500',
+        ])
+        self.assertEqual(find_regressions(baseline, baseline), [])
+
+
+class LoadDataTests(TestCase):
+
+    VOLUMES = {
+        'doctors': 2, 'patients': 3, 'appointments': 10, 'medical_records': 2, 'bills': 2, 'employees': 2,
+        'attendance_days': 7, 'medicines': 2, 'dispenses': 2, 'suppliers': 1, 'purchase_orders': 2,
+        'transactions': 3, 'years': 1,
+    }
+
+    def generate(self, seed):
+        LoadDataGenerator(self.VOLUMES, seed=seed).run()
+        return list(Appointment.objects.order_by('appointment_id').values_list(
+            'appointment_id', 'patient__patient_id', 'appointment_date', 'status',
+        ))
+
+    def test_a_seed_generates_the_same_data_every_time(self):
+        with transaction.atomic():
+            first = self.generate(1)
+            transaction.set_rollback(True)
+        self.assertEqual(self.generate(1), first)
+        self.assertTrue(LoadDataGenerator(seed=1).is_loaded())
+        self.assertFalse(LoadDataGenerator(seed=2).is_loaded())
+        self.assertEqual(len(self.generate(2)), 20)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class DashboardFragmentTests(SampleDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_unchanged_widgets_skip_queries(self):
+        self.client.get(reverse('dashboard'))
+        with self.assertNumQueries(REQUEST_QUERIES):
+            self.client.get(reverse('dashboard'))
+
+    def test_write_rerenders_dependent_widgets(self):
+        self.client.get(reverse('dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_doctor()
+        with self.assertNumQueries(REQUEST_QUERIES + 4):  # Only the statistics cards: four aggregates
+            response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, '<h2 class="mb-0">1</h2>')
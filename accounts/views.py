@@ -3,6 +3,8 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
+from asgiref.sync import sync_to_async
+from hospital_management.widgets import Widget, async_login_required, load_widgets
 
 def user_login(request):
     if request.user.is_authenticated:
@@ -32,8 +34,8 @@ def user_logout(request):
 def profile(request):
     return render(request, 'accounts/profile.html')
 
-@login_required
-def dashboard(request):
+@async_login_required
+async def dashboard(request):
     from patients.models import Patient
     from doctors.models import Doctor
     from appointments.models import Appointment
@@ -43,22 +45,22 @@ def dashboard(request):
     
     today = timezone.now().date()
     
-    total_doctors = Doctor.objects.count()
-    total_patients = Patient.objects.count()
-    today_appointments = Appointment.objects.filter(appointment_date=today).count()
-    total_revenue = Bill.objects.filter(status='PAID').aggregate(total=Sum('total_amount'))['total'] or 0
-    recent_patients = Patient.objects.all().order_by('-created_at')[:5]
-    recent_appointments = Appointment.objects.all().order_by('-created_at')[:5]
-    low_stock_medicines = Medicine.objects.filter(stock_quantity__lt=10)
-    
-    context = {
-        'total_doctors': total_doctors,
-        'total_patients': total_patients,
-        'today_appointments': today_appointments,
-        'total_revenue': total_revenue,
-        'recent_patients': recent_patients,
-        'recent_appointments': recent_appointments,
-        'low_stock_medicines': low_stock_medicines,
-    }
+    # One Widget per {% versioned_cache %} fragment in dashboard.html; cached ones load nothing
+    widgets = [
+        Widget('dashboard-stats', ['doctors.Doctor', 'patients.Patient', 'appointments.Appointment', 'billing.Bill'], {
+            'total_doctors': Doctor.objects.count,
+            'total_patients': Patient.objects.count,
+            'today_appointments': Appointment.objects.filter(appointment_date=today).count,
+            'total_revenue': lambda: Bill.objects.filter(status='PAID').aggregate(total=Sum('total_amount'))['total'] or 0,
+        }, vary_on=[today]),
+        Widget('dashboard-recent-patients', ['patients.Patient'], {
+            'recent_patients': lambda: list(Patient.objects.select_related('user').order_by('-created_at')[:5]),
+        }),
+        Widget('dashboard-low-stock', ['pharmacy.Medicine'], {
+            'low_stock_count': Medicine.objects.filter(stock_quantity__lt=10).count,
+        }),
+    ]
+    context = await load_widgets(widgets)
+    context['today'] = today
     
-    return render(request, 'dashboard.html', context)
+    return await sync_to_async(render)(request, 'dashboard.html', context)
@@ -22,4 +22,10 @@ class Appointment(models.Model):
     
     class Meta:
         db_table = 'appointments'
-        ordering = ['-appointment_date', '-appointment_time']
\ No newline at end of file
+        ordering = ['-appointment_date', '-appointment_time']
+        indexes = [
+            models.Index(fields=['appointment_date', 'status']),  # Day views, status counts
+            models.Index(fields=['doctor', 'appointment_date']),  # Per-doctor schedules and reports
+            models.Index(fields=['appointment_date', 'appointment_time']),  # Default ordering
+            models.Index(fields=['created_at']),  # Recent appointments
+        ]
\ No newline at end of file
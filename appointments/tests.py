@@ -1,3 +1,16 @@
-from django.test import TestCase
+from datetime import date, time
 
-# Create your tests here.
+from hospital_management.testing import DetailQueryTestCase
+
+from .models import Appointment
+
+
+class AppointmentDetailQueryTests(DetailQueryTestCase):
+
+    def test_appointment_detail_query_count(self):
+        appointment = Appointment.objects.create(
+            appointment_id='APT000001', patient=self.make_patient(), doctor=self.make_doctor(),
+            appointment_date=date(2024, 1, 10), appointment_time=time(10, 30),
+            appointment_type='Consultation', symptoms='Fever',
+        )
+        self.assertDetailQueries('appointments:appointment_detail', appointment.pk, 1)
@@ -5,10 +5,15 @@ from django.db.models import Q
 from django.utils import timezone
 from .models import Appointment
 from patients.models import Patient
+from patients.lookup import selected_patient
 from doctors.models import Doctor
+from hospital_management.detail import DetailGraph
 import random
 import string
 
+APPOINTMENT_DETAIL = DetailGraph('appointments:appointment_detail', Appointment,
+                                 select_related=['patient__user', 'doctor__user'])
+
 def generate_appointment_id():
     """Generate unique appointment ID"""
     prefix = "APT"
@@ -53,7 +58,7 @@ def appointment_list(request):
 @login_required
 def appointment_detail(request, pk):
     """Display detailed view of an appointment"""
-    appointment = get_object_or_404(Appointment, pk=pk)
+    appointment = APPOINTMENT_DETAIL.get_or_404(pk=pk)
     return render(request, 'appointments/appointment_detail.html', {'appointment': appointment})
 
 
@@ -74,10 +79,9 @@ def appointment_create(request):
             # Validate required fields
             if not all([patient_id, doctor_id, appointment_date, appointment_time, appointment_type, symptoms]):
                 messages.error(request, 'Please fill in all required fields!')
-                patients = Patient.objects.all().select_related('user')
                 doctors = Doctor.objects.filter(is_available=True).select_related('user')
                 return render(request, 'appointments/appointment_form.html', {
-                    'patients': patients,
+                    'selected_patient': selected_patient(request),
                     'doctors': doctors,
                     'is_update': False
                 })
@@ -107,26 +111,22 @@ def appointment_create(request):
             
         except Exception as e:
             messages.error(request, f'Error creating appointment: {str(e)}')
-            patients = Patient.objects.all().select_related('user')
             doctors = Doctor.objects.filter(is_available=True).select_related('user')
             return render(request, 'appointments/appointment_form.html', {
-                'patients': patients,
+                'selected_patient': selected_patient(request),
                 'doctors': doctors,
                 'is_update': False
             })
     
     # GET request - show form
-    patients = Patient.objects.all().select_related('user')
     doctors = Doctor.objects.filter(is_available=True).select_related('user')
     
     # Get URL parameters for auto-selection
-    selected_patient = request.GET.get('patient')
     selected_doctor = request.GET.get('doctor')
     
     context = {
-        'patients': patients,
+        'selected_patient': selected_patient(request),
         'doctors': doctors,
-        'selected_patient': selected_patient,
         'selected_doctor': selected_doctor,
         'is_update': False
     }
@@ -151,11 +151,10 @@ def appointment_update(request, pk):
             if not all([appointment.appointment_date, appointment.appointment_time, 
                        appointment.appointment_type, appointment.symptoms]):
                 messages.error(request, 'Please fill in all required fields!')
-                patients = Patient.objects.all().select_related('user')
                 doctors = Doctor.objects.all().select_related('user')
                 return render(request, 'appointments/appointment_form.html', {
                     'appointment': appointment,
-                    'patients': patients,
+                    'selected_patient': appointment.patient,
                     'doctors': doctors,
                     'is_update': True
                 })
@@ -169,12 +168,11 @@ def appointment_update(request, pk):
             messages.error(request, f'Error updating appointment: {str(e)}')
     
     # GET request - show form with appointment data
-    patients = Patient.objects.all().select_related('user')
     doctors = Doctor.objects.all().select_related('user')
     
     context = {
         'appointment': appointment,
-        'patients': patients,
+        'selected_patient': appointment.patient,
         'doctors': doctors,
         'is_update': True
     }
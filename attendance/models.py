@@ -34,6 +34,9 @@ class Attendance(models.Model):
     class Meta:
         ordering = ['-date']
         unique_together = ['employee', 'date']
+        indexes = [
+            models.Index(fields=['date', 'status']),  # Daily and weekly attendance summaries
+        ]
         verbose_name = 'Attendance'
         verbose_name_plural = 'Attendances'
 
@@ -1,3 +1,15 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from hospital_management.testing import DetailQueryTestCase
+
+from .models import Leave
+
+
+class LeaveDetailQueryTests(DetailQueryTestCase):
+
+    def test_leave_detail_loads_employee_user(self):
+        leave = Leave.objects.create(
+            employee=self.make_employee(), leave_type='SICK', start_date=date(2024, 1, 10),
+            end_date=date(2024, 1, 12), reason='Flu',
+        )
+        self.assertGraphQueries('attendance:leave_detail', leave.pk, ['employee.user.first_name'], 1)
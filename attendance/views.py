@@ -3,8 +3,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from django.db.models import Count, Q
+from hospital_management.detail import DetailGraph
 from .models import Attendance, Leave, Shift, EmployeeShift
 
+LEAVE_DETAIL = DetailGraph('attendance:leave_detail', Leave, select_related=['employee__user'])
+
 @login_required
 def attendance_dashboard(request):
     today = timezone.now().date()
@@ -351,7 +354,7 @@ def leave_create(request):
 
 @login_required
 def leave_detail(request, pk):
-    leave = get_object_or_404(Leave, pk=pk)
+    leave = LEAVE_DETAIL.get_or_404(pk=pk)
     context = {'leave': leave}
     return render(request, 'attendance/leave_detail.html', context)
 
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0002_alter_bill_options_remove_bill_appointment_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['status', 'created_at'], name='billing_bil_status_db3467_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['created_at'], name='billing_bil_created_94a3b1_idx'),
+        ),
+    ]
@@ -71,4 +71,8 @@ class Bill(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Bill'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),  # Revenue by status
+            models.Index(fields=['created_at']),  # Default ordering, daily report
+        ]
         verbose_name_plural = 'Bills'
\ No newline at end of file
@@ -1,3 +1,34 @@
+import gzip
+
 from django.test import TestCase
+from django.urls import reverse
+
+from hospital_management.testing import DetailQueryTestCase, SampleDataMixin
+
+from .models import Bill
+
+
+class BillDetailQueryTests(DetailQueryTestCase):
+
+    def test_bill_detail_query_count(self):
+        bill = Bill.objects.create(patient=self.make_patient(), total_amount=500, amount_paid=200)
+        self.assertDetailQueries('billing:bill_detail', bill.pk, 1)
+
+
+class BillListStreamingTests(SampleDataMixin, TestCase):
+
+    def test_bill_list_streams_every_bill_compressed(self):
+        bills = [Bill.objects.create(patient=self.make_patient(), total_amount=100) for _ in range(3)]
+        response = self.client.get(reverse('billing:bill_list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        page = gzip.decompress(b''.join(response.streaming_content)).decode()
+        for bill in bills:
+            self.assertIn(bill.bill_number, page)
+        self.assertNotIn('No Bills Found', page)
+        self.assertTrue(page.rstrip().endswith('</html>'))
 
-# Create your tests here.
+    def test_empty_bill_list_streams_without_rows(self):
+        response = self.client.get(reverse('billing:bill_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('No Bills Found', b''.join(response.streaming_content).decode())
@@ -1,10 +1,16 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Sum
+from django.db.models import Sum
 from django.http import HttpResponse
 from .models import Bill
 from patients.models import Patient
+from patients.lookup import selected_patient
+from search.index import search_queryset
+from hospital_management.detail import DetailGraph
+from hospital_management.streaming import stream_page
+
+BILL_DETAIL = DetailGraph('billing:bill_detail', Bill, select_related=['patient__user'])
 
 @login_required
 def bill_list(request):
@@ -14,12 +20,7 @@ def bill_list(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        bills = bills.filter(
-            Q(bill_number__icontains=search_query) |
-            Q(patient__user__first_name__icontains=search_query) |
-            Q(patient__user__last_name__icontains=search_query) |
-            Q(patient__patient_id__icontains=search_query)
-        )
+        bills = search_queryset(bills, 'bill', search_query)
     
     # Status filter
     status_filter = request.GET.get('status', '')
@@ -34,7 +35,7 @@ def bill_list(request):
     total_bills = Bill.objects.count()
     
     context = {
-        'bills': bills,
+        'has_bills': bills.exists(),
         'search_query': search_query,
         'status_filter': status_filter,
         'total_revenue': total_revenue,
@@ -43,13 +44,13 @@ def bill_list(request):
         'partial_bills': partial_bills,
         'total_bills': total_bills,
     }
-    return render(request, 'billing/bill_list.html', context)
+    return stream_page(request, 'billing/bill_list.html', context, bills, 'billing/_bill_rows.html')
 
 
 @login_required
 def bill_detail(request, pk):
     """Display detailed view of a single bill"""
-    bill = get_object_or_404(Bill, pk=pk)
+    bill = BILL_DETAIL.get_or_404(pk=pk)
     return render(request, 'billing/bill_detail.html', {'bill': bill})
 
 
@@ -62,9 +63,8 @@ def bill_create(request):
             patient_id = request.POST.get('patient')
             if not patient_id:
                 messages.error(request, 'Please select a patient!')
-                patients = Patient.objects.all().select_related('user')
                 return render(request, 'billing/bill_form.html', {
-                    'patients': patients,
+                    'selected_patient': selected_patient(request),
                     'is_update': False
                 })
             
@@ -90,18 +90,16 @@ def bill_create(request):
             # Validate total
             if total_amount <= 0:
                 messages.error(request, 'Bill total must be greater than zero!')
-                patients = Patient.objects.all().select_related('user')
                 return render(request, 'billing/bill_form.html', {
-                    'patients': patients,
+                    'selected_patient': selected_patient(request),
                     'is_update': False
                 })
             
             # Validate payment
             if amount_paid > total_amount:
                 messages.error(request, 'Amount paid cannot exceed total amount!')
-                patients = Patient.objects.all().select_related('user')
                 return render(request, 'billing/bill_form.html', {
-                    'patients': patients,
+                    'selected_patient': selected_patient(request),
                     'is_update': False
                 })
             
@@ -144,23 +142,20 @@ def bill_create(request):
             
         except ValueError:
             messages.error(request, 'Invalid amount entered. Please check your inputs.')
-            patients = Patient.objects.all().select_related('user')
             return render(request, 'billing/bill_form.html', {
-                'patients': patients,
+                'selected_patient': selected_patient(request),
                 'is_update': False
             })
         except Exception as e:
             messages.error(request, f'Error creating bill: {str(e)}')
-            patients = Patient.objects.all().select_related('user')
             return render(request, 'billing/bill_form.html', {
-                'patients': patients,
+                'selected_patient': selected_patient(request),
                 'is_update': False
             })
     
     # GET request - show form
-    patients = Patient.objects.all().select_related('user')
     context = {
-        'patients': patients,
+        'selected_patient': selected_patient(request),
         'is_update': False
     }
     return render(request, 'billing/bill_form.html', context)
@@ -189,10 +184,9 @@ def bill_update(request, pk):
             # Validate
             if total_amount <= 0:
                 messages.error(request, 'Bill total must be greater than zero!')
-                patients = Patient.objects.all().select_related('user')
                 return render(request, 'billing/bill_form.html', {
                     'bill': bill,
-                    'patients': patients,
+                    'selected_patient': bill.patient,
                     'is_update': True
                 })
             
@@ -218,10 +212,9 @@ def bill_update(request, pk):
             messages.error(request, f'Error updating bill: {str(e)}')
     
     # GET request - show form with bill data
-    patients = Patient.objects.all().select_related('user')
     context = {
         'bill': bill,
-        'patients': patients,
+        'selected_patient': bill.patient,
         'is_update': True
     }
     return render(request, 'billing/bill_form.html', context)
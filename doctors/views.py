@@ -2,8 +2,8 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.db.models import Q
 from .models import Doctor
+from search.index import search_queryset
 
 @login_required
 def doctor_list(request):
@@ -13,13 +13,7 @@ def doctor_list(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        doctors = doctors.filter(
-            Q(employee_id__icontains=search_query) |
-            Q(user__first_name__icontains=search_query) |
-            Q(user__last_name__icontains=search_query) |
-            Q(specialization__icontains=search_query) |
-            Q(phone_number__icontains=search_query)
-        )
+        doctors = search_queryset(doctors, 'doctor', search_query)
     
     context = {
         'doctors': doctors,
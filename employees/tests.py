@@ -1,3 +1,12 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from hospital_management.testing import DetailQueryTestCase
+
+from .models import Salary
+
+
+class SalaryDetailQueryTests(DetailQueryTestCase):
+
+    def test_salary_detail_loads_employee_user(self):
+        salary = Salary.objects.create(employee=self.make_employee(), month=date(2024, 1, 1), basic_salary=30000, total_amount=0)
+        self.assertGraphQueries('employees:salary_detail', salary.pk, ['employee.user.first_name'], 1)
@@ -2,8 +2,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from hospital_management.detail import DetailGraph
 from .models import Employee, Salary
 
+SALARY_DETAIL = DetailGraph('employees:salary_detail', Salary, select_related=['employee__user'])
+
 @login_required
 def employee_list(request):
     employees = Employee.objects.all().select_related('user')
@@ -45,7 +48,7 @@ def salary_create(request):
 
 @login_required
 def salary_detail(request, pk):
-    salary = get_object_or_404(Salary, pk=pk)
+    salary = SALARY_DETAIL.get_or_404(pk=pk)
     return render(request, 'employees/salary_detail.html', {'salary': salary})
 
 @login_required
@@ -1,6 +1,6 @@
 # financial/admin.py
 from django.contrib import admin
-from .models import Account, Transaction, Budget, Expense
+from .models import Account, Transaction, Budget, Expense, IdSequence, StatementImport, StatementLine
 
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
@@ -23,4 +23,20 @@ class BudgetAdmin(admin.ModelAdmin):
 class ExpenseAdmin(admin.ModelAdmin):
     list_display = ['expense_id', 'category', 'amount', 'paid_to', 'date']
     list_filter = ['category', 'date']
-    search_fields = ['expense_id', 'paid_to']
\ No newline at end of file
+    search_fields = ['expense_id', 'paid_to']
+
+@admin.register(IdSequence)
+class IdSequenceAdmin(admin.ModelAdmin):
+    list_display = ['name', 'last_value']
+
+@admin.register(StatementImport)
+class StatementImportAdmin(admin.ModelAdmin):
+    list_display = ['account', 'source', 'period_start', 'period_end', 'total_lines', 'matched_lines', 'unmatched_lines', 'unmatched_transactions']
+    list_filter = ['source', 'account']
+
+@admin.register(StatementLine)
+class StatementLineAdmin(admin.ModelAdmin):
+    list_display = ['statement_import', 'line_number', 'date', 'amount', 'reference', 'matched_transaction', 'match_method']
+    list_filter = ['match_method']
+    search_fields = ['reference', 'description']
+    raw_id_fields = ['statement_import', 'matched_transaction']
\ No newline at end of file
@@ -0,0 +1,294 @@
+# financial/importers.py
+"""
+Bulk import of Transactions and Expenses from CSV or JSONL.
+
+Rows are processed in chunks. Each chunk is validated column by column
+(choices checked against sets, accounts and duplicate IDs resolved with one
+query per chunk), missing IDs are allocated as a block, and rows are written
+with bulk_create. Account balances are adjusted once per account at the end
+using the summed deltas, instead of once per row as Transaction.save() does.
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Account, Transaction, Expense, allocate_ids
+
+CHUNK_SIZE = 2000
+MAX_ERRORS = 100
+ROW_ERROR = '_error'  # Key of a row the reader could not parse, reported by bulk_import
+
+
+class ImportValidationError(Exception):
+    """Raised when one or more rows fail validation; nothing is saved."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f'{len(errors)} row(s) failed validation')
+
+
+def read_rows(stream, file_format):
+    """Yield dicts from a CSV or JSONL stream (binary or text)."""
+    if isinstance(stream, io.TextIOBase):
+        yield from _read_text_rows(stream, file_format)
+        return
+
+    # Detach afterwards so the caller's file is not closed with the wrapper
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        yield from _read_text_rows(text_stream, file_format)
+    finally:
+        text_stream.detach()
+
+
+def _read_text_rows(stream, file_format):
+    if file_format == 'csv':
+        for row in csv.DictReader(stream):
+            if None in row:  # DictReader puts cells beyond the header under None
+                yield {ROW_ERROR: f'Expected {len(row) - 1} columns, found {len(row) - 1 + len(row[None])}'}
+                continue
+            yield {key.strip().lower(): (value or '').strip() for key, value in row.items()}
+    elif file_format == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield {ROW_ERROR: 'Invalid JSON'}
+                continue
+            if not isinstance(row, dict):
+                yield {ROW_ERROR: 'Expected a JSON object'}
+                continue
+            yield {str(key).lower(): '' if value is None else str(value).strip() for key, value in row.items()}
+    else:
+        raise ValueError(f'Unsupported format "{file_format}"')
+
+
+def detect_format(file_name):
+    return 'jsonl' if file_name.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Column validators: each takes the whole column and returns parsed values,
+# recording (row number, message) for bad cells.
+
+def _required(values, label, row_numbers, errors):
+    for value, row_number in zip(values, row_numbers):
+        if not value:
+            errors.append((row_number, f'{label} is required'))
+    return values
+
+
+def _choice(values, choices, label, row_numbers, errors, default=None):
+    allowed = {code for code, _ in choices}
+    parsed = []
+    for value, row_number in zip(values, row_numbers):
+        value = value.upper() or (default or '')
+        if value not in allowed:
+            errors.append((row_number, f'Invalid {label} "{value}"'))
+        parsed.append(value)
+    return parsed
+
+
+def _amount(values, row_numbers, errors):
+    parsed = []
+    for value, row_number in zip(values, row_numbers):
+        try:
+            amount = Decimal(value.replace(',', '')).quantize(Decimal('0.01'))
+            if amount < 0:
+                raise InvalidOperation
+        except InvalidOperation:
+            errors.append((row_number, f'Invalid amount "{value}"'))
+            amount = None
+        parsed.append(amount)
+    return parsed
+
+
+def _date(values, row_numbers, errors):
+    cache = {}
+    parsed = []
+    for value, row_number in zip(values, row_numbers):
+        if value not in cache:
+            try:
+                cache[value] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                cache[value] = None
+        if cache[value] is None:
+            errors.append((row_number, f'Invalid date "{value}" (use YYYY-MM-DD)'))
+        parsed.append(cache[value])
+    return parsed
+
+
+def _unique_ids(values, model, field, row_numbers, errors):
+    """Reject IDs repeated in the chunk or already in the database (one query)."""
+    supplied = [value for value in values if value]
+    existing = set(model.objects.filter(**{f'{field}__in': supplied}).values_list(field, flat=True))
+    seen = set()
+    for value, row_number in zip(values, row_numbers):
+        if not value:
+            continue
+        if value in existing or value in seen:
+            errors.append((row_number, f'Duplicate ID "{value}"'))
+        seen.add(value)
+    return values
+
+
+def _assign_ids(values, prefix):
+    missing = sum(1 for value in values if not value)
+    new_ids = iter(allocate_ids(prefix, missing)) if missing else iter(())
+    return [value or next(new_ids) for value in values]
+
+
+def _transaction_chunk(rows, row_numbers, errors, accounts):
+    column = lambda name: [row.get(name, '') for row in rows]
+
+    account_numbers = _required(column('account'), 'Account', row_numbers, errors)
+    unknown = {number for number in account_numbers if number} - set(accounts)
+    if unknown:
+        accounts.update(
+            Account.objects.filter(account_number__in=unknown).in_bulk(field_name='account_number')
+        )
+    for number, row_number in zip(account_numbers, row_numbers):
+        if number and number not in accounts:
+            errors.append((row_number, f'Unknown account "{number}"'))
+
+    transaction_ids = _unique_ids(column('transaction_id'), Transaction, 'transaction_id', row_numbers, errors)
+    types = _choice(column('transaction_type'), Transaction.TRANSACTION_TYPE_CHOICES, 'transaction type', row_numbers, errors)
+    categories = _choice(column('category'), Transaction.CATEGORY_CHOICES, 'category', row_numbers, errors)
+    amounts = _amount(column('amount'), row_numbers, errors)
+    methods = _choice(column('payment_method'), Transaction.PAYMENT_METHOD_CHOICES, 'payment method', row_numbers, errors, default='CASH')
+    descriptions = _required(column('description'), 'Description', row_numbers, errors)
+    dates = _date(column('date'), row_numbers, errors)
+    references = [value[:100] for value in column('reference')]
+
+    if errors:
+        return []
+
+    transaction_ids = _assign_ids(transaction_ids, 'TXN')
+    return [
+        Transaction(
+            transaction_id=transaction_ids[i],
+            account=accounts[account_numbers[i]],
+            transaction_type=types[i],
+            category=categories[i],
+            amount=amounts[i],
+            payment_method=methods[i],
+            reference=references[i],
+            description=descriptions[i],
+            date=dates[i],
+        )
+        for i in range(len(rows))
+    ]
+
+
+def _expense_chunk(rows, row_numbers, errors, accounts):
+    column = lambda name: [row.get(name, '') for row in rows]
+
+    expense_ids = _unique_ids(column('expense_id'), Expense, 'expense_id', row_numbers, errors)
+    categories = _choice(column('category'), Transaction.CATEGORY_CHOICES, 'category', row_numbers, errors)
+    amounts = _amount(column('amount'), row_numbers, errors)
+    paid_to = _required(column('paid_to'), 'Paid to', row_numbers, errors)
+    methods = _choice(column('payment_method'), Transaction.PAYMENT_METHOD_CHOICES, 'payment method', row_numbers, errors, default='CASH')
+    dates = _date(column('date'), row_numbers, errors)
+    descriptions = _required(column('description'), 'Description', row_numbers, errors)
+    receipts = [value[:50] for value in column('receipt_number')]
+    approvers = [value[:100] for value in column('approved_by')]
+
+    if errors:
+        return []
+
+    expense_ids = _assign_ids(expense_ids, 'EXP')
+    return [
+        Expense(
+            expense_id=expense_ids[i],
+            category=categories[i],
+            amount=amounts[i],
+            paid_to=paid_to[i][:200],
+            payment_method=methods[i],
+            date=dates[i],
+            description=descriptions[i],
+            receipt_number=receipts[i],
+            approved_by=approvers[i],
+        )
+        for i in range(len(rows))
+    ]
+
+
+IMPORTERS = {
+    'transactions': (Transaction, _transaction_chunk),
+    'expenses': (Expense, _expense_chunk),
+}
+
+
+def bulk_import(kind, rows, chunk_size=CHUNK_SIZE):
+    """
+    Validate and insert ``rows`` (an iterable of dicts) as ``kind``.
+
+    Everything runs in one database transaction: if any row is invalid an
+    ImportValidationError listing the bad rows is raised and nothing is
+    saved. Returns (created count, {account: balance delta}).
+    """
+    model, build_chunk = IMPORTERS[kind]
+    accounts = {}
+    deltas = defaultdict(Decimal)
+    errors = []
+    created = 0
+    row_number = 0
+
+    with transaction.atomic():
+        for chunk in _chunks(rows, chunk_size):
+            row_numbers = range(row_number + 1, row_number + 1 + len(chunk))
+            row_number += len(chunk)
+
+            chunk_errors = [(number, row[ROW_ERROR]) for number, row in zip(row_numbers, chunk) if ROW_ERROR in row]
+            if chunk_errors:
+                # Validate the readable rows too, so their problems are reported in the same pass
+                parsed = [(number, row) for number, row in zip(row_numbers, chunk) if ROW_ERROR not in row]
+                row_numbers, chunk = [number for number, _ in parsed], [row for _, row in parsed]
+            objects = build_chunk(chunk, row_numbers, chunk_errors, accounts)
+            if chunk_errors:
+                errors.extend(chunk_errors)
+                if len(errors) >= MAX_ERRORS:
+                    break
+                continue
+            if errors:
+                # Keep validating so every problem is reported, but stop writing
+                continue
+
+            model.objects.bulk_create(objects, batch_size=500)
+            created += len(objects)
+
+            if model is Transaction:
+                for obj in objects:
+                    if obj.transaction_type == 'INCOME':
+                        deltas[obj.account] += obj.amount
+                    elif obj.transaction_type == 'EXPENSE':
+                        deltas[obj.account] -= obj.amount
+
+        if errors:
+            raise ImportValidationError(sorted(errors)[:MAX_ERRORS])
+
+        # One UPDATE per account with the summed delta
+        for account, delta in deltas.items():
+            if delta:
+                Account.objects.filter(pk=account.pk).update(balance=F('balance') + delta)
+
+    return created, dict(deltas)
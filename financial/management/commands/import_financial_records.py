@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from financial.importers import bulk_import, read_rows, detect_format, ImportValidationError, CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Bulk import transactions or expenses from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['transactions', 'expenses'])
+        parser.add_argument('path', help='CSV or JSONL file to import')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['path'])
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                created, deltas = bulk_import(
+                    options['kind'],
+                    read_rows(stream, file_format),
+                    chunk_size=options['chunk_size'],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+        except ImportValidationError as e:
+            for row_number, message in e.errors:
+                self.stderr.write(f'Row {row_number}: {message}')
+            raise CommandError(f'{e} - nothing was imported')
+
+        self.stdout.write(self.style.SUCCESS(f'Imported {created} {options["kind"]}'))
+        for account, delta in deltas.items():
+            self.stdout.write(f'  {account}: balance {delta:+}')
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financial', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatementImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('BANK', 'Bank Statement'), ('BKASH', 'bKash Statement'), ('NAGAD', 'Nagad Statement')], max_length=20)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('date_window', models.PositiveIntegerField(default=3)),
+                ('total_lines', models.IntegerField(default=0)),
+                ('matched_lines', models.IntegerField(default=0)),
+                ('unmatched_lines', models.IntegerField(default=0)),
+                ('unmatched_transactions', models.IntegerField(default=0)),
+                ('imported_by', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statement_imports', to='financial.account')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatementLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.IntegerField()),
+                ('date', models.DateField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('reference', models.CharField(blank=True, max_length=100)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('match_method', models.CharField(blank=True, choices=[('REFERENCE', 'Reference'), ('AMOUNT_DATE', 'Amount & Date')], max_length=20)),
+                ('matched_transaction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='statement_lines', to='financial.transaction')),
+                ('statement_import', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='financial.statementimport')),
+            ],
+            options={
+                'ordering': ['line_number'],
+                'indexes': [models.Index(fields=['statement_import', 'matched_transaction'], name='financial_s_stateme_6e7631_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.core.validators import MinValueValidator
 
 class Account(models.Model):
@@ -92,6 +93,10 @@ class Transaction(models.Model):
     
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['account', 'date']),  # Account statements
+            models.Index(fields=['date', 'transaction_type']),  # Monthly income and expense totals
+        ]
 
 
 class Budget(models.Model):
@@ -136,4 +141,83 @@ class Expense(models.Model):
         return f"{self.expense_id} - ৳{self.amount}"
     
     class Meta:
-        ordering = ['-date']
\ No newline at end of file
+        ordering = ['-date']
+
+class IdSequence(models.Model):
+    """Named counter used to hand out collision-free document IDs in blocks"""
+    name = models.CharField(max_length=50, unique=True)
+    last_value = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name} ({self.last_value})"
+    
+    @classmethod
+    def allocate(cls, name, count=1):
+        """Reserve ``count`` consecutive numbers and return them as a range"""
+        with transaction.atomic():
+            sequence, _ = cls.objects.get_or_create(name=name)
+            cls.objects.filter(pk=sequence.pk).update(last_value=F('last_value') + count)
+            sequence.refresh_from_db(fields=['last_value'])
+        return range(sequence.last_value - count + 1, sequence.last_value + 1)
+
+
+def allocate_ids(prefix, count=1):
+    """Generate ``count`` unique IDs such as TXN-00000042"""
+    return [f"{prefix}-{number:08d}" for number in IdSequence.allocate(prefix, count)]
+
+
+class StatementImport(models.Model):
+    SOURCE_CHOICES = [
+        ('BANK', 'Bank Statement'),
+        ('BKASH', 'bKash Statement'),
+        ('NAGAD', 'Nagad Statement'),
+    ]
+    
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='statement_imports')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    file_name = models.CharField(max_length=255, blank=True)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    date_window = models.PositiveIntegerField(default=3)  # Days either side of the statement date
+    total_lines = models.IntegerField(default=0)
+    matched_lines = models.IntegerField(default=0)
+    unmatched_lines = models.IntegerField(default=0)
+    unmatched_transactions = models.IntegerField(default=0)
+    imported_by = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.account.account_name} - {self.period_start} to {self.period_end}"
+    
+    class Meta:
+        ordering = ['-created_at']
+
+
+class StatementLine(models.Model):
+    MATCH_CHOICES = [
+        ('REFERENCE', 'Reference'),
+        ('AMOUNT_DATE', 'Amount & Date'),
+    ]
+    
+    statement_import = models.ForeignKey(StatementImport, on_delete=models.CASCADE, related_name='lines')
+    line_number = models.IntegerField()
+    date = models.DateField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)  # Signed: credits positive, debits negative
+    reference = models.CharField(max_length=100, blank=True)
+    description = models.CharField(max_length=255, blank=True)
+    matched_transaction = models.ForeignKey(Transaction, on_delete=models.SET_NULL, null=True, blank=True,
+                                            related_name='statement_lines')
+    match_method = models.CharField(max_length=20, choices=MATCH_CHOICES, blank=True)
+    
+    def __str__(self):
+        return f"Line {self.line_number} - ৳{self.amount}"
+    
+    @property
+    def is_matched(self):
+        return self.matched_transaction_id is not None
+    
+    class Meta:
+        ordering = ['line_number']
+        indexes = [
+            models.Index(fields=['statement_import', 'matched_transaction']),
+        ]
@@ -0,0 +1,275 @@
+# financial/reconciliation.py
+"""
+Statement import and reconciliation.
+
+Bank, bKash and Nagad statements are streamed line by line from CSV and
+matched against the account's Transactions using in-memory hash indexes
+(by reference and by signed amount), so a statement is read once and never
+held in memory as a whole. Parsed lines are written to StatementLine in
+batches, which keeps both matched and unmatched items queryable afterwards.
+"""
+import csv
+import io
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from django.db import transaction
+
+from .models import StatementImport, StatementLine, Transaction
+
+BATCH_SIZE = 1000
+
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d-%b-%Y', '%d %b %Y', '%m/%d/%Y']
+
+# Accepted header names for each column (lower-cased)
+DATE_COLUMNS = ['date', 'transaction date', 'txn date', 'value date']
+AMOUNT_COLUMNS = ['amount', 'transaction amount']
+CREDIT_COLUMNS = ['credit', 'deposit', 'cash in']
+DEBIT_COLUMNS = ['debit', 'withdrawal', 'cash out']
+REFERENCE_COLUMNS = ['reference', 'ref', 'trx id', 'trxid', 'transaction id', 'cheque no']
+DESCRIPTION_COLUMNS = ['description', 'details', 'narration', 'particulars']
+
+ParsedLine = namedtuple('ParsedLine', ['line_number', 'date', 'amount', 'reference', 'description'])
+
+
+class StatementFormatError(ValueError):
+    """Raised when a statement file cannot be understood."""
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value):
+    # Statements repeat the same few dates thousands of times, so parsed dates are cached
+    value = (value or '').strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise StatementFormatError(f'Unrecognised date "{value}"')
+
+
+def _parse_amount(value):
+    value = (value or '').strip().replace(',', '').replace('৳', '')
+    if not value:
+        return Decimal('0')
+    # Accounting style negatives, e.g. (1,200.00)
+    if value.startswith('(') and value.endswith(')'):
+        value = '-' + value[1:-1]
+    try:
+        return Decimal(value).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise StatementFormatError(f'Unrecognised amount "{value}"')
+
+
+def _find_column(fieldnames, choices):
+    for name in fieldnames:
+        if name in choices:
+            return name
+    return None
+
+
+def read_statement(stream):
+    """
+    Yield ParsedLine tuples from a CSV statement, one row at a time.
+
+    ``stream`` may be a binary file (e.g. an uploaded file) or a text stream.
+    The statement needs a date column and either a signed amount column or
+    separate debit/credit columns.
+    """
+    if isinstance(stream, io.TextIOBase):
+        yield from _read_rows(stream)
+        return
+
+    # Wrap binary uploads for decoding, and detach afterwards so the caller's
+    # file is not closed along with the wrapper
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        yield from _read_rows(text_stream)
+    finally:
+        text_stream.detach()
+
+
+def _read_rows(stream):
+    reader = csv.reader(stream)
+    try:
+        header = [column.strip().lower() for column in next(reader)]
+    except StopIteration:
+        return
+
+    date_col = _find_column(header, DATE_COLUMNS)
+    amount_col = _find_column(header, AMOUNT_COLUMNS)
+    credit_col = _find_column(header, CREDIT_COLUMNS)
+    debit_col = _find_column(header, DEBIT_COLUMNS)
+    reference_col = _find_column(header, REFERENCE_COLUMNS)
+    description_col = _find_column(header, DESCRIPTION_COLUMNS)
+
+    if date_col is None or (amount_col is None and credit_col is None and debit_col is None):
+        raise StatementFormatError('Statement must have a date column and an amount or debit/credit columns')
+
+    index = {name: position for position, name in enumerate(header)}
+
+    def cell(row, column):
+        if column is None or index[column] >= len(row):
+            return ''
+        return row[index[column]]
+
+    for line_number, row in enumerate(reader, start=2):
+        if not any(value.strip() for value in row):
+            continue
+
+        if amount_col is not None:
+            amount = _parse_amount(cell(row, amount_col))
+        else:
+            amount = _parse_amount(cell(row, credit_col)) - abs(_parse_amount(cell(row, debit_col)))
+
+        yield ParsedLine(
+            line_number=line_number,
+            date=_parse_date(cell(row, date_col)),
+            amount=amount,
+            reference=cell(row, reference_col).strip()[:100],
+            description=cell(row, description_col).strip()[:255],
+        )
+
+
+class TransactionIndex:
+    """
+    Hash indexes over an account's Transactions for a statement period.
+
+    Candidates are keyed by (reference, signed amount) and by signed amount
+    alone. Income is a credit on the statement and expenses a debit; transfers
+    carry no direction, so they are indexed under both signs. Each bucket is
+    kept in date order so the date window is found by bisection rather than
+    by scanning the bucket.
+    """
+
+    def __init__(self, account, start_date, end_date, date_window):
+        self.date_window = timedelta(days=date_window)
+        self.by_reference = defaultdict(lambda: ([], []))
+        self.by_amount = defaultdict(lambda: ([], []))
+        self.matched = set()
+
+        rows = Transaction.objects.filter(
+            account=account,
+            date__gte=start_date - self.date_window,
+            date__lte=end_date + self.date_window,
+        ).order_by('date', 'pk').values_list('pk', 'date', 'amount', 'transaction_type', 'reference')
+
+        for pk, date, amount, transaction_type, reference in rows.iterator(chunk_size=BATCH_SIZE):
+            reference = reference.strip().lower()
+            if transaction_type == 'INCOME':
+                keys = [amount]
+            elif transaction_type == 'EXPENSE':
+                keys = [-amount]
+            else:
+                keys = [amount, -amount]
+
+            for key in keys:
+                self._add(self.by_amount[key], pk, date)
+                if reference:
+                    self._add(self.by_reference[(reference, key)], pk, date)
+
+    @staticmethod
+    def _add(bucket, pk, date):
+        dates, pks = bucket
+        dates.append(date)
+        pks.append(pk)
+
+    def _closest(self, bucket, date):
+        dates, pks = bucket
+        low = bisect_left(dates, date - self.date_window)
+        high = bisect_right(dates, date + self.date_window)
+        best = None
+        for position in range(low, high):
+            if pks[position] in self.matched:
+                continue
+            if best is None or abs(dates[position] - date) < abs(dates[best] - date):
+                best = position
+        return None if best is None else pks[best]
+
+    def match(self, line):
+        """Return (transaction pk, match method) for a statement line, or (None, '')."""
+        if line.reference:
+            bucket = self.by_reference.get((line.reference.lower(), line.amount))
+            if bucket:
+                pk = self._closest(bucket, line.date)
+                if pk:
+                    self.matched.add(pk)
+                    return pk, 'REFERENCE'
+
+        bucket = self.by_amount.get(line.amount)
+        if bucket:
+            pk = self._closest(bucket, line.date)
+            if pk:
+                self.matched.add(pk)
+                return pk, 'AMOUNT_DATE'
+
+        return None, ''
+
+
+def reconcile_statement(account, stream, period_start, period_end, source='BANK',
+                        date_window=3, file_name='', imported_by=''):
+    """
+    Import a statement for ``account`` and reconcile it against Transactions.
+
+    Returns the saved StatementImport with its summary counts filled in.
+    Unmatched statement lines are StatementLines without a matched
+    transaction; unmatched transactions are available through
+    ``unmatched_transactions_for``.
+    """
+    index = TransactionIndex(account, period_start, period_end, date_window)
+
+    with transaction.atomic():
+        statement = StatementImport.objects.create(
+            account=account,
+            source=source,
+            file_name=file_name[:255],
+            period_start=period_start,
+            period_end=period_end,
+            date_window=date_window,
+            imported_by=imported_by,
+        )
+
+        total = matched = 0
+        batch = []
+        for line in read_statement(stream):
+            transaction_pk, method = index.match(line)
+            total += 1
+            if transaction_pk:
+                matched += 1
+            batch.append(StatementLine(
+                statement_import=statement,
+                line_number=line.line_number,
+                date=line.date,
+                amount=line.amount,
+                reference=line.reference,
+                description=line.description,
+                matched_transaction_id=transaction_pk,
+                match_method=method,
+            ))
+            if len(batch) >= BATCH_SIZE:
+                StatementLine.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            StatementLine.objects.bulk_create(batch)
+
+        statement.total_lines = total
+        statement.matched_lines = matched
+        statement.unmatched_lines = total - matched
+        statement.unmatched_transactions = unmatched_transactions_for(statement).count()
+        statement.save(update_fields=['total_lines', 'matched_lines', 'unmatched_lines', 'unmatched_transactions'])
+
+    return statement
+
+
+def unmatched_transactions_for(statement):
+    """Transactions in the statement period that no statement line matched."""
+    return Transaction.objects.filter(
+        account=statement.account,
+        date__gte=statement.period_start,
+        date__lte=statement.period_end,
+    ).exclude(
+        statement_lines__statement_import=statement
+    )
@@ -1,3 +1,129 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.urls import reverse
+
+from .importers import ImportValidationError, bulk_import, read_rows
+from .models import Account, Expense, StatementImport, Transaction
+from .reconciliation import StatementFormatError, reconcile_statement, unmatched_transactions_for
+
+EXPENSE_HEADER = 'category,amount,paid_to,payment_method,date,description\n'
+EXPENSE_ROW = 'UTILITY,1200.50,DESCO,CASH,2025-01-10,Electricity\n'
+
+
+class BulkImportTests(TestCase):
+
+    def import_expenses(self, text, file_format='csv'):
+        return bulk_import('expenses', read_rows(io.StringIO(text), file_format))
+
+    def test_imports_rows_with_allocated_ids(self):
+        created, _ = self.import_expenses(EXPENSE_HEADER + EXPENSE_ROW * 3)
+        self.assertEqual(created, 3)
+        self.assertEqual(len(set(Expense.objects.values_list('expense_id', flat=True))), 3)
+
+    def test_extra_csv_columns_are_a_row_error(self):
+        with self.assertRaises(ImportValidationError) as raised:
+            self.import_expenses(EXPENSE_HEADER + EXPENSE_ROW + EXPENSE_ROW.rstrip() + ',extra\n' + 'BAD' + EXPENSE_ROW)
+        self.assertEqual(raised.exception.errors, [
+            (2, 'Expected 6 columns, found 7'),
+            (3, 'Invalid category "BADUTILITY"'),
+        ])
+        self.assertFalse(Expense.objects.exists())
+
+    def test_jsonl_lines_that_are_not_objects_are_row_errors(self):
+        valid = ('{"category": "RENT", "amount": 10, "paid_to": "Owner", "date": "2025-01-01",'
+                 ' "description": "Rent"}\n')
+        with self.assertRaises(ImportValidationError) as raised:
+            self.import_expenses(valid + '[1, 2]\n{not json\n' + valid, 'jsonl')
+        self.assertEqual(raised.exception.errors, [(2, 'Expected a JSON object'), (3, 'Invalid JSON')])
+
+
+class ExpenseCreateTests(TestCase):
+
+    def test_blank_expense_id_is_allocated_from_the_sequence(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        data = {'expense_id': 'EXP-', 'category': 'rent', 'amount': '500', 'paid_to': 'Owner',
+                'payment_method': 'CASH', 'description': 'Rent', 'date': '2025-01-01'}
+        self.client.post(reverse('financial:expense_create'), data)
+        self.client.post(reverse('financial:expense_create'), data)
+        self.assertEqual(sorted(Expense.objects.values_list('expense_id', flat=True)),
+                         ['EXP-00000001', 'EXP-00000002'])
+
+
+class ReconciliationTests(TestCase):
+
+    def setUp(self):
+        self.account = Account.objects.create(account_number='ACC-1', account_name='Main', account_type='BANK')
+
+    def add_transaction(self, transaction_id, kind, amount, day, reference=''):
+        return Transaction.objects.create(
+            transaction_id=transaction_id, account=self.account, transaction_type=kind,
+            category='CONSULTATION' if kind == 'INCOME' else 'UTILITY', amount=Decimal(amount),
+            payment_method='BANK_TRANSFER', reference=reference, description=transaction_id, date=day,
+        )
+
+    def reconcile(self, rows, date_window=3):
+        text = 'date,amount,reference,description\n' + ''.join(f'{row}\n' for row in rows)
+        return reconcile_statement(self.account, io.StringIO(text), period_start=date(2025, 1, 1),
+                                   period_end=date(2025, 1, 31), date_window=date_window)
+
+    def matches(self, statement):
+        return {line.line_number: (line.matched_transaction.transaction_id if line.matched_transaction else None,
+                                   line.match_method)
+                for line in statement.lines.select_related('matched_transaction')}
+
+    def test_matches_by_reference_then_by_amount_and_date(self):
+        self.add_transaction('TXN-REF', 'INCOME', '500.00', date(2025, 1, 8), reference='BK123')
+        self.add_transaction('TXN-OTHER', 'INCOME', '500.00', date(2025, 1, 10))
+        self.add_transaction('TXN-BILL', 'EXPENSE', '1200.00', date(2025, 1, 12))
+        statement = self.reconcile([
+            '2025-01-10,500.00,bk123,bKash receipt',  # The reference beats an exact date
+            '2025-01-14,-1200.00,,Electricity',  # Two days from the expense, inside the window
+        ])
+        self.assertEqual(self.matches(statement), {2: ('TXN-REF', 'REFERENCE'), 3: ('TXN-BILL', 'AMOUNT_DATE')})
+
+    def test_amount_just_outside_the_window_is_not_matched(self):
+        self.add_transaction('TXN-1', 'INCOME', '300.00', date(2025, 1, 10))
+        statement = self.reconcile(['2025-01-14,300.00,,Late deposit'], date_window=3)
+        self.assertEqual(self.matches(statement), {2: (None, '')})
+        statement = self.reconcile(['2025-01-13,300.00,,Deposit'], date_window=3)
+        self.assertEqual(self.matches(statement), {2: ('TXN-1', 'AMOUNT_DATE')})
+
+    def test_a_transaction_is_matched_by_one_line_only(self):
+        self.add_transaction('TXN-1', 'INCOME', '750.00', date(2025, 1, 5))
+        statement = self.reconcile(['2025-01-05,750.00,,Deposit', '2025-01-06,750.00,,Deposit again'])
+        self.assertEqual(self.matches(statement), {2: ('TXN-1', 'AMOUNT_DATE'), 3: (None, '')})
+
+    def test_unmatched_items_are_kept_on_both_sides(self):
+        self.add_transaction('TXN-MATCHED', 'INCOME', '100.00', date(2025, 1, 3))
+        self.add_transaction('TXN-MISSING', 'EXPENSE', '40.00', date(2025, 1, 20))
+        statement = self.reconcile(['2025-01-03,100.00,,Deposit', '2025-01-25,-999.00,,Bank charge'])
+        self.assertEqual((statement.total_lines, statement.matched_lines, statement.unmatched_lines,
+                          statement.unmatched_transactions), (2, 1, 1, 1))
+        self.assertEqual(list(statement.lines.filter(matched_transaction__isnull=True)
+                              .values_list('amount', flat=True)), [Decimal('-999.00')])
+        self.assertEqual([txn.transaction_id for txn in unmatched_transactions_for(statement)], ['TXN-MISSING'])
+
+    def test_malformed_statements_raise_a_format_error(self):
+        with self.assertRaisesMessage(StatementFormatError, 'date column'):
+            reconcile_statement(self.account, io.StringIO('when,what\n2025-01-01,5\n'),
+                                period_start=date(2025, 1, 1), period_end=date(2025, 1, 31))
+        with self.assertRaisesMessage(StatementFormatError, 'Unrecognised amount'):
+            self.reconcile(['2025-01-01,five taka,,Deposit'])
+        self.assertFalse(StatementImport.objects.exists())
 
-# Create your tests here.
+    def test_upload_rejects_a_negative_window_and_a_reversed_period(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        url = reverse('financial:statement_import_create')
+        data = {'account': self.account.pk, 'period_start': '2025-01-01', 'period_end': '2025-01-31',
+                'source': 'BANK'}
+        for overrides in [{'date_window': '-1'}, {'period_end': '2024-12-31'}, {'date_window': 'soon'}]:
+            upload = SimpleUploadedFile('statement.csv', b'date,amount\n2025-01-02,10.00\n')
+            response = self.client.post(url, {**data, **overrides, 'statement_file': upload})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(list(response.context['messages'])), 1)
+        self.assertFalse(StatementImport.objects.exists())
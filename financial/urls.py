@@ -21,7 +21,15 @@ urlpatterns = [
     path('expenses/', views.expense_list, name='expense_list'),
     path('expenses/create/', views.expense_create, name='expense_create'),
     
+    # Bulk Import
+    path('import/', views.bulk_import_records, name='bulk_import'),
+    
     # Budget
     path('budget/', views.budget_list, name='budget_list'),
     path('budget/create/', views.budget_create, name='budget_create'),
+    
+    # Statement Reconciliation
+    path('reconciliation/', views.statement_import_list, name='statement_import_list'),
+    path('reconciliation/import/', views.statement_import_create, name='statement_import_create'),
+    path('reconciliation/<int:pk>/', views.statement_import_detail, name='statement_import_detail'),
 ]
\ No newline at end of file
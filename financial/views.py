@@ -4,7 +4,10 @@ from django.contrib import messages
 from django.db.models import Sum, Q, Count
 from django.utils import timezone
 from datetime import datetime, timedelta
-from .models import Account, Transaction, Budget, Expense
+from .models import Account, Transaction, Budget, Expense, StatementImport, allocate_ids
+from .importers import bulk_import, read_rows, detect_format, ImportValidationError
+from .reconciliation import reconcile_statement, unmatched_transactions_for, StatementFormatError
+from hospital_management.streaming import stream_page
 
 @login_required
 def financial_dashboard(request):
@@ -154,21 +157,23 @@ def transaction_list(request):
     total_transactions = transactions.count()
     
     context = {
-        'transactions': transactions,
         'monthly_income': monthly_income,
         'monthly_expense': monthly_expense,
         'net_income': net_income,
         'total_transactions': total_transactions,
     }
     
-    return render(request, 'financial/transaction_list.html', context)
+    return stream_page(request, 'financial/transaction_list.html', context, transactions,
+                       'financial/_transaction_rows.html')
 
 @login_required
 def transaction_create(request):
     """Create new transaction"""
     if request.method == 'POST':
         # Get form data
-        transaction_id = request.POST.get('transaction_id') or f"TXN{timezone.now().strftime('%Y%m%d%H%M%S')}"
+        transaction_id = request.POST.get('transaction_id', '').strip()
+        if transaction_id in ('', 'TXN'):
+            transaction_id = allocate_ids('TXN')[0]
         account_id = request.POST.get('account')
         transaction_type = request.POST.get('transaction_type')
         category = request.POST.get('category')
@@ -244,7 +249,9 @@ def expense_create(request):
     """Create new expense"""
     if request.method == 'POST':
         # Get form data
-        expense_id = request.POST.get('expense_id') or f"EXP{timezone.now().strftime('%Y%m%d%H%M%S')}"
+        expense_id = request.POST.get('expense_id', '').strip()
+        if expense_id in ('', 'EXP-'):
+            expense_id = allocate_ids('EXP')[0]
         category = request.POST.get('category')
         amount = request.POST.get('amount')
         paid_to = request.POST.get('paid_to')
@@ -270,6 +277,36 @@ def expense_create(request):
     
     return render(request, 'financial/expense_form.html')
 
+@login_required
+def bulk_import_records(request):
+    """Bulk import transactions or expenses from a CSV/JSONL file"""
+    context = {'errors': []}
+    
+    if request.method == 'POST':
+        kind = request.POST.get('kind')
+        upload = request.FILES.get('import_file')
+        
+        if kind not in ('transactions', 'expenses') or not upload:
+            messages.error(request, 'Please choose what to import and select a file!')
+            return render(request, 'financial/bulk_import_form.html', context)
+        
+        try:
+            created, deltas = bulk_import(kind, read_rows(upload, detect_format(upload.name)))
+        except ImportValidationError as e:
+            messages.error(request, f'{e}. Nothing was imported.')
+            context['errors'] = e.errors
+            return render(request, 'financial/bulk_import_form.html', context)
+        except (ValueError, UnicodeDecodeError) as e:
+            messages.error(request, f'Could not read file: {str(e)}')
+            return render(request, 'financial/bulk_import_form.html', context)
+        
+        messages.success(request, f'Imported {created} {kind} successfully!')
+        if kind == 'transactions':
+            return redirect('financial:transaction_list')
+        return redirect('financial:expense_list')
+    
+    return render(request, 'financial/bulk_import_form.html', context)
+
 @login_required
 def budget_list(request):
     """List all budgets with real data"""
@@ -310,4 +347,84 @@ def budget_create(request):
         messages.success(request, 'Budget created successfully!')
         return redirect('financial:budget_list')
     
-    return render(request, 'financial/budget_form.html')
\ No newline at end of file
+    return render(request, 'financial/budget_form.html')
+
+@login_required
+def statement_import_list(request):
+    """List previous statement imports"""
+    imports = StatementImport.objects.select_related('account')
+    return render(request, 'financial/statement_import_list.html', {'imports': imports})
+
+@login_required
+def statement_import_create(request):
+    """Upload a bank/bKash/Nagad statement and reconcile it"""
+    accounts = Account.objects.filter(status='ACTIVE')
+    context = {
+        'accounts': accounts,
+        'source_choices': StatementImport.SOURCE_CHOICES,
+    }
+    
+    if request.method == 'POST':
+        statement_file = request.FILES.get('statement_file')
+        account_id = request.POST.get('account')
+        period_start = request.POST.get('period_start')
+        period_end = request.POST.get('period_end')
+        source = request.POST.get('source', 'BANK')
+        
+        if not all([statement_file, account_id, period_start, period_end]):
+            messages.error(request, 'Account, statement period and statement file are required!')
+            return render(request, 'financial/statement_import_form.html', context)
+        
+        account = get_object_or_404(Account, pk=account_id)
+        try:
+            date_window = int(request.POST.get('date_window') or 3)
+            period_start = datetime.strptime(period_start, '%Y-%m-%d').date()
+            period_end = datetime.strptime(period_end, '%Y-%m-%d').date()
+        except ValueError:
+            messages.error(request, 'Enter valid statement dates and a whole number of days for the date window!')
+            return render(request, 'financial/statement_import_form.html', context)
+        if date_window < 0:
+            messages.error(request, 'The date window cannot be negative!')
+            return render(request, 'financial/statement_import_form.html', context)
+        if period_end < period_start:
+            messages.error(request, 'The statement period cannot end before it starts!')
+            return render(request, 'financial/statement_import_form.html', context)
+        
+        try:
+            statement = reconcile_statement(
+                account,
+                statement_file,
+                period_start=period_start,
+                period_end=period_end,
+                source=source,
+                date_window=date_window,
+                file_name=statement_file.name,
+                imported_by=request.user.get_full_name() or request.user.username,
+            )
+        except (StatementFormatError, ValueError) as e:
+            messages.error(request, f'Could not read statement: {str(e)}')
+            return render(request, 'financial/statement_import_form.html', context)
+        
+        messages.success(
+            request,
+            f'Statement reconciled: {statement.matched_lines} of {statement.total_lines} lines matched.'
+        )
+        return redirect('financial:statement_import_detail', pk=statement.pk)
+    
+    return render(request, 'financial/statement_import_form.html', context)
+
+@login_required
+def statement_import_detail(request, pk):
+    """Reconciliation result with unmatched items on both sides"""
+    statement = get_object_or_404(StatementImport.objects.select_related('account'), pk=pk)
+    
+    unmatched_lines = statement.lines.filter(matched_transaction__isnull=True)
+    unmatched_transactions = unmatched_transactions_for(statement).order_by('date')
+    
+    context = {
+        'statement': statement,
+        'unmatched_lines': unmatched_lines[:200],
+        'unmatched_transactions': unmatched_transactions[:200],
+    }
+    
+    return render(request, 'financial/statement_import_detail.html', context)
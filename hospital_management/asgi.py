@@ -3,6 +3,22 @@ ASGI config for hospital_management project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The dashboard and reports home are async views that load their widgets
+concurrently (see hospital_management/widgets.py). Serve the project with an
+ASGI server so they run on the server's event loop instead of one per
+request, for example with uvicorn workers under gunicorn:
+
+    pip install uvicorn gunicorn
+    gunicorn hospital_management.asgi:application -k uvicorn.workers.UvicornWorker -w 4
+
+or ``uvicorn hospital_management.asgi:application --workers 4``. Static
+files are not served by the ASGI application; put them behind the web
+server or run ``collectstatic`` into a directory it serves. Under WSGI the
+async views still work, each request running its own event loop.
+
+WIDGET_WORKERS sets how many widget loaders run at once per process; every
+worker thread holds a database connection of its own.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -0,0 +1,40 @@
+# hospital_management/detail.py
+"""
+Relation graphs for detail pages.
+
+Each detail view declares, next to the view, the relations its template
+walks (``patient.user``, ``doctor.user``, ``items`` ...) as a DetailGraph.
+The graph loads the object with those relations joined or prefetched, so
+rendering the page runs a fixed number of queries however the template
+traverses them. Graphs are registered by view name, which lets the tests in
+each app assert the query count of every detail page (see
+hospital_management.testing).
+"""
+from django.shortcuts import get_object_or_404
+
+detail_graphs = {}
+
+
+class DetailGraph:
+    """The select_related/prefetch_related graph one detail view needs."""
+
+    def __init__(self, name, model, select_related=(), prefetch_related=()):
+        self.name = name
+        self.model = model
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        detail_graphs[name] = self
+
+    def __repr__(self):
+        return f'<DetailGraph {self.name}: {self.model.__name__}>'
+
+    def queryset(self):
+        queryset = self.model._default_manager.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def get_or_404(self, **lookup):
+        return get_object_or_404(self.queryset(), **lookup)
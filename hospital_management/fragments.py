@@ -0,0 +1,103 @@
+# hospital_management/fragments.py
+"""
+Template fragment caching keyed by data versions.
+
+Every model in FRAGMENT_CACHE_MODELS has a version counter in the cache,
+bumped after each committed save or delete of one of its rows. Only those
+models get the receivers: a post_delete receiver on a model stops Django
+from deleting its querysets without loading the rows first.
+``{% versioned_cache %}`` (in the fragment_cache tag library) names the
+models a fragment shows, all of which must be listed; its cache
+key holds their current versions, so any write to them makes the next page
+view render the fragment again and no explicit invalidation is needed::
+
+    {% load fragment_cache %}
+    {% versioned_cache 'dashboard-alerts' 'pharmacy.Medicine' %}
+        ... {{ low_stock_count }} ...
+    {% endversioned_cache %}
+
+Anything after ``vary`` is added to the key as well, e.g. ``vary today``
+for widgets that depend on the date. A hit skips rendering, and it skips
+the queries too when the view passes querysets and callables rather than
+evaluated values.
+
+Bulk updates and bulk_create send no signals, so code that changes tracked
+data that way calls ``bump()`` itself (see pharmacy.stock).
+FRAGMENT_CACHE_TIMEOUT bounds how long a missed bump can go unnoticed, and
+how stale relative times such as "created 5 minutes ago" can get.
+
+The counters live in the default cache, which every worker process must
+share (see cache_config in hospital_management.database); with a
+per-process cache, a bump would only reach the process that made it.
+"""
+import hashlib
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .routers import reading_from_replica
+
+DEFAULT_TIMEOUT = 60 * 5
+
+
+def _version_key(label):
+    return f'data-version:{label.lower()}'
+
+
+def data_versions(labels):
+    """{label: version} for model labels such as 'patients.Patient', in one cache round trip."""
+    keys = {label: _version_key(label) for label in labels}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for label, key in keys.items():
+        if key not in found:
+            # Start from the clock so a counter lost to eviction never restarts at a value already used
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions[label] = found[key]
+    return versions
+
+
+def bump(*labels):
+    """Invalidate every fragment showing these models."""
+    for label in labels:
+        try:
+            cache.incr(_version_key(label))
+        except ValueError:
+            cache.set(_version_key(label), time.time_ns(), timeout=None)
+
+
+def bump_on_commit(sender, **kwargs):
+    """post_save/post_delete receiver; waits for the commit so no request re-caches the old data."""
+    label = sender._meta.label
+    transaction.on_commit(lambda: bump(label))
+
+
+def versioned_labels():
+    """The canonical labels of FRAGMENT_CACHE_MODELS."""
+    return {apps.get_model(label)._meta.label for label in getattr(settings, 'FRAGMENT_CACHE_MODELS', ())}
+
+
+def connect_signals():
+    """Connect bump_on_commit to the saves and deletes of FRAGMENT_CACHE_MODELS (from AppConfig.ready)."""
+    for label in versioned_labels():
+        model = apps.get_model(label)
+        post_save.connect(bump_on_commit, sender=model, dispatch_uid=f'fragment-versions-save:{label}')
+        post_delete.connect(bump_on_commit, sender=model, dispatch_uid=f'fragment-versions-delete:{label}')
+
+
+def fragment_key(name, labels, vary_on=()):
+    versions = data_versions(labels)
+    # Pages rendered from a lagging replica must not be served to users pinned to the primary
+    parts = [*(f'{label}={versions[label]}' for label in labels), *map(str, vary_on),
+             'replica' if reading_from_replica() else 'primary']
+    digest = hashlib.md5(':'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'fragment:{name}:{digest}'
+
+
+def fragment_timeout():
+    return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
@@ -0,0 +1,308 @@
+# hospital_management/profiling.py
+"""
+Per-view query and latency profiling.
+
+``profile()`` is a context manager that counts the queries run inside it
+(on every database connection), their total time, the wall time of the
+block, the time spent outside the database (view code and template
+rendering) and, when memory tracing is on, the peak traced memory. It works
+on its own in tests::
+
+    with profile('reports:attendance_report', query_budget=50) as stats:
+        client.get(url)
+    assert stats.query_count <= 50
+
+ProfilingMiddleware wraps every request in ``profile()``, keyed by the
+resolved view name, and adds the figures to in-process totals that
+``metrics`` serves in the Prometheus text format. A view that runs more
+queries than its budget in PROFILING_QUERY_BUDGETS (or
+PROFILING_DEFAULT_QUERY_BUDGET) logs a warning listing its most repeated
+SQL, which is usually the N+1.
+
+Queries a profiled block hands to other threads are counted too: code run
+in a copy of its context (widget loaders, the rows of a streamed response)
+records through ``record_queries()``. A streamed response is added to the
+totals once its body has been read, so its rows and their rendering count
+towards the request.
+
+Totals are per process; with several workers each one reports its own.
+Peak memory comes from tracemalloc, which traces the whole process, so
+concurrent requests in a threaded server inflate each other's peak; it
+stops at the end of the view, before a streamed body is read.
+
+``metrics`` is open to staff users and to scrapers sending
+``Authorization: Bearer <PROFILING_METRICS_TOKEN>``.
+"""
+import logging
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+REPEATED_QUERIES_SHOWN = 5
+
+_active_profiles = ContextVar('active_profiles', default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by a strict profile() block that ran more queries than its budget."""
+
+
+class ViewProfile:
+    """Figures for one profiled block."""
+
+    def __init__(self, name=None, query_budget=None, trace_memory=False):
+        self.name = name
+        self.query_budget = query_budget
+        self.trace_memory = trace_memory
+        self.queries = []  # (sql, seconds)
+        self.duration = 0.0
+        self.peak_memory = None
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    @property
+    def db_time(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    @property
+    def render_time(self):
+        """Time spent outside the database: view code and template rendering."""
+        return max(self.duration - self.db_time, 0.0)
+
+    @property
+    def over_budget(self):
+        return self.query_budget is not None and self.query_count > self.query_budget
+
+    def repeated_queries(self, limit=REPEATED_QUERIES_SHOWN):
+        """The statements run more than once, most repeated first, as (sql, count)."""
+        counts = Counter(sql for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common(limit) if count > 1]
+
+    def _record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+
+class profile:
+    """
+    Profile the queries, time and memory of a block. ``strict`` raises
+    QueryBudgetExceeded instead of logging when the budget is exceeded.
+    """
+
+    def __init__(self, name=None, query_budget=None, trace_memory=False, strict=False):
+        self.stats = ViewProfile(name, query_budget, trace_memory)
+        self.strict = strict
+        self.check_on_exit = True
+        self._stack = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self.stats._record_query))
+        self._token = _active_profiles.set((*_active_profiles.get(), self.stats))
+        if self.stats.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self.stats
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.duration = time.perf_counter() - self._start
+        self._stack.close()
+        _active_profiles.reset(self._token)
+        if self.stats.trace_memory:
+            self.stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+        if exc_type is None and self.check_on_exit:
+            self.check_budget()
+        return False
+
+    def check_budget(self):
+        """Log, or raise when strict, if the block ran more queries than its budget."""
+        if self.stats.over_budget:
+            self._report_budget()
+
+    def _report_budget(self):
+        stats = self.stats
+        repeated = '\n'.join(f'  {count}x {sql}' for sql, count in stats.repeated_queries())
+        message = (f'{stats.name or "Profiled block"} ran {stats.query_count} queries '
+                   f'(budget {stats.query_budget})')
+        if repeated:
+            message += f'; repeated statements:\n{repeated}'
+        if self.strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+@contextmanager
+def record_queries():
+    """Count this thread's queries towards the profile() blocks of the current context."""
+    with ExitStack() as stack:
+        for stats in _active_profiles.get():
+            for connection in connections.all():
+                if stats._record_query not in connection.execute_wrappers:
+                    stack.enter_context(connection.execute_wrapper(stats._record_query))
+        yield
+
+
+class _Metrics:
+    """Running totals per view name, shared by the threads of one process."""
+
+    FIELDS = ('requests', 'queries', 'db_seconds', 'render_seconds', 'duration_seconds')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+            self._peak_memory = {}
+            self._over_budget = Counter()
+
+    def add(self, stats):
+        with self._lock:
+            totals = self._totals[stats.name]
+            totals['requests'] += 1
+            totals['queries'] += stats.query_count
+            totals['db_seconds'] += stats.db_time
+            totals['render_seconds'] += stats.render_time
+            totals['duration_seconds'] += stats.duration
+            if stats.peak_memory is not None:
+                self._peak_memory[stats.name] = max(self._peak_memory.get(stats.name, 0), stats.peak_memory)
+            if stats.over_budget:
+                self._over_budget[stats.name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return (
+                {name: dict(totals) for name, totals in self._totals.items()},
+                dict(self._peak_memory),
+                dict(self._over_budget),
+            )
+
+
+view_metrics = _Metrics()
+
+_METRICS = [
+    ('requests', 'hms_view_requests_total', 'counter', 'Requests handled per view'),
+    ('queries', 'hms_view_queries_total', 'counter', 'Database queries run per view'),
+    ('db_seconds', 'hms_view_db_seconds_total', 'counter', 'Time spent in database queries per view'),
+    ('render_seconds', 'hms_view_render_seconds_total', 'counter',
+     'Time spent outside the database (view code and templates) per view'),
+    ('duration_seconds', 'hms_view_duration_seconds_total', 'counter', 'Total request time per view'),
+]
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_metrics():
+    """All per-view totals in the Prometheus text exposition format."""
+    totals, peak_memory, over_budget = view_metrics.snapshot()
+    lines = []
+    for field, metric, kind, help_text in _METRICS:
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        lines += [f'{metric}{{view="{_label(name)}"}} {values[field]:g}' for name, values in sorted(totals.items())]
+    lines += ['# HELP hms_view_peak_memory_bytes Highest traced memory seen during one request per view',
+              '# TYPE hms_view_peak_memory_bytes gauge']
+    lines += [f'hms_view_peak_memory_bytes{{view="{_label(name)}"}} {value}' for name, value in sorted(peak_memory.items())]
+    lines += ['# HELP hms_view_over_budget_total Requests that ran more queries than the view budget',
+              '# TYPE hms_view_over_budget_total counter']
+    lines += [f'hms_view_over_budget_total{{view="{_label(name)}"}} {value}' for name, value in sorted(over_budget.items())]
+    return '\n'.join(lines) + '\n'
+
+
+def query_budget(view_name):
+    return getattr(settings, 'PROFILING_QUERY_BUDGETS', {}).get(
+        view_name, getattr(settings, 'PROFILING_DEFAULT_QUERY_BUDGET', None)
+    )
+
+
+def _has_metrics_token(request):
+    token = getattr(settings, 'PROFILING_METRICS_TOKEN', '')
+    scheme, _, value = request.headers.get('Authorization', '').partition(' ')
+    return bool(token) and scheme.lower() == 'bearer' and constant_time_compare(value, token)
+
+
+def metrics(request):
+    """Prometheus scrape endpoint; open to staff users and PROFILING_METRICS_TOKEN bearers."""
+    if not (request.user.is_staff or _has_metrics_token(request)):
+        raise PermissionDenied
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class ProfilingMiddleware:
+    """Profile every request by resolved view name (enabled by PROFILING_ENABLED)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.trace_memory = getattr(settings, 'PROFILING_TRACE_MEMORY', False)
+
+    def __call__(self, request):
+        scope = profile(trace_memory=self.trace_memory)
+        with scope as stats:
+            response = self.get_response(request)
+            # The view is resolved inside the call; name and budget are settled before the budget check on exit
+            match = getattr(request, 'resolver_match', None)
+            stats.name = match.view_name if match else 'unresolved'
+            stats.query_budget = query_budget(stats.name)
+            scope.check_on_exit = not response.streaming
+        if stats.name == 'metrics':
+            return response
+        if response.streaming:
+            # The rows are read after this returns; the request is done when its body has been sent
+            finish = self._finisher(scope)
+            if response.is_async:
+                response.streaming_content = self._afinish_after(response.streaming_content, finish)
+            else:
+                response.streaming_content = self._finish_after(response.streaming_content, finish)
+        else:
+            view_metrics.add(stats)
+        return response
+
+    @staticmethod
+    def _finisher(scope):
+        def finish():
+            scope.stats.duration = time.perf_counter() - scope._start
+            scope.check_budget()
+            view_metrics.add(scope.stats)
+        return finish
+
+    @staticmethod
+    def _finish_after(content, finish):
+        try:
+            yield from content
+        finally:
+            finish()
+
+    @staticmethod
+    async def _afinish_after(content, finish):
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            finish()
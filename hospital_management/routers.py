@@ -0,0 +1,106 @@
+# hospital_management/routers.py
+"""
+Read-replica routing for read-heavy pages.
+
+When DATABASES has a REPLICA_DATABASE alias (``replica`` by default, set
+from DATABASE_REPLICA_URL), ReplicaRoutingMiddleware marks GET and HEAD
+requests to the views matching REPLICA_VIEWS (reports, exports, dashboards,
+lists) and ReplicaRouter sends their reads to the replica. Everything else
+reads from ``default``, and every write goes to ``default``.
+
+A replica lags behind, so a user who just wrote something would not see it
+on the next list page. After a request that writes (any POST, or a GET that
+saved a row) the user's session is pinned to ``default`` for
+REPLICA_STICKY_SECONDS. Sessions, users and content types are always read
+from ``default``, since they decide who the user is and whether they are
+pinned, and so is the database cache, whose version counters must be
+current. Reads inside a transaction stay on ``default`` as well.
+
+Locally a second SQLite file can stand in for the replica;
+``manage.py sync_replica`` copies the default database into it.
+"""
+import time
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY_ONLY_APPS = {'auth', 'contenttypes', 'sessions', 'django_cache'}
+STICKY_SESSION_KEY = '_db_primary_until'
+
+_routing = ContextVar('replica_routing', default=None)
+
+
+class _RequestRouting:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+def replica_alias():
+    """The configured replica alias, or None when there is no replica."""
+    alias = getattr(settings, 'REPLICA_DATABASE', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def is_replica_view(view_name):
+    return any(fnmatchcase(view_name, pattern) for pattern in getattr(settings, 'REPLICA_VIEWS', ()))
+
+
+def reading_from_replica():
+    """True while the current request sends its reads to the replica."""
+    state = _routing.get()
+    return state is not None and state.use_replica and not state.wrote
+
+
+class ReplicaRouter:
+    """Reads of a replica-marked request go to the replica; writes always go to default."""
+
+    def db_for_read(self, model, **hints):
+        if (reading_from_replica() and model._meta.app_label not in PRIMARY_ONLY_APPS
+                and not connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return replica_alias() or DEFAULT_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True  # Later reads in this request must see the write
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Same data on both aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS  # The replica gets its schema through replication
+
+
+class ReplicaRoutingMiddleware:
+    """Mark read-only requests to REPLICA_VIEWS for the replica and pin writers' sessions to default."""
+
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+
+    def __call__(self, request):
+        state = _RequestRouting()
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        # After the view, so a login or logout pins the session the user ends up with
+        if (state.wrote or request.method not in ('GET', 'HEAD', 'OPTIONS')) and request.user.is_authenticated:
+            request.session[STICKY_SESSION_KEY] = time.time() + self.sticky_seconds
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _routing.get()
+        if (state is not None and request.method in ('GET', 'HEAD')
+                and is_replica_view(request.resolver_match.view_name)
+                and request.session.get(STICKY_SESSION_KEY, 0) < time.time()):
+            state.use_replica = True
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 
+from .database import cache_config, database_config, replica_config, sqlite_pragmas
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,14 +56,18 @@ INSTALLED_APPS = [
     'suppliers',      
     'attendance',    
     'financial',      
+    'search',
 ]
 
 MIDDLEWARE = [
+    'hospital_management.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'hospital_management.streaming.StreamingGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'hospital_management.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -72,8 +78,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept in memory; in DEBUG the autoreloader clears them on change
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -86,14 +98,42 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'hospital_management.wsgi.application'
 
-# Database
+# Database, configured from DATABASE_URL and HMS_DB_* (see hospital_management/database.py)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR),
+}
+SQLITE_PRAGMAS = sqlite_pragmas()
+
+# Cache shared by every worker process, configured from HMS_CACHE_URL (see hospital_management/database.py)
+CACHES = {
+    'default': cache_config(),
 }
 
+# Template fragments cached by data version, see hospital_management/fragments.py
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('HMS_FRAGMENT_CACHE_TIMEOUT', 300))
+FRAGMENT_CACHE_MODELS = [
+    'appointments.Appointment',
+    'billing.Bill',
+    'doctors.Doctor',
+    'patients.Patient',
+    'pharmacy.Medicine',
+]
+
+# Browser cache lifetime of reports for past dates, see reports/conditional.py
+REPORT_HISTORY_MAX_AGE = 60 * 60 * 24
+
+# Threads per process loading dashboard widgets concurrently, see hospital_management/widgets.py
+WIDGET_WORKERS = int(os.environ.get('HMS_WIDGET_WORKERS', 4))
+
+# Read replica for read-heavy pages, see hospital_management/routers.py
+REPLICA_DATABASE = 'replica'
+_replica = replica_config(BASE_DIR)
+if _replica:
+    DATABASES[REPLICA_DATABASE] = _replica
+DATABASE_ROUTERS = ['hospital_management.routers.ReplicaRouter']
+REPLICA_VIEWS = ['reports:*', '*:export_*', '*dashboard', '*_list']
+REPLICA_STICKY_SECONDS = int(os.environ.get('HMS_DB_REPLICA_STICKY_SECONDS', 15))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -116,10 +156,27 @@ TIME_ZONE = 'Asia/Dhaka'
 USE_I18N = True
 USE_TZ = True
 
-# Static files (CSS, JavaScript, Images)
+# Static files (CSS, JavaScript, Images), see hospital_management/staticfiles.py.
+# Hashed, minified and pre-compressed by collectstatic outside DEBUG, or with HMS_STATIC_MANIFEST=1
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_MANIFEST = os.environ.get('HMS_STATIC_MANIFEST', '0' if DEBUG else '1') == '1'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': ('hospital_management.staticfiles.CompressedManifestStorage' if STATIC_MANIFEST
+                    else 'django.contrib.staticfiles.storage.StaticFilesStorage'),
+    },
+}
+# WhiteNoise (requirements.txt) serves STATIC_ROOT with far-future headers for hashed files
+try:
+    import whitenoise  # noqa: F401
+except ImportError:
+    pass
+else:
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                      'whitenoise.middleware.WhiteNoiseMiddleware')
 
 # Media files
 MEDIA_URL = 'media/'
@@ -128,6 +185,20 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Request profiling
+# See hospital_management/profiling.py. Totals are served at /metrics to staff users and to
+# scrapers sending "Authorization: Bearer $HMS_METRICS_TOKEN"
+PROFILING_ENABLED = os.environ.get('HMS_PROFILING', '1' if DEBUG else '0') == '1'
+PROFILING_TRACE_MEMORY = os.environ.get('HMS_PROFILING_MEMORY', '0') == '1'
+PROFILING_DEFAULT_QUERY_BUDGET = 50
+PROFILING_QUERY_BUDGETS = {
+    'dashboard': 30,
+    'attendance:attendance_report': 30,
+    'reports:daily_billing_report': 20,
+    'reports:medicine_stock_report': 20,
+}
+PROFILING_METRICS_TOKEN = os.environ.get('HMS_METRICS_TOKEN', '')
+
 # Login settings
 LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'dashboard'
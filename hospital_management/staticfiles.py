@@ -0,0 +1,87 @@
+# hospital_management/staticfiles.py
+"""
+Static file pipeline.
+
+CompressedManifestStorage is ManifestStaticFilesStorage (content-hashed
+names such as ``css/base.3f1c2a9e.css``, resolved by ``{% static %}``)
+with two extra collectstatic steps for the hashed files: CSS is minified,
+and text files get ``.gz`` and, when the optional ``brotli`` package is
+installed, ``.br`` variants written next to them, compressed once at
+maximum level.
+
+WhiteNoise (in requirements.txt) serves STATIC_ROOT from the application:
+it sends a pre-compressed variant to browsers that accept it and marks
+hashed files immutable with a far-future Cache-Control. Where it is not
+installed, let the web server serve STATIC_ROOT, e.g. nginx with ``gzip_static on``,
+``brotli_static on`` and ``expires max`` for STATIC_URL.
+"""
+import gzip
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml', '.html')
+MIN_COMPRESS_SIZE = 200  # Smaller responses fit in one packet either way
+MIN_SAVING = 0.05
+
+
+def minify_css(css):
+    """
+    Strip comments and whitespace that carry no meaning. Conservative: spaces
+    before ':' are kept (``a :hover`` is not ``a:hover``) and strings are not
+    special-cased, so it is meant for the project's own stylesheets.
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+class CompressedManifestStorage(ManifestStaticFilesStorage):
+    """Hashed file names, minified CSS and pre-compressed variants."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if isinstance(hashed_name, str):
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+
+        # Only the project's own stylesheets; third-party ones ship as their authors built them
+        own = {Path(directory).resolve() for directory in settings.STATICFILES_DIRS}
+        for name, hashed_name in sorted(hashed_names.items()):
+            source_storage = paths[name][0]
+            if hashed_name.endswith('.css') and Path(source_storage.location).resolve() in own:
+                self._replace(hashed_name, minify_css(self._read(hashed_name).decode()).encode())
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._write_compressed(hashed_name)
+
+    def _read(self, name):
+        with self.open(name) as handle:
+            return handle.read()
+
+    def _replace(self, name, content):
+        self.delete(name)
+        self._save(name, ContentFile(content))
+
+    def _write_compressed(self, name):
+        content = self._read(name)
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content, quality=11)))
+        for suffix, compressed in variants:
+            if len(compressed) < len(content) * (1 - MIN_SAVING):
+                self._replace(name + suffix, compressed)
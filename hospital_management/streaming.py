@@ -0,0 +1,169 @@
+# hospital_management/streaming.py
+"""
+Streamed, compressed responses for full-table pages and exports.
+
+``stream_page`` renders a list page's template once, with
+``{{ streamed_rows }}`` where the rows go, and streams its head, then the
+rows rendered ROW_CHUNK_SIZE at a time with ``row_template`` (which gets
+one chunk as ``rows``) from ``queryset.iterator()``, then its tail.
+A page that leaves ``{{ streamed_rows }}`` out, such as an empty-list
+branch, is sent without rows. ``stream_csv`` streams an export the same way. Neither the rows nor the
+page are held in memory, and the browser renders the top of the page
+while the rest is still being read.
+
+StreamingGZipMiddleware compresses streamed responses as one gzip stream,
+flushed after every chunk so each one goes out as soon as it is ready.
+Django's GZipMiddleware buffers a sync stream until zlib's window fills
+and, in 4.2, gzips each chunk of an async one as a separate member, which
+browsers do not all decode. Other responses get Django's behaviour,
+including its BREACH mitigation of a random-length gzip header.
+
+Rows are read after the middleware has returned, in a copy of the
+request's context, so replica routing still applies and ProfilingMiddleware
+counts their queries. Under ASGI they are read in the request's sync
+thread, one chunk at a time.
+"""
+import contextvars
+import csv
+import secrets
+from gzip import GzipFile
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.middleware.gzip import GZipMiddleware, re_accepts_gzip
+from django.template.loader import get_template, render_to_string
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import get_random_string
+from django.utils.safestring import mark_safe
+from django.utils.text import StreamingBuffer
+
+from .profiling import record_queries
+
+ROW_CHUNK_SIZE = 200
+ROWS_MARKER = '<!-- streamed rows -->'  # Autoescaping keeps row data from ever producing it
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+
+def _chunks(rows, size):
+    iterator = rows.iterator(chunk_size=size) if isinstance(rows, QuerySet) else iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _next_recorded(iterator):
+    with record_queries():
+        return next(iterator)
+
+
+def _in_context(iterator, context):
+    while True:
+        try:
+            yield context.run(_next_recorded, iterator)
+        except StopIteration:
+            return
+
+
+async def _in_sync_thread(iterator):
+    step = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    while (chunk := await step(iterator, done)) is not done:
+        yield chunk
+
+
+def _streaming_response(request, content, content_type):
+    # The middleware that set the request's context vars resets them before the content is read
+    content = _in_context(content, contextvars.copy_context())
+    if isinstance(request, ASGIRequest):
+        content = _in_sync_thread(content)
+    return StreamingHttpResponse(content, content_type=content_type)
+
+
+def stream_page(request, template_name, context, rows, row_template, chunk_size=ROW_CHUNK_SIZE):
+    """Like render(), with ``rows`` streamed through ``row_template`` in place of ``{{ streamed_rows }}``."""
+    page = render_to_string(template_name, {**context, 'streamed_rows': mark_safe(ROWS_MARKER)}, request)
+    head, marker, tail = page.partition(ROWS_MARKER)
+    row_template = get_template(row_template)
+
+    def content():
+        yield head
+        if marker:
+            for chunk in _chunks(rows, chunk_size):
+                yield row_template.render({'rows': chunk}, request)
+        yield tail
+    return _streaming_response(request, content(), 'text/html; charset=utf-8')
+
+
+class _Echo:
+    """File-like object whose write() returns the line, so csv.writer produces strings."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(request, filename, header, rows, row_values, chunk_size=ROW_CHUNK_SIZE):
+    """A CSV attachment of ``header`` and ``row_values(row)`` for each of ``rows``."""
+    writer = csv.writer(_Echo())
+
+    def content():
+        yield writer.writerow(header)
+        for chunk in _chunks(rows, chunk_size):
+            yield ''.join(writer.writerow(row_values(row)) for row in chunk)
+    response = _streaming_response(request, content(), 'text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _gzip_file(buffer, max_random_bytes):
+    filename = f'{get_random_string(secrets.randbelow(max_random_bytes))}.gz' if max_random_bytes else None
+    return GzipFile(filename=filename, mode='wb', compresslevel=6, fileobj=buffer, mtime=0)
+
+
+def compress_chunks(chunks, max_random_bytes=None):
+    """Gzip ``chunks`` as one stream, yielding the compressed bytes of each as soon as it is written."""
+    buffer = StreamingBuffer()
+    with _gzip_file(buffer, max_random_bytes) as gzip_file:
+        for chunk in chunks:
+            if chunk:
+                gzip_file.write(chunk)
+                gzip_file.flush()  # Sync flush: everything written so far can be decompressed
+                yield buffer.read()
+    yield buffer.read()
+
+
+async def acompress_chunks(chunks, max_random_bytes=None):
+    """compress_chunks for async iterators."""
+    buffer = StreamingBuffer()
+    with _gzip_file(buffer, max_random_bytes) as gzip_file:
+        async for chunk in chunks:
+            if chunk:
+                gzip_file.write(chunk)
+                gzip_file.flush()
+                yield buffer.read()
+    yield buffer.read()
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that compresses streamed responses chunk by chunk."""
+
+    def process_response(self, request, response):
+        if not response.streaming:
+            return super().process_response(request, response)
+        if (response.has_header('Content-Encoding')
+                or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return response
+
+        compress = acompress_chunks if response.is_async else compress_chunks
+        response.streaming_content = compress(response.streaming_content, max_random_bytes=self.max_random_bytes)
+        del response.headers['Content-Length']
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
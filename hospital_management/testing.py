@@ -0,0 +1,94 @@
+# hospital_management/testing.py
+"""
+Shared test helpers.
+
+SampleDataMixin logs the test client in as a superuser and makes the
+users, patients, doctors and employees most tests need.
+
+DetailQueryTestCase asserts that a detail page runs exactly the expected
+number of queries, before and after the object gains more related rows, so
+a relation missing from the view's DetailGraph shows up as a failing count.
+"""
+from datetime import date
+from itertools import count
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .detail import detail_graphs
+
+# Every logged-in page loads the session and the user first
+REQUEST_QUERIES = 2
+
+# For query-count tests: the default database cache would add its own queries
+LOCAL_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+_sequence = count(1)
+
+
+class SampleDataMixin:
+    """For TestCase: a logged-in superuser (``self.admin``) and factories for related rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+
+    def make_user(self, **kwargs):
+        number = next(_sequence)
+        return User.objects.create_user(
+            f'user{number}', first_name=kwargs.pop('first_name', 'First'),
+            last_name=kwargs.pop('last_name', f'Last{number}'), **kwargs,
+        )
+
+    def make_patient(self):
+        from patients.models import Patient
+        user = self.make_user()
+        return Patient.objects.create(
+            user=user, patient_id=f'PAT{user.pk:05d}', date_of_birth=date(1990, 1, 1), gender='M',
+            blood_group='A+', phone_number='01700000000', address='Dhaka', emergency_contact='01800000000',
+        )
+
+    def make_doctor(self):
+        from doctors.models import Doctor
+        return Doctor.objects.create(user=self.make_user(), specialization='Medicine', qualification='MBBS')
+
+    def make_employee(self):
+        from employees.models import Employee
+        user = self.make_user()
+        return Employee.objects.create(
+            user=user, employee_id=f'EMP{user.pk:05d}', date_of_birth=date(1990, 1, 1), gender='F',
+            phone='01700000000', emergency_contact='01800000000', address='Dhaka',
+            department='ADMIN', designation='STAFF', join_date=date(2020, 1, 1), salary=30000,
+        )
+
+
+class DetailQueryTestCase(SampleDataMixin, TestCase):
+
+    def assertDetailQueries(self, view_name, pk, expected):
+        """GET the detail page and assert it runs ``expected`` queries after the request's own."""
+        self.assertIn(view_name, detail_graphs)
+        with self.assertNumQueries(REQUEST_QUERIES + expected):
+            response = self.client.get(reverse(view_name, args=[pk]))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertGraphQueries(self, view_name, pk, paths, expected):
+        """
+        Load through the view's graph and walk dotted attribute ``paths``,
+        asserting ``expected`` queries in total. For pages without a template.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            obj = detail_graphs[view_name].get_or_404(pk=pk)
+            for path in paths:
+                value = obj
+                for attribute in path.split('.'):
+                    value = getattr(value, attribute)
+        self.assertEqual(len(queries), expected, [query['sql'] for query in queries.captured_queries])
@@ -3,10 +3,12 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from accounts.views import dashboard
+from .profiling import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', dashboard, name='dashboard'),
+    path('metrics', metrics, name='metrics'),
     
     # Existing apps
     path('accounts/', include('accounts.urls')),
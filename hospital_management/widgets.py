@@ -0,0 +1,108 @@
+# hospital_management/widgets.py
+"""
+Concurrent widget loading for async dashboard views.
+
+A page made of independent widgets declares each one as a Widget: the
+``{% versioned_cache %}`` fragment that renders it and the context values it
+needs, as zero-argument callables. ``load_widgets`` skips the widgets whose
+fragment is already cached, runs the loaders of the others at the same time
+and returns the template context, so the page takes as long as its slowest
+widget rather than the sum of all of them.
+
+Django 4.2's async ORM (``acount``, ``aaggregate``) hands every query to the
+single thread that owns the request's connection, so queries gathered with
+it still run one after another. Loaders therefore run in WIDGET_WORKERS
+pool threads, each with its own database connection, which is reused across
+requests like a request thread's (CONN_MAX_AGE) and copies the request's
+context, so replica routing still applies and ProfilingMiddleware counts
+their queries. Inside a transaction (tests,
+ATOMIC_REQUESTS) other connections cannot see its rows, and the loaders run
+in turn on the request's own connection instead.
+
+A loader whose fragment was cached is passed to the template uncalled; the
+template calls it only if the fragment expired in between.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+
+from .fragments import fragment_key
+from .profiling import record_queries
+
+_executor = None
+
+
+class Widget:
+    """One cached fragment of a page and the loaders of the context values it renders."""
+
+    def __init__(self, fragment, labels, loaders, vary_on=()):
+        self.fragment = fragment
+        self.labels = tuple(labels)
+        self.loaders = loaders
+        self.vary_on = tuple(vary_on)
+
+    def is_cached(self):
+        return cache.has_key(fragment_key(self.fragment, self.labels, self.vary_on))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(getattr(settings, 'WIDGET_WORKERS', 4), thread_name_prefix='widget')
+    return _executor
+
+
+def _run_loader(loader):
+    close_old_connections()  # Drop this worker's connection if it outlived CONN_MAX_AGE or broke
+    try:
+        with record_queries():
+            return loader()
+    finally:
+        close_old_connections()
+
+
+def _plan(widgets):
+    """The loaders of uncached widgets, and whether the request is inside a transaction."""
+    pending = {}
+    for widget in widgets:
+        if not widget.is_cached():
+            pending.update(widget.loaders)
+    return pending, any(connection.in_atomic_block for connection in connections.all())
+
+
+async def load_widgets(widgets):
+    """The template context for ``widgets``, loading the uncached ones concurrently."""
+    pending, in_transaction = await sync_to_async(_plan)(widgets)
+
+    if in_transaction:
+        values = await sync_to_async(lambda: {name: loader() for name, loader in pending.items()})()
+    else:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            # A context can only be entered by one thread at a time, so each loader gets a copy
+            loop.run_in_executor(_get_executor(), contextvars.copy_context().run, _run_loader, loader)
+            for loader in pending.values()
+        ))
+        values = dict(zip(pending, results))
+
+    context = {name: loader for widget in widgets for name, loader in widget.loaders.items()}
+    context.update(values)
+    return context
+
+
+def async_login_required(view):
+    """login_required for async views, which Django 4.2's decorator does not support."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
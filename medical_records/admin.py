@@ -1,3 +1,26 @@
 from django.contrib import admin
+from .models import RecordTerm, DiagnosisMonthly, PrescribedDrug, VitalReading
 
-# Register your models here.
+@admin.register(RecordTerm)
+class RecordTermAdmin(admin.ModelAdmin):
+    list_display = ['record', 'field', 'term']
+    list_filter = ['field']
+    search_fields = ['term']
+    raw_id_fields = ['record']
+
+@admin.register(DiagnosisMonthly)
+class DiagnosisMonthlyAdmin(admin.ModelAdmin):
+    list_display = ['month', 'term', 'record_count']
+    list_filter = ['month']
+    search_fields = ['term']
+
+@admin.register(PrescribedDrug)
+class PrescribedDrugAdmin(admin.ModelAdmin):
+    list_display = ['term', 'record_count', 'last_prescribed']
+    search_fields = ['term']
+
+@admin.register(VitalReading)
+class VitalReadingAdmin(admin.ModelAdmin):
+    list_display = ['patient', 'kind', 'value', 'taken_at', 'record']
+    list_filter = ['kind']
+    raw_id_fields = ['patient', 'record']
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from medical_records.vitals import backfill, CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the vitals time series from every medical record'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        written = backfill(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} vital reading(s)'))
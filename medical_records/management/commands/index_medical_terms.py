@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from medical_records.terms import index_records, materialize_term_counts, CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Index diagnosis/prescription/lab test terms of new or edited records and rebuild the trend tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Re-index every record, not just pending ones')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        indexed = index_records(full=options['full'], chunk_size=options['chunk_size'])
+        materialize_term_counts()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} record(s) and refreshed diagnosis/drug counts'))
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medical_records', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicalrecord',
+            name='terms_indexed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='PrescribedDrug',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100, unique=True)),
+                ('record_count', models.IntegerField()),
+                ('last_prescribed', models.DateField()),
+            ],
+            options={
+                'ordering': ['-record_count'],
+                'indexes': [models.Index(fields=['-record_count'], name='medical_rec_record__78c9b4_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DiagnosisMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('term', models.CharField(max_length=100)),
+                ('record_count', models.IntegerField()),
+            ],
+            options={
+                'ordering': ['-month', '-record_count'],
+                'unique_together': {('month', 'term')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RecordTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('DIAGNOSIS', 'Diagnosis'), ('PRESCRIPTION', 'Prescription'), ('LAB_TEST', 'Lab Test')], max_length=20)),
+                ('term', models.CharField(max_length=100)),
+                ('record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='medical_records.medicalrecord')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['field', 'term'], name='medical_rec_field_e1f413_idx')],
+                'unique_together': {('record', 'field', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0001_initial'),
+        ('medical_records', '0002_record_terms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VitalReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('TEMPERATURE', 'Temperature'), ('SYSTOLIC', 'Systolic BP'), ('DIASTOLIC', 'Diastolic BP'), ('HEART_RATE', 'Heart Rate'), ('WEIGHT', 'Weight')], max_length=20)),
+                ('taken_at', models.DateTimeField()),
+                ('value', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vital_readings', to='patients.patient')),
+                ('record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vital_readings', to='medical_records.medicalrecord')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['patient', 'kind', 'taken_at'], name='medical_rec_patient_5ab5c9_idx')],
+                'unique_together': {('record', 'kind')},
+            },
+        ),
+    ]
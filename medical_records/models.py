@@ -31,9 +31,90 @@ class MedicalRecord(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    terms_indexed_at = models.DateTimeField(null=True, blank=True, editable=False)  # Set by medical_records.terms
     
     def __str__(self):
         return f"{self.patient.get_full_name()} - {self.visit_date}"
     
     class Meta:
-        ordering = ['-visit_date']
\ No newline at end of file
+        ordering = ['-visit_date']
+        indexes = [
+            models.Index(fields=['patient', 'visit_date']),  # Patient history and timeline
+            models.Index(fields=['visit_date']),  # Default ordering
+        ]
+
+
+class RecordTerm(models.Model):
+    FIELD_CHOICES = [
+        ('DIAGNOSIS', 'Diagnosis'),
+        ('PRESCRIPTION', 'Prescription'),
+        ('LAB_TEST', 'Lab Test'),
+    ]
+    
+    # Normalized term extracted from a record's free text by medical_records.terms
+    record = models.ForeignKey(MedicalRecord, on_delete=models.CASCADE, related_name='terms')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    term = models.CharField(max_length=100)
+    
+    def __str__(self):
+        return f"{self.get_field_display()}: {self.term}"
+    
+    class Meta:
+        unique_together = ['record', 'field', 'term']
+        indexes = [
+            models.Index(fields=['field', 'term']),
+        ]
+
+
+class DiagnosisMonthly(models.Model):
+    month = models.DateField()  # First day of the month
+    term = models.CharField(max_length=100)
+    record_count = models.IntegerField()
+    
+    def __str__(self):
+        return f"{self.month:%b %Y} - {self.term} ({self.record_count})"
+    
+    class Meta:
+        ordering = ['-month', '-record_count']
+        unique_together = ['month', 'term']
+
+
+class PrescribedDrug(models.Model):
+    term = models.CharField(max_length=100, unique=True)
+    record_count = models.IntegerField()
+    last_prescribed = models.DateField()
+    
+    def __str__(self):
+        return f"{self.term} ({self.record_count})"
+    
+    class Meta:
+        ordering = ['-record_count']
+        indexes = [
+            models.Index(fields=['-record_count']),
+        ]
+
+
+class VitalReading(models.Model):
+    KIND_CHOICES = [
+        ('TEMPERATURE', 'Temperature'),
+        ('SYSTOLIC', 'Systolic BP'),
+        ('DIASTOLIC', 'Diastolic BP'),
+        ('HEART_RATE', 'Heart Rate'),
+        ('WEIGHT', 'Weight'),
+    ]
+    
+    # One vital sign from a record, kept narrow so trend charts never load record text
+    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='vital_readings')
+    record = models.ForeignKey(MedicalRecord, on_delete=models.CASCADE, related_name='vital_readings')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    taken_at = models.DateTimeField()
+    value = models.DecimalField(max_digits=6, decimal_places=2)
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.value} ({self.taken_at:%Y-%m-%d})"
+    
+    class Meta:
+        unique_together = ['record', 'kind']
+        indexes = [
+            models.Index(fields=['patient', 'kind', 'taken_at']),
+        ]
@@ -0,0 +1,14 @@
+# medical_records/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import MedicalRecord
+from .vitals import sync_record
+
+
+@receiver(post_save, sender=MedicalRecord)
+def sync_vitals(sender, instance, update_fields=None, **kwargs):
+    # Index-only updates (e.g. terms_indexed_at) cannot change vitals
+    if update_fields is not None and not set(update_fields) & {'visit_date', 'temperature', 'blood_pressure', 'heart_rate', 'weight', 'patient'}:
+        return
+    sync_record(instance.pk)
@@ -0,0 +1,126 @@
+# medical_records/terms.py
+"""
+Term index over the free text of medical records.
+
+``index_records`` splits diagnosis, prescription and lab test text into
+normalized terms and stores them in RecordTerm, in chunks. Only records that
+are new or changed since they were last indexed are processed unless a full
+rebuild is requested. ``materialize_term_counts`` then rebuilds the
+DiagnosisMonthly and PrescribedDrug summaries with one grouped query each, so
+trend pages read small tables instead of scanning record text.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, F
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MedicalRecord, RecordTerm, DiagnosisMonthly, PrescribedDrug
+
+CHUNK_SIZE = 2000
+MAX_TERM_LENGTH = 100
+
+_PHRASE_SPLIT = re.compile(r'[,;\n|]+')
+_LINE_SPLIT = re.compile(r'[;\n]+')
+_NUMBERING = re.compile(r'^\s*(?:\d+\s*[.)-]?|[-*•])\s*')
+_NON_WORD = re.compile(r'[^\w\s]+')
+_SPACES = re.compile(r'\s+')
+
+# Dosage forms written before a drug name, e.g. "Tab. Napa 500mg"
+DOSAGE_FORMS = {'tab', 'tabs', 'tablet', 'cap', 'caps', 'capsule', 'syp', 'syrup', 'inj', 'injection',
+                'susp', 'suspension', 'drop', 'drops', 'oint', 'ointment', 'cream', 'gel', 'sachet', 'inh'}
+MAX_DRUG_WORDS = 3
+
+
+def normalize(text):
+    """Lower-case, drop list numbering and punctuation, collapse spaces."""
+    text = _NUMBERING.sub('', text.lower())
+    text = _NON_WORD.sub(' ', text)
+    return _SPACES.sub(' ', text).strip()[:MAX_TERM_LENGTH]
+
+
+def phrase_terms(text):
+    """Terms for comma/semicolon/line separated text such as a diagnosis."""
+    terms = []
+    for phrase in _PHRASE_SPLIT.split(text or ''):
+        term = normalize(phrase)
+        if len(term) > 1 and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def drug_terms(text):
+    """Drug names from a prescription: the leading words of each line, before any dose."""
+    terms = []
+    for line in _LINE_SPLIT.split(text or ''):
+        words = normalize(line).split()
+        while words and words[0] in DOSAGE_FORMS:
+            words.pop(0)
+        name = []
+        for word in words:
+            if any(ch.isdigit() for ch in word) or len(name) == MAX_DRUG_WORDS:
+                break
+            name.append(word)
+        term = ' '.join(name)
+        if len(term) > 1 and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def record_terms(record_id, diagnosis, prescription, lab_tests):
+    for term in phrase_terms(diagnosis):
+        yield RecordTerm(record_id=record_id, field='DIAGNOSIS', term=term)
+    for term in drug_terms(prescription):
+        yield RecordTerm(record_id=record_id, field='PRESCRIPTION', term=term)
+    for term in phrase_terms(lab_tests):
+        yield RecordTerm(record_id=record_id, field='LAB_TEST', term=term)
+
+
+def pending_records():
+    """Records never indexed, or edited since they were."""
+    return MedicalRecord.objects.filter(
+        Q(terms_indexed_at__isnull=True) | Q(updated_at__gt=F('terms_indexed_at'))
+    )
+
+
+def index_records(full=False, chunk_size=CHUNK_SIZE):
+    """Extract terms for pending records (every record if ``full``). Returns the number indexed."""
+    records = MedicalRecord.objects.all() if full else pending_records()
+    pks = list(records.order_by('pk').values_list('pk', flat=True))
+
+    for start in range(0, len(pks), chunk_size):
+        chunk = pks[start:start + chunk_size]
+        rows = MedicalRecord.objects.filter(pk__in=chunk).values_list('pk', 'diagnosis', 'prescription', 'lab_tests')
+        terms = [term for row in rows for term in record_terms(*row)]
+
+        with transaction.atomic():
+            RecordTerm.objects.filter(record_id__in=chunk).delete()
+            RecordTerm.objects.bulk_create(terms, batch_size=1000)
+            MedicalRecord.objects.filter(pk__in=chunk).update(terms_indexed_at=timezone.now())
+
+    return len(pks)
+
+
+def materialize_term_counts():
+    """Rebuild the monthly diagnosis counts and the prescribed drug totals."""
+    monthly = RecordTerm.objects.filter(field='DIAGNOSIS').values(
+        'term', month=TruncMonth('record__visit_date'),
+    ).annotate(record_count=Count('record_id')).order_by()
+
+    drugs = RecordTerm.objects.filter(field='PRESCRIPTION').values('term').annotate(
+        record_count=Count('record_id'),
+        last_prescribed=Max('record__visit_date'),
+    ).order_by()
+
+    with transaction.atomic():
+        DiagnosisMonthly.objects.all().delete()
+        DiagnosisMonthly.objects.bulk_create(
+            (DiagnosisMonthly(month=row['month'], term=row['term'], record_count=row['record_count']) for row in monthly),
+            batch_size=1000,
+        )
+        PrescribedDrug.objects.all().delete()
+        PrescribedDrug.objects.bulk_create(
+            (PrescribedDrug(**row) for row in drugs),
+            batch_size=1000,
+        )
@@ -1,3 +1,242 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from hospital_management.testing import DetailQueryTestCase, SampleDataMixin
+
+from .models import MedicalRecord, RecordTerm, DiagnosisMonthly, PrescribedDrug, VitalReading
+from .terms import normalize, phrase_terms, drug_terms, pending_records, index_records, materialize_term_counts
+from .vitals import parse_blood_pressure, backfill, downsample, patient_series
+
+
+class MedicalRecordDetailQueryTests(DetailQueryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.record = MedicalRecord.objects.create(
+            patient=self.make_patient(), doctor=self.make_doctor(), visit_date=date(2024, 1, 10),
+            visit_type='CONSULTATION', chief_complaint='Fever', diagnosis='Viral fever',
+            temperature=101, blood_pressure='120/80',
+        )
+
+    def test_medical_record_detail_query_count(self):
+        self.assertDetailQueries('medical_records:medical_record_detail', self.record.pk, 1)
+
+    def test_medical_record_print_query_count(self):
+        self.assertDetailQueries('medical_records:medical_record_print', self.record.pk, 1)
+
+
+class TermExtractionTests(TestCase):
+
+    def test_normalize_drops_numbering_and_punctuation(self):
+        self.assertEqual(normalize('1. Viral  Fever!'), 'viral fever')
+        self.assertEqual(normalize('- Type-2 Diabetes'), 'type 2 diabetes')
+        self.assertEqual(normalize('3) URTI'), 'urti')
+        self.assertEqual(len(normalize('x' * 150)), 100)
+
+    def test_phrase_terms_split_and_deduplicate(self):
+        self.assertEqual(
+            phrase_terms('Viral fever, Dehydration; viral fever\nA | CBC'),
+            ['viral fever', 'dehydration', 'cbc'],
+        )
+        self.assertEqual(phrase_terms(''), [])
+
+    def test_drug_terms_keep_the_name_before_the_dose(self):
+        prescription = (
+            '1. Tab. Napa 500mg 1+0+1\n'
+            'Cap Seclo 20 mg; 2) Inj. Ceftriaxone 1g\n'
+            'Syp. Ambrox Paediatric Drops Extra 5ml\n'
+            'Napa 500 mg'
+        )
+        self.assertEqual(drug_terms(prescription), ['napa', 'seclo', 'ceftriaxone', 'ambrox paediatric drops'])
+        self.assertEqual(drug_terms(None), [])
+
+
+class TermIndexTests(SampleDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patient = self.make_patient()
+        self.doctor = self.make_doctor()
+
+    def make_record(self, visit_date, diagnosis, prescription='', lab_tests=''):
+        return MedicalRecord.objects.create(
+            patient=self.patient, doctor=self.doctor, visit_date=visit_date, visit_type='CONSULTATION',
+            chief_complaint='Fever', diagnosis=diagnosis, prescription=prescription, lab_tests=lab_tests,
+        )
+
+    def terms(self, record):
+        return set(record.terms.values_list('field', 'term'))
+
+    def test_records_are_indexed_by_field(self):
+        record = self.make_record(date(2024, 1, 10), 'Viral fever, Dehydration', 'Tab. Napa 500mg', 'CBC; Urine R/E')
+        self.assertEqual(index_records(), 1)
+        self.assertEqual(self.terms(record), {
+            ('DIAGNOSIS', 'viral fever'), ('DIAGNOSIS', 'dehydration'),
+            ('PRESCRIPTION', 'napa'), ('LAB_TEST', 'cbc'), ('LAB_TEST', 'urine r e'),
+        })
+        record.refresh_from_db()
+        self.assertIsNotNone(record.terms_indexed_at)
+
+    def test_only_new_or_edited_records_are_reindexed(self):
+        first = self.make_record(date(2024, 1, 10), 'Viral fever')
+        second = self.make_record(date(2024, 1, 11), 'Migraine')
+        self.assertEqual(index_records(chunk_size=1), 2)
+        self.assertFalse(pending_records().exists())
+        self.assertEqual(index_records(), 0)
+
+        second.diagnosis = 'Tension headache'
+        second.save()
+        self.assertEqual(list(pending_records()), [second])
+        self.assertEqual(index_records(), 1)
+        self.assertEqual(self.terms(second), {('DIAGNOSIS', 'tension headache')})
+        self.assertEqual(self.terms(first), {('DIAGNOSIS', 'viral fever')})
+
+    def test_full_rebuild_reindexes_every_record(self):
+        self.make_record(date(2024, 1, 10), 'Viral fever')
+        index_records()
+        RecordTerm.objects.all().delete()
+        self.assertEqual(index_records(full=True), 1)
+        self.assertEqual(RecordTerm.objects.count(), 1)
+
+    def test_counts_are_materialized_by_month_and_drug(self):
+        self.make_record(date(2024, 1, 10), 'Viral fever', 'Tab. Napa 500mg')
+        self.make_record(date(2024, 1, 25), 'Viral fever, Dehydration', 'Napa 500\nORS')
+        self.make_record(date(2024, 2, 3), 'Viral fever', 'Tab. Seclo 20mg')
+        DiagnosisMonthly.objects.create(month=date(2020, 1, 1), term='stale', record_count=9)
+        index_records()
+
+        materialize_term_counts()
+
+        self.assertEqual(set(DiagnosisMonthly.objects.values_list('month', 'term', 'record_count')), {
+            (date(2024, 1, 1), 'viral fever', 2),
+            (date(2024, 1, 1), 'dehydration', 1),
+            (date(2024, 2, 1), 'viral fever', 1),
+        })
+        self.assertEqual(set(PrescribedDrug.objects.values_list('term', 'record_count', 'last_prescribed')), {
+            ('napa', 2, date(2024, 1, 25)),
+            ('ors', 1, date(2024, 1, 25)),
+            ('seclo', 1, date(2024, 2, 3)),
+        })
+
+    def test_trends_page_reads_the_indexed_counts(self):
+        today = timezone.localdate()
+        self.make_record(today, 'Viral fever', 'Tab. Napa 500mg')
+        self.make_record(today, 'Viral fever, Migraine', 'Tab. Napa 500mg\nCap. Seclo 20mg')
+        index_records()
+        materialize_term_counts()
+
+        response = self.client.get(reverse('medical_records:diagnosis_trends'), {'months': 12, 'top': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['month_list'], [today.replace(day=1)])
+        self.assertEqual(
+            [(row['term'], row['total'], row['by_month']) for row in response.context['top_diagnoses']],
+            [('viral fever', 2, [2])],
+        )
+        self.assertEqual([drug.term for drug in response.context['top_drugs']], ['napa'])
+        self.assertContains(response, 'viral fever')
+
+
+class VitalsTests(SampleDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patient = self.make_patient()
+        self.doctor = self.make_doctor()
+
+    def make_record(self, visit_date, **vitals):
+        return MedicalRecord.objects.create(
+            patient=self.patient, doctor=self.doctor, visit_date=visit_date, visit_type='ROUTINE',
+            chief_complaint='Checkup', diagnosis='Healthy', **vitals,
+        )
+
+    def readings(self, record):
+        return dict(record.vital_readings.values_list('kind', 'value'))
+
+    def test_parse_blood_pressure(self):
+        self.assertEqual(parse_blood_pressure('120/80 mmHg'), (Decimal(120), Decimal(80)))
+        self.assertEqual(parse_blood_pressure('BP 135 / 95'), (Decimal(135), Decimal(95)))
+        self.assertIsNone(parse_blood_pressure('normal'))
+        self.assertIsNone(parse_blood_pressure(''))
+
+    def test_saving_a_record_writes_its_readings(self):
+        record = self.make_record(date(2024, 1, 10), temperature=Decimal('101.2'), blood_pressure='120/80', heart_rate=88)
+        self.assertEqual(self.readings(record), {
+            'TEMPERATURE': Decimal('101.2'), 'SYSTOLIC': Decimal(120), 'DIASTOLIC': Decimal(80), 'HEART_RATE': Decimal(88),
+        })
+        self.assertEqual(
+            set(record.vital_readings.values_list('taken_at', flat=True)),
+            {timezone.make_aware(datetime(2024, 1, 10))},
+        )
+
+    def test_editing_a_record_keeps_readings_in_sync(self):
+        record = self.make_record(date(2024, 1, 10), temperature=Decimal('101.2'), blood_pressure='120/80')
+        record.temperature = None
+        record.blood_pressure = '140/90'
+        record.weight = '72.5'
+        record.save()
+        self.assertEqual(self.readings(record), {
+            'SYSTOLIC': Decimal(140), 'DIASTOLIC': Decimal(90), 'WEIGHT': Decimal('72.5'),
+        })
+
+    def test_index_only_updates_skip_the_sync(self):
+        record = self.make_record(date(2024, 1, 10), heart_rate=70)
+        record.terms_indexed_at = timezone.now()
+        with CaptureQueriesContext(connection) as queries:
+            record.save(update_fields=['terms_indexed_at'])
+        self.assertFalse([query for query in queries.captured_queries if 'vitalreading' in query['sql']])
+
+    def test_backfill_rebuilds_every_record(self):
+        first = self.make_record(date(2024, 1, 10), heart_rate=70)
+        second = self.make_record(date(2024, 2, 10), blood_pressure='110/70')
+        VitalReading.objects.all().delete()
+        VitalReading.objects.create(patient=self.patient, record=first, kind='WEIGHT',
+                                    taken_at=timezone.now(), value=1)
+
+        self.assertEqual(backfill(chunk_size=1), 3)
+        self.assertEqual(self.readings(first), {'HEART_RATE': Decimal(70)})
+        self.assertEqual(self.readings(second), {'SYSTOLIC': Decimal(110), 'DIASTOLIC': Decimal(70)})
+
+    def test_downsample_averages_buckets(self):
+        points = [(i, float(i)) for i in range(10)]
+        self.assertEqual(downsample(points, 20), points)
+        self.assertEqual(downsample(points, 5), [(1, 0.5), (3, 2.5), (5, 4.5), (7, 6.5), (9, 8.5)])
+
+    def test_patient_series_filters_by_kind_and_date(self):
+        for day, rate in [(1, 70), (2, 80), (3, 90)]:
+            self.make_record(date(2024, 1, day), heart_rate=rate, temperature=98)
+        self.make_patient()  # Readings of other patients stay out
+
+        series = patient_series(self.patient.pk, kinds=['HEART_RATE'],
+                                start=timezone.make_aware(datetime(2024, 1, 2)))
+
+        self.assertEqual(series, {'HEART_RATE': [
+            (timezone.make_aware(datetime(2024, 1, 2)), 80.0),
+            (timezone.make_aware(datetime(2024, 1, 3)), 90.0),
+        ]})
+
+    def test_patient_vitals_endpoint(self):
+        for day in range(1, 5):
+            self.make_record(date(2024, 1, day), heart_rate=70 + day, blood_pressure='120/80')
+        url = reverse('medical_records:patient_vitals', args=[self.patient.pk])
+
+        response = self.client.get(url, {'kind': 'heart_rate', 'points': 2, 'end': '2024-01-03'})
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['patient'], self.patient.patient_id)
+        self.assertEqual(list(data['series']), ['HEART_RATE'])
+        self.assertEqual(
+            [(datetime.fromisoformat(taken_at), value) for taken_at, value in data['series']['HEART_RATE']],
+            [(timezone.make_aware(datetime(2024, 1, 1)), 71.0), (timezone.make_aware(datetime(2024, 1, 3)), 72.5)],
+        )
+        self.assertEqual(self.client.get(url, {'start': '01/01/2024'}).status_code, 400)
+        self.assertEqual(
+            self.client.get(reverse('medical_records:patient_vitals', args=[0])).status_code, 404,
+        )
@@ -1,10 +1,22 @@
+from datetime import datetime
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
-from .models import MedicalRecord
+from django.http import JsonResponse
+from django.db.models import Sum
+from django.utils import timezone
+from .models import MedicalRecord, DiagnosisMonthly, PrescribedDrug, VitalReading
+from .vitals import patient_series, MAX_POINTS
 from patients.models import Patient
+from patients.lookup import selected_patient
 from doctors.models import Doctor
+from search.index import search_queryset
+from hospital_management.detail import DetailGraph
+
+RECORD_DETAIL = DetailGraph('medical_records:medical_record_detail', MedicalRecord,
+                            select_related=['patient__user', 'doctor__user'])
+RECORD_PRINT = DetailGraph('medical_records:medical_record_print', MedicalRecord,
+                           select_related=['patient__user', 'doctor__user'])
 
 @login_required
 def medical_record_list(request):
@@ -14,14 +26,7 @@ def medical_record_list(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        records = records.filter(
-            Q(patient__user__first_name__icontains=search_query) |
-            Q(patient__user__last_name__icontains=search_query) |
-            Q(patient__patient_id__icontains=search_query) |
-            Q(doctor__user__first_name__icontains=search_query) |
-            Q(doctor__user__last_name__icontains=search_query) |
-            Q(diagnosis__icontains=search_query)
-        )
+        records = search_queryset(records, 'medical_record', search_query)
     
     context = {
         'records': records,
@@ -34,7 +39,7 @@ def medical_record_list(request):
 @login_required
 def medical_record_detail(request, pk):
     """Display detailed view of a medical record"""
-    record = get_object_or_404(MedicalRecord, pk=pk)
+    record = RECORD_DETAIL.get_or_404(pk=pk)
     return render(request, 'medical_records/medical_record_detail.html', {'record': record})
 
 
@@ -49,10 +54,9 @@ def medical_record_create(request):
             
             if not patient_id or not doctor_id:
                 messages.error(request, 'Please select both patient and doctor!')
-                patients = Patient.objects.all().select_related('user')
                 doctors = Doctor.objects.all().select_related('user')
                 return render(request, 'medical_records/medical_record_form.html', {
-                    'patients': patients,
+                    'selected_patient': selected_patient(request),
                     'doctors': doctors,
                     'is_update': False
                 })
@@ -81,10 +85,9 @@ def medical_record_create(request):
             # Validate required fields
             if not all([visit_date, visit_type, chief_complaint, diagnosis]):
                 messages.error(request, 'Visit date, visit type, chief complaint, and diagnosis are required!')
-                patients = Patient.objects.all().select_related('user')
                 doctors = Doctor.objects.all().select_related('user')
                 return render(request, 'medical_records/medical_record_form.html', {
-                    'patients': patients,
+                    'selected_patient': selected_patient(request),
                     'doctors': doctors,
                     'is_update': False
                 })
@@ -112,29 +115,26 @@ def medical_record_create(request):
             
         except ValueError as e:
             messages.error(request, 'Invalid number format in vital signs. Please check temperature, heart rate, and weight.')
-            patients = Patient.objects.all().select_related('user')
             doctors = Doctor.objects.all().select_related('user')
             return render(request, 'medical_records/medical_record_form.html', {
-                'patients': patients,
+                'selected_patient': selected_patient(request),
                 'doctors': doctors,
                 'is_update': False
             })
         except Exception as e:
             messages.error(request, f'Error creating medical record: {str(e)}')
-            patients = Patient.objects.all().select_related('user')
             doctors = Doctor.objects.all().select_related('user')
             return render(request, 'medical_records/medical_record_form.html', {
-                'patients': patients,
+                'selected_patient': selected_patient(request),
                 'doctors': doctors,
                 'is_update': False
             })
     
     # GET request - show form
-    patients = Patient.objects.all().select_related('user')
     doctors = Doctor.objects.all().select_related('user')
     
     context = {
-        'patients': patients,
+        'selected_patient': selected_patient(request),
         'doctors': doctors,
         'is_update': False
     }
@@ -179,11 +179,10 @@ def medical_record_update(request, pk):
             # Validate required fields
             if not all([record.visit_date, record.visit_type, record.chief_complaint, record.diagnosis]):
                 messages.error(request, 'Visit date, visit type, chief complaint, and diagnosis are required!')
-                patients = Patient.objects.all().select_related('user')
                 doctors = Doctor.objects.all().select_related('user')
                 return render(request, 'medical_records/medical_record_form.html', {
                     'record': record,
-                    'patients': patients,
+                    'selected_patient': record.patient,
                     'doctors': doctors,
                     'is_update': True
                 })
@@ -199,12 +198,11 @@ def medical_record_update(request, pk):
             messages.error(request, f'Error updating medical record: {str(e)}')
     
     # GET request - show form with record data
-    patients = Patient.objects.all().select_related('user')
     doctors = Doctor.objects.all().select_related('user')
     
     context = {
         'record': record,
-        'patients': patients,
+        'selected_patient': record.patient,
         'doctors': doctors,
         'is_update': True
     }
@@ -228,5 +226,72 @@ def medical_record_delete(request, pk):
 @login_required
 def medical_record_print(request, pk):
     """Generate printable medical record"""
-    record = get_object_or_404(MedicalRecord, pk=pk)
-    return render(request, 'medical_records/medical_record_print.html', {'record': record})
\ No newline at end of file
+    record = RECORD_PRINT.get_or_404(pk=pk)
+    return render(request, 'medical_records/medical_record_print.html', {'record': record})
+
+
+@login_required
+def diagnosis_trends(request):
+    """Top diagnoses by month and most prescribed drugs, from the materialized term counts"""
+    try:
+        months = min(max(int(request.GET.get('months', 12)), 1), 120)
+        top = min(max(int(request.GET.get('top', 10)), 1), 50)
+    except ValueError:
+        months, top = 12, 10
+    
+    today = timezone.now().date()
+    start_index = today.year * 12 + today.month - months
+    start = today.replace(year=start_index // 12, month=start_index % 12 + 1, day=1)
+    
+    in_window = DiagnosisMonthly.objects.filter(month__gte=start)
+    top_diagnoses = list(
+        in_window.values('term').annotate(total=Sum('record_count')).order_by('-total', 'term')[:top]
+    )
+    
+    # Month-by-month counts for the top diagnoses
+    month_list = sorted(set(in_window.values_list('month', flat=True)))
+    counts = {
+        (month, term): count
+        for month, term, count in in_window.filter(
+            term__in=[row['term'] for row in top_diagnoses]
+        ).values_list('month', 'term', 'record_count')
+    }
+    for row in top_diagnoses:
+        row['by_month'] = [counts.get((month, row['term']), 0) for month in month_list]
+    
+    context = {
+        'months': months,
+        'top': top,
+        'month_list': month_list,
+        'top_diagnoses': top_diagnoses,
+        'top_drugs': PrescribedDrug.objects.all()[:top],
+    }
+    return render(request, 'medical_records/diagnosis_trends.html', context)
+
+
+@login_required
+def patient_vitals(request, patient_pk):
+    """Downsampled vitals series for a patient's trend charts (JSON)"""
+    patient = get_object_or_404(Patient, pk=patient_pk)
+    
+    valid_kinds = {kind for kind, _ in VitalReading.KIND_CHOICES}
+    kinds = [kind for kind in request.GET.get('kind', '').upper().split(',') if kind in valid_kinds]
+    try:
+        points = min(max(int(request.GET.get('points', MAX_POINTS)), 2), 1000)
+        start = datetime.strptime(request.GET['start'], '%Y-%m-%d') if request.GET.get('start') else None
+        end = datetime.strptime(request.GET['end'], '%Y-%m-%d') if request.GET.get('end') else None
+    except ValueError:
+        return JsonResponse({'error': 'Use an integer for points and YYYY-MM-DD for start/end'}, status=400)
+    if start:
+        start = timezone.make_aware(start)
+    if end:
+        end = timezone.make_aware(end.replace(hour=23, minute=59, second=59))
+    
+    series = patient_series(patient.pk, kinds=kinds, start=start, end=end, max_points=points)
+    return JsonResponse({
+        'patient': patient.patient_id,
+        'series': {
+            kind: [[taken_at.isoformat(), round(value, 2)] for taken_at, value in values]
+            for kind, values in series.items()
+        },
+    })
@@ -0,0 +1,123 @@
+# medical_records/vitals.py
+"""
+Vitals time series.
+
+Each MedicalRecord's temperature, blood pressure, heart rate and weight are
+copied into narrow VitalReading rows (blood pressure split into systolic
+and diastolic), indexed on (patient, kind, taken_at). Trend charts read
+(taken_at, value) pairs with values_list and never touch the wide record
+rows. Readings are written when a record is saved (see
+medical_records.signals) and can be backfilled in bulk with the
+``backfill_vitals`` command.
+"""
+import re
+from collections import defaultdict
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MedicalRecord, VitalReading
+
+CHUNK_SIZE = 2000
+MAX_POINTS = 200
+
+_BLOOD_PRESSURE = re.compile(r'(\d{2,3})\s*/\s*(\d{2,3})')
+
+VITAL_FIELDS = ('visit_date', 'temperature', 'blood_pressure', 'heart_rate', 'weight')
+
+
+def parse_blood_pressure(value):
+    """Return (systolic, diastolic) from text such as '120/80 mmHg', or None."""
+    match = _BLOOD_PRESSURE.search(value or '')
+    if not match:
+        return None
+    return Decimal(match.group(1)), Decimal(match.group(2))
+
+
+def _taken_at(visit_date):
+    moment = datetime.combine(visit_date, time())
+    return timezone.make_aware(moment) if settings.USE_TZ else moment
+
+
+def readings_for(record_id, patient_id, visit_date, temperature, blood_pressure, heart_rate, weight):
+    """Build the VitalReading rows for one record's vitals."""
+    taken_at = _taken_at(visit_date)
+    values = {'TEMPERATURE': temperature, 'HEART_RATE': heart_rate, 'WEIGHT': weight}
+    pressure = parse_blood_pressure(blood_pressure)
+    if pressure:
+        values['SYSTOLIC'], values['DIASTOLIC'] = pressure
+
+    readings = []
+    for kind, value in values.items():
+        if value is None:
+            continue
+        try:
+            value = Decimal(value)
+        except InvalidOperation:
+            continue
+        readings.append(VitalReading(
+            patient_id=patient_id, record_id=record_id, kind=kind, taken_at=taken_at, value=value,
+        ))
+    return readings
+
+
+def sync_record(record_id):
+    """Replace the readings of one record (called when it is saved)."""
+    # Re-read the saved values: views assign raw form strings to the instance
+    row = MedicalRecord.objects.filter(pk=record_id).values_list('pk', 'patient_id', *VITAL_FIELDS).first()
+    readings = readings_for(*row) if row else []
+    with transaction.atomic():
+        VitalReading.objects.filter(record_id=record_id).delete()
+        VitalReading.objects.bulk_create(readings)
+
+
+def backfill(chunk_size=CHUNK_SIZE):
+    """Rebuild readings for every record, in chunks. Returns the number of readings written."""
+    written = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            MedicalRecord.objects.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('pk', 'patient_id', *VITAL_FIELDS)[:chunk_size]
+        )
+        if not rows:
+            return written
+        readings = [reading for row in rows for reading in readings_for(*row)]
+        with transaction.atomic():
+            VitalReading.objects.filter(record_id__gte=rows[0][0], record_id__lte=rows[-1][0]).delete()
+            VitalReading.objects.bulk_create(readings, batch_size=1000)
+        written += len(readings)
+        last_pk = rows[-1][0]
+
+
+def downsample(points, max_points=MAX_POINTS):
+    """Average consecutive points into at most ``max_points`` buckets."""
+    if len(points) <= max_points:
+        return points
+    size = len(points) / max_points
+    sampled = []
+    for bucket in range(max_points):
+        chunk = points[int(bucket * size):int((bucket + 1) * size)]
+        if chunk:
+            middle = chunk[len(chunk) // 2][0]
+            sampled.append((middle, sum(value for _, value in chunk) / len(chunk)))
+    return sampled
+
+
+def patient_series(patient_id, kinds=None, start=None, end=None, max_points=MAX_POINTS):
+    """Return {kind: [(taken_at, value), ...]} for one patient, downsampled per kind."""
+    readings = VitalReading.objects.filter(patient_id=patient_id)
+    if kinds:
+        readings = readings.filter(kind__in=kinds)
+    if start:
+        readings = readings.filter(taken_at__gte=start)
+    if end:
+        readings = readings.filter(taken_at__lte=end)
+
+    series = defaultdict(list)
+    for kind, taken_at, value in readings.order_by('kind', 'taken_at').values_list('kind', 'taken_at', 'value'):
+        series[kind].append((taken_at, float(value)))
+    return {kind: downsample(points, max_points) for kind, points in series.items()}
@@ -0,0 +1,37 @@
+# patients/lookup.py
+"""
+Patient lookup for forms.
+
+Forms no longer render every patient into a <select>; they render only the
+chosen patient and fetch matches from the ``patients:patient_lookup``
+typeahead endpoint, which reads the prefix-indexed search documents.
+"""
+from search.index import search_ids
+
+from .models import Patient
+
+
+def lookup_patients(query, limit):
+    """Top ``limit`` patients matching ``query`` by ID, name or phone prefix, as dicts."""
+    ids = search_ids('patient', query, limit=limit)
+    rows = Patient.objects.filter(pk__in=ids).values(
+        'pk', 'patient_id', 'user__first_name', 'user__last_name', 'phone_number'
+    )
+    by_pk = {row['pk']: row for row in rows}
+    return [
+        {
+            'id': row['pk'],
+            'patient_id': row['patient_id'],
+            'name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            'phone_number': row['phone_number'],
+        }
+        for row in (by_pk.get(pk) for pk in ids) if row
+    ]
+
+
+def selected_patient(request):
+    """The patient submitted with (or preselected in the URL of) a form, or None."""
+    value = request.POST.get('patient') or request.GET.get('patient')
+    if not value or not str(value).isdigit():
+        return None
+    return Patient.objects.select_related('user').filter(pk=value).first()
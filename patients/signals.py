@@ -0,0 +1,22 @@
+# patients/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from appointments.models import Appointment
+from billing.models import Bill
+from medical_records.models import MedicalRecord
+
+from .timeline import invalidate
+
+
+@receiver(post_save, sender=Appointment)
+@receiver(post_save, sender=Bill)
+@receiver(post_save, sender=MedicalRecord)
+@receiver(post_delete, sender=Appointment)
+@receiver(post_delete, sender=Bill)
+@receiver(post_delete, sender=MedicalRecord)
+def invalidate_timeline(sender, instance, **kwargs):
+    # After commit, so a concurrent request cannot re-cache the old feed
+    patient_id = instance.patient_id
+    transaction.on_commit(lambda: invalidate(patient_id))
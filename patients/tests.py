@@ -1,3 +1,156 @@
-from django.test import TestCase
+from datetime import date, time, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from appointments.models import Appointment
+from billing.models import Bill
+from hospital_management.testing import LOCAL_CACHES, SampleDataMixin
+from medical_records.models import MedicalRecord
+
+from .models import Patient
+from .timeline import PAGE_SIZE, PatientTimeline, entries_queryset, timeline_counts, timeline_entries
+from .views import LOOKUP_LIMIT
+
+
+class PatientLookupTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        for number in range(1, 31):
+            user = User.objects.create_user(f'patient{number}', first_name='Rahim', last_name=f'Uddin{number}')
+            Patient.objects.create(
+                user=user, patient_id=f'PAT{number:05d}', date_of_birth=date(1990, 1, 1), gender='M',
+                blood_group='A+', phone_number='01700000000', address='Dhaka', emergency_contact='01800000000',
+            )
+
+    def lookup(self, limit):
+        response = self.client.get(reverse('patients:patient_lookup'), {'q': 'rahim', 'limit': limit})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_limit_is_clamped_to_at_least_one(self):
+        self.assertEqual(len(self.lookup(-1)), 1)
+        self.assertEqual(len(self.lookup(0)), 1)
+
+    def test_non_numeric_limit_falls_back_to_the_default(self):
+        self.assertEqual(len(self.lookup('abc')), LOOKUP_LIMIT)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class PatientTimelineTests(SampleDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.today = timezone.localdate()
+        self.patient = self.make_patient()
+        self.doctor = self.make_doctor()
+
+    def make_appointment(self, days_ago, status='PENDING'):
+        return Appointment.objects.create(
+            appointment_id=f'APT{Appointment.objects.count() + 1:05d}', patient=self.patient, doctor=self.doctor,
+            appointment_date=self.today - timedelta(days=days_ago), appointment_time=time(10),
+            appointment_type='Consultation', symptoms='Fever', status=status,
+        )
+
+    def make_record(self, days_ago):
+        return MedicalRecord.objects.create(
+            patient=self.patient, doctor=self.doctor, visit_date=self.today - timedelta(days=days_ago),
+            visit_type='FOLLOWUP', chief_complaint='Fever', diagnosis='Viral fever',
+        )
+
+    def make_bill(self, total, paid=0):
+        return Bill.objects.create(patient=self.patient, consultation_fee=total, total_amount=total, amount_paid=paid)
+
+    def test_every_source_fills_the_same_columns(self):
+        appointment = self.make_appointment(2, status='COMPLETED')
+        record = self.make_record(1)
+        bill = self.make_bill(Decimal('500.00'), paid=Decimal('200.00'))
+        self.make_patient()  # Another patient's rows stay out
+        doctor = self.doctor.user
+
+        entries = list(entries_queryset(self.patient.pk))
+
+        self.assertEqual(entries, [
+            {'kind': 'BILL', 'object_id': bill.pk, 'occurred_on': self.today, 'title': bill.bill_number,
+             'entry_status': 'PARTIAL', 'amount': Decimal('500.00'), 'doctor_first_name': '', 'doctor_last_name': ''},
+            {'kind': 'PAYMENT', 'object_id': bill.pk, 'occurred_on': self.today, 'title': bill.bill_number,
+             'entry_status': 'PARTIAL', 'amount': Decimal('200.00'), 'doctor_first_name': '', 'doctor_last_name': ''},
+            {'kind': 'MEDICAL_RECORD', 'object_id': record.pk, 'occurred_on': record.visit_date,
+             'title': 'Viral fever', 'entry_status': 'FOLLOWUP', 'amount': None,
+             'doctor_first_name': doctor.first_name, 'doctor_last_name': doctor.last_name},
+            {'kind': 'APPOINTMENT', 'object_id': appointment.pk, 'occurred_on': appointment.appointment_date,
+             'title': 'Consultation', 'entry_status': 'COMPLETED', 'amount': None,
+             'doctor_first_name': doctor.first_name, 'doctor_last_name': doctor.last_name},
+        ])
+
+    def test_only_bills_with_a_payment_add_payment_entries(self):
+        self.make_bill(100)
+        paid = self.make_bill(300, paid=300)
+        self.make_appointment(0)
+        self.make_appointment(1, status='COMPLETED')
+
+        payments = [entry for entry in entries_queryset(self.patient.pk) if entry['kind'] == 'PAYMENT']
+
+        self.assertEqual([(entry['object_id'], entry['amount']) for entry in payments], [(paid.pk, Decimal('300.00'))])
+        self.assertEqual(timeline_counts(self.patient.pk), {
+            'total_appointments': 2, 'completed_appointments': 1, 'pending_appointments': 1,
+            'total_records': 0, 'total_bills': 2, 'unpaid_bills': 1, 'total_payments': 1,
+            'total_entries': 5,
+        })
+
+    def test_pages_slice_the_feed(self):
+        for days_ago in range(PAGE_SIZE + 5):
+            self.make_appointment(days_ago)
+        timeline = Paginator(PatientTimeline(self.patient.pk), PAGE_SIZE)
+
+        self.assertEqual((timeline.count, timeline.num_pages), (PAGE_SIZE + 5, 2))
+        first, last = timeline.page(1), timeline.page(2)
+        self.assertEqual(len(first), PAGE_SIZE)
+        self.assertEqual(len(last), 5)
+        dates = [entry['occurred_on'] for entry in [*first, *last]]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        self.assertEqual(last[-1]['occurred_on'], self.today - timedelta(days=PAGE_SIZE + 4))
+        with self.assertRaises(TypeError):
+            PatientTimeline(self.patient.pk)[0]
+
+    def test_pages_are_cached(self):
+        self.make_appointment(0)
+        timeline_entries(self.patient.pk, 0, PAGE_SIZE)
+        with self.assertNumQueries(0):
+            timeline_entries(self.patient.pk, 0, PAGE_SIZE)
+        # Without the on_commit invalidation the cached page stays as it was
+        self.make_appointment(1)
+        self.assertEqual(len(timeline_entries(self.patient.pk, 0, PAGE_SIZE)), 1)
+
+    def test_saving_any_source_invalidates_after_commit(self):
+        for make in (lambda: self.make_appointment(0), lambda: self.make_record(0), lambda: self.make_bill(100)):
+            before = timeline_counts(self.patient.pk)['total_entries']
+            with self.captureOnCommitCallbacks(execute=True):
+                make()
+            self.assertEqual(timeline_counts(self.patient.pk)['total_entries'], before + 1)
+
+    def test_editing_a_bill_changes_the_cached_page(self):
+        bill = self.make_bill(Decimal('750.00'))
+        url = reverse('patients:patient_detail', args=[self.patient.pk])
+        response = self.client.get(url)
+        self.assertEqual([entry['kind'] for entry in response.context['page_obj']], ['BILL'])
+        self.assertContains(response, 'Total ৳750')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bill.amount_paid = Decimal('250.00')
+            bill.save()
+
+        response = self.client.get(url)
+        self.assertEqual(
+            [(entry['kind'], entry['amount'], entry['entry_status']) for entry in response.context['page_obj']],
+            [('BILL', Decimal('750.00'), 'PARTIAL'), ('PAYMENT', Decimal('250.00'), 'PARTIAL')],
+        )
+        self.assertEqual(response.context['total_payments'], 1)
+        self.assertContains(response, 'Payment on ' + bill.bill_number)
@@ -0,0 +1,181 @@
+# patients/timeline.py
+"""
+Patient timeline.
+
+Appointments, medical records, bills and payments are merged into one feed
+ordered by date with a single UNION ALL over value projections, so a page of
+the feed is one query and rows already carry the doctor's name. Counts for
+the summary cards come from one more UNION ALL of conditional aggregates.
+
+A bill carries its payments in ``amount_paid`` rather than as separate rows,
+so a bill with anything paid contributes a PAYMENT entry dated at its last
+update.
+
+Counts and pages are cached per patient. Every cache key includes a
+per-patient version that patients.signals bumps whenever one of the
+patient's appointments, records or bills is written.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import F, Q, Count, Value, CharField, DecimalField, IntegerField
+from django.db.models.functions import TruncDate
+
+from appointments.models import Appointment
+from billing.models import Bill
+from medical_records.models import MedicalRecord
+
+CACHE_TIMEOUT = 60 * 10
+PAGE_SIZE = 20
+
+COUNT_FIELDS = ('total', 'completed', 'pending')
+
+
+def _text(value):
+    return Value(value, output_field=CharField())
+
+
+def _version_key(patient_id):
+    return f'patient-timeline:{patient_id}:version'
+
+
+def _cache_key(patient_id, *parts):
+    # Start from the clock so a counter lost to eviction never restarts at a value already used
+    version = cache.get_or_set(_version_key(patient_id), time.time_ns, timeout=None)
+    return ':'.join(['patient-timeline', str(patient_id), str(version), *map(str, parts)])
+
+
+def invalidate(patient_id):
+    """Drop every cached count and page for one patient."""
+    try:
+        cache.incr(_version_key(patient_id))
+    except ValueError:
+        cache.set(_version_key(patient_id), time.time_ns(), timeout=None)
+
+
+def entries_queryset(patient_id):
+    """The whole feed as one UNION ALL, newest first."""
+    no_amount = Value(None, output_field=DecimalField(max_digits=10, decimal_places=2))
+    no_name = _text('')
+
+    appointments = Appointment.objects.filter(patient_id=patient_id).order_by().values(
+        kind=_text('APPOINTMENT'),
+        object_id=F('pk'),
+        occurred_on=F('appointment_date'),
+        title=F('appointment_type'),
+        entry_status=F('status'),
+        amount=no_amount,
+        doctor_first_name=F('doctor__user__first_name'),
+        doctor_last_name=F('doctor__user__last_name'),
+    )
+    records = MedicalRecord.objects.filter(patient_id=patient_id).order_by().values(
+        kind=_text('MEDICAL_RECORD'),
+        object_id=F('pk'),
+        occurred_on=F('visit_date'),
+        title=F('diagnosis'),
+        entry_status=F('visit_type'),
+        amount=no_amount,
+        doctor_first_name=F('doctor__user__first_name'),
+        doctor_last_name=F('doctor__user__last_name'),
+    )
+    bills = Bill.objects.filter(patient_id=patient_id).order_by()
+    billed = bills.values(
+        kind=_text('BILL'),
+        object_id=F('pk'),
+        occurred_on=TruncDate('created_at'),
+        title=F('bill_number'),
+        entry_status=F('status'),
+        amount=F('total_amount'),
+        doctor_first_name=no_name,
+        doctor_last_name=no_name,
+    )
+    payments = bills.filter(amount_paid__gt=0).values(
+        kind=_text('PAYMENT'),
+        object_id=F('pk'),
+        occurred_on=TruncDate('updated_at'),
+        title=F('bill_number'),
+        entry_status=F('status'),
+        amount=F('amount_paid'),
+        doctor_first_name=no_name,
+        doctor_last_name=no_name,
+    )
+    return appointments.union(records, billed, payments, all=True).order_by('-occurred_on', 'kind', '-object_id')
+
+
+def _counts_queryset(patient_id):
+    zero = Value(0, output_field=IntegerField())
+    appointments = Appointment.objects.filter(patient_id=patient_id).order_by().values('patient_id').annotate(
+        source=_text('appointments'),
+        total=Count('pk'),
+        completed=Count('pk', filter=Q(status='COMPLETED')),
+        pending=Count('pk', filter=Q(status='PENDING')),
+    ).values_list('source', *COUNT_FIELDS)
+    records = MedicalRecord.objects.filter(patient_id=patient_id).order_by().values('patient_id').annotate(
+        source=_text('records'),
+        total=Count('pk'),
+        completed=zero,
+        pending=zero,
+    ).values_list('source', *COUNT_FIELDS)
+    # For bills "completed" counts bills with a payment (the PAYMENT entries) and "pending" unpaid ones
+    bills = Bill.objects.filter(patient_id=patient_id).order_by().values('patient_id').annotate(
+        source=_text('bills'),
+        total=Count('pk'),
+        completed=Count('pk', filter=Q(amount_paid__gt=0)),
+        pending=Count('pk', filter=~Q(status='PAID')),
+    ).values_list('source', *COUNT_FIELDS)
+    return appointments.union(records, bills, all=True)
+
+
+def timeline_counts(patient_id):
+    """Summary counts for one patient (cached)."""
+    key = _cache_key(patient_id, 'counts')
+    counts = cache.get(key)
+    if counts is None:
+        rows = {source: dict(zip(COUNT_FIELDS, values)) for source, *values in _counts_queryset(patient_id)}
+        empty = dict.fromkeys(COUNT_FIELDS, 0)
+        appointments = rows.get('appointments', empty)
+        bills = rows.get('bills', empty)
+        counts = {
+            'total_appointments': appointments['total'],
+            'completed_appointments': appointments['completed'],
+            'pending_appointments': appointments['pending'],
+            'total_records': rows.get('records', empty)['total'],
+            'total_bills': bills['total'],
+            'unpaid_bills': bills['pending'],
+            'total_payments': bills['completed'],
+        }
+        counts['total_entries'] = (counts['total_appointments'] + counts['total_records']
+                                   + counts['total_bills'] + counts['total_payments'])
+        cache.set(key, counts, CACHE_TIMEOUT)
+    return counts
+
+
+def timeline_entries(patient_id, offset, limit):
+    """One slice of the feed as a list of dicts (cached)."""
+    key = _cache_key(patient_id, 'entries', offset, limit)
+    entries = cache.get(key)
+    if entries is None:
+        entries = list(entries_queryset(patient_id)[offset:offset + limit])
+        for entry in entries:
+            entry['doctor_name'] = f"{entry.pop('doctor_first_name')} {entry.pop('doctor_last_name')}".strip()
+        cache.set(key, entries, CACHE_TIMEOUT)
+    return entries
+
+
+class PatientTimeline:
+    """Sequence over a patient's feed for django.core.paginator.Paginator."""
+
+    def __init__(self, patient_id):
+        self.patient_id = patient_id
+
+    def count(self):
+        return timeline_counts(self.patient_id)['total_entries']
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError('PatientTimeline only supports slicing')
+        start = index.start or 0
+        return timeline_entries(self.patient_id, start, index.stop - start)
@@ -12,4 +12,7 @@ urlpatterns = [
     
     # AJAX endpoint for quick patient creation
     path('quick-create/', views.patient_quick_create, name='patient_quick_create'),
+    
+    # Typeahead lookup used by the bill, appointment and medical record forms
+    path('lookup/', views.patient_lookup, name='patient_lookup'),
 ]
\ No newline at end of file
@@ -2,23 +2,24 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.db.models import Q
 from django.http import JsonResponse
+from django.core.paginator import Paginator
 from django.views.decorators.http import require_POST
 from django.db import transaction
 from .models import Patient
+from search.index import search_queryset
+from .lookup import lookup_patients
+from .timeline import PatientTimeline, timeline_counts, PAGE_SIZE as TIMELINE_PAGE_SIZE
+
+LOOKUP_LIMIT = 10
+LOOKUP_MAX_LIMIT = 50
 
 @login_required
 def patient_list(request):
     patients = Patient.objects.all().select_related('user')
     search_query = request.GET.get('search', '')
     if search_query:
-        patients = patients.filter(
-            Q(patient_id__icontains=search_query) |
-            Q(user__first_name__icontains=search_query) |
-            Q(user__last_name__icontains=search_query) |
-            Q(phone_number__icontains=search_query)
-        )
+        patients = search_queryset(patients, 'patient', search_query)
     
     context = {
         'patients': patients,
@@ -30,28 +31,13 @@ def patient_list(request):
 
 @login_required
 def patient_detail(request, pk):
-    patient = get_object_or_404(Patient, pk=pk)
-    from appointments.models import Appointment
-    from billing.models import Bill
-    from medical_records.models import MedicalRecord
-    
-    appointments = Appointment.objects.filter(patient=patient).order_by('-appointment_date')
-    bills = Bill.objects.filter(patient=patient).order_by('-created_at')
-    medical_records = MedicalRecord.objects.filter(patient=patient).order_by('-visit_date')
-    total_appointments = appointments.count()
-    completed_appointments = appointments.filter(status='COMPLETED').count()
-    pending_appointments = appointments.filter(status='PENDING').count()
-    total_records = medical_records.count()
+    patient = get_object_or_404(Patient.objects.select_related('user'), pk=pk)
     
+    timeline = Paginator(PatientTimeline(patient.pk), TIMELINE_PAGE_SIZE)
     context = {
         'patient': patient,
-        'appointments': appointments[:10],
-        'bills': bills[:10],
-        'medical_records': medical_records[:5],
-        'total_appointments': total_appointments,
-        'completed_appointments': completed_appointments,
-        'pending_appointments': pending_appointments,
-        'total_records': total_records,
+        'page_obj': timeline.get_page(request.GET.get('page')),
+        **timeline_counts(patient.pk),
     }
     return render(request, 'patients/patient_detail.html', context)
 
@@ -190,4 +176,18 @@ def patient_quick_create(request):
         return JsonResponse({
             'success': False,
             'error': f'Error creating patient: {str(e)}'
-        })
\ No newline at end of file
+        })
+
+
+@login_required
+def patient_lookup(request):
+    """Typeahead JSON: top matches by patient ID, name or phone prefix"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = max(1, min(int(request.GET.get('limit', LOOKUP_LIMIT)), LOOKUP_MAX_LIMIT))
+    except ValueError:
+        limit = LOOKUP_LIMIT
+    
+    if len(query) < 2:
+        return JsonResponse({'results': []})
+    return JsonResponse({'results': lookup_patients(query, limit)})
@@ -1,3 +1,42 @@
+# pharmacy/admin.py
 from django.contrib import admin
+from .models import Medicine, MedicineBatch, StockMovement, ReorderSuggestion, ExpirySweep, ExpiryBucket
 
-# Register your models here.
+@admin.register(Medicine)
+class MedicineAdmin(admin.ModelAdmin):
+    list_display = ['medicine_id', 'name', 'category', 'stock_quantity', 'reorder_level', 'expiry_date']
+    list_filter = ['category', 'unit']
+    search_fields = ['medicine_id', 'name', 'manufacturer']
+    readonly_fields = ['stock_quantity']
+
+@admin.register(MedicineBatch)
+class MedicineBatchAdmin(admin.ModelAdmin):
+    list_display = ['medicine', 'lot_number', 'quantity', 'expiry_date', 'cost_price', 'received_at']
+    list_filter = ['expiry_date']
+    search_fields = ['lot_number', 'medicine__name', 'medicine__medicine_id']
+    raw_id_fields = ['medicine']
+    readonly_fields = ['quantity']
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ['medicine', 'batch', 'delta', 'reason', 'user', 'created_at']
+    list_filter = ['reason', 'created_at']
+    search_fields = ['medicine__name', 'medicine__medicine_id', 'note']
+    raw_id_fields = ['medicine', 'batch', 'user']
+
+@admin.register(ReorderSuggestion)
+class ReorderSuggestionAdmin(admin.ModelAdmin):
+    list_display = ['medicine', 'current_stock', 'daily_consumption', 'days_of_cover', 'on_order', 'suggested_quantity', 'purchase_order', 'generated_at']
+    search_fields = ['medicine__name', 'medicine__medicine_id']
+    raw_id_fields = ['medicine', 'purchase_order']
+
+@admin.register(ExpirySweep)
+class ExpirySweepAdmin(admin.ModelAdmin):
+    list_display = ['run_at', 'swept_through', 'batches_written_off', 'quantity_written_off', 'value_lost']
+
+@admin.register(ExpiryBucket)
+class ExpiryBucketAdmin(admin.ModelAdmin):
+    list_display = ['medicine', 'batch', 'days', 'expiry_date', 'quantity', 'value', 'computed_at']
+    list_filter = ['days']
+    search_fields = ['medicine__name', 'batch__lot_number']
+    raw_id_fields = ['medicine', 'batch']
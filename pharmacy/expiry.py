@@ -0,0 +1,121 @@
+# pharmacy/expiry.py
+"""
+Expiry sweep for medicine batches.
+
+The sweep writes off every batch that expired before the given day: the
+batches are emptied with one UPDATE, medicine stock is reduced with one
+UPDATE ... CASE over the affected medicines, and WRITE_OFF movements are
+inserted in bulk. The cost of the stock written off is recorded on an
+ExpirySweep row.
+
+The same run rebuilds ExpiryBucket, which files every in-stock batch
+expiring in the next 90 days under the 30, 60 or 90 day bucket, so reports
+read a small precomputed table instead of scanning the catalogue. Stock
+changes through pharmacy.stock and purchase order receiving rebuild the
+buckets of the medicines they touch, so quantities stay current between
+sweeps; batches move to a nearer bucket when the next sweep runs.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Case, When, Value, IntegerField
+from django.utils import timezone
+
+from .models import Medicine, MedicineBatch, StockMovement, ExpirySweep, ExpiryBucket
+from .stock import refresh_expiry_dates
+
+BUCKET_DAYS = [days for days, _ in ExpiryBucket.BUCKET_CHOICES]
+
+
+def sweep_expired(today=None, user=None):
+    """Write off all stock that expired before ``today``. Returns the ExpirySweep."""
+    today = today or timezone.now().date()
+    user = user if user is not None and user.is_authenticated else None
+
+    with transaction.atomic():
+        expired = list(
+            MedicineBatch.objects.filter(expiry_date__lt=today, quantity__gt=0)
+            .select_for_update()
+            .values_list('pk', 'medicine_id', 'quantity', 'cost_price', 'expiry_date')
+        )
+
+        per_medicine = defaultdict(int)
+        value_lost = Decimal('0')
+        for _, medicine_id, quantity, cost_price, _ in expired:
+            per_medicine[medicine_id] += quantity
+            value_lost += quantity * cost_price
+
+        if expired:
+            MedicineBatch.objects.filter(pk__in=[row[0] for row in expired]).update(quantity=0)
+
+            Medicine.objects.filter(pk__in=per_medicine).update(
+                stock_quantity=F('stock_quantity') - Case(
+                    *[When(pk=pk, then=Value(quantity)) for pk, quantity in per_medicine.items()],
+                    output_field=IntegerField(),
+                ),
+                updated_at=timezone.now(),
+            )
+            refresh_expiry_dates(list(per_medicine))
+
+            StockMovement.objects.bulk_create([
+                StockMovement(
+                    medicine_id=medicine_id,
+                    batch_id=pk,
+                    delta=-quantity,
+                    reason='WRITE_OFF',
+                    user=user,
+                    note=f'Expired on {expiry_date:%Y-%m-%d}',
+                )
+                for pk, medicine_id, quantity, _, expiry_date in expired
+            ], batch_size=500)
+
+        sweep = ExpirySweep.objects.create(
+            swept_through=today,
+            batches_written_off=len(expired),
+            quantity_written_off=sum(per_medicine.values()),
+            value_lost=value_lost,
+        )
+
+        rebuild_expiry_buckets(today)
+
+    return sweep
+
+
+def rebuild_expiry_buckets(today=None, medicine_ids=None):
+    """
+    Refill ExpiryBucket with the in-stock batches expiring in the next 90
+    days, for ``medicine_ids`` only when given.
+    """
+    today = today or timezone.now().date()
+    now = timezone.now()
+
+    batches = MedicineBatch.objects.filter(
+        quantity__gt=0,
+        expiry_date__gte=today,
+        expiry_date__lte=today + timedelta(days=BUCKET_DAYS[-1]),
+    )
+    stale = ExpiryBucket.objects.all()
+    if medicine_ids is not None:
+        batches = batches.filter(medicine_id__in=medicine_ids)
+        stale = stale.filter(medicine_id__in=medicine_ids)
+    batches = batches.values_list('pk', 'medicine_id', 'quantity', 'cost_price', 'expiry_date')
+
+    buckets = []
+    for pk, medicine_id, quantity, cost_price, expiry_date in batches:
+        days_left = (expiry_date - today).days
+        buckets.append(ExpiryBucket(
+            medicine_id=medicine_id,
+            batch_id=pk,
+            days=next(days for days in BUCKET_DAYS if days_left <= days),
+            expiry_date=expiry_date,
+            quantity=quantity,
+            value=quantity * cost_price,
+            computed_at=now,
+        ))
+
+    with transaction.atomic():
+        stale.delete()
+        ExpiryBucket.objects.bulk_create(buckets, batch_size=500)
+    return len(buckets)
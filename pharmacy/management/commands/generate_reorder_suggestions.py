@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from pharmacy.reorder import generate_reorder_suggestions, WINDOW_DAYS, LEAD_DAYS, TARGET_DAYS
+
+
+class Command(BaseCommand):
+    help = 'Rebuild reorder suggestions from recent consumption (run on a schedule, e.g. nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=WINDOW_DAYS, help='Days of dispensing history to average')
+        parser.add_argument('--lead-days', type=int, default=LEAD_DAYS, help='Days a delivery takes to arrive')
+        parser.add_argument('--target-days', type=int, default=TARGET_DAYS, help='Days of cover a reorder should restore')
+
+    def handle(self, *args, **options):
+        count = generate_reorder_suggestions(
+            window_days=options['window'],
+            lead_days=options['lead_days'],
+            target_days=options['target_days'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Generated {count} reorder suggestion(s)'))
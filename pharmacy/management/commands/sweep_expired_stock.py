@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pharmacy.expiry import sweep_expired
+
+
+class Command(BaseCommand):
+    help = 'Write off expired medicine batches and rebuild the 30/60/90 day expiry buckets (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Treat this day (YYYY-MM-DD) as today')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Use YYYY-MM-DD for --date')
+
+        sweep = sweep_expired(today)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote off {sweep.quantity_written_off} unit(s) from {sweep.batches_written_off} batch(es), '
+            f'value lost {sweep.value_lost}'
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def record_opening_stock(apps, schema_editor):
+    """Give existing stock an opening movement so the ledger sums to stock_quantity"""
+    Medicine = apps.get_model('pharmacy', 'Medicine')
+    StockMovement = apps.get_model('pharmacy', 'StockMovement')
+    StockMovement.objects.bulk_create(
+        StockMovement(medicine_id=pk, delta=quantity, reason='OPENING', note='Balance before stock ledger')
+        for pk, quantity in Medicine.objects.filter(stock_quantity__gt=0).values_list('pk', 'stock_quantity')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('pharmacy', '0002_alter_medicine_options_medicine_reorder_level_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('reason', models.CharField(choices=[('OPENING', 'Opening Stock'), ('RECEIPT', 'Stock Receipt'), ('DISPENSE', 'Dispensed'), ('RETURN', 'Returned'), ('ADJUSTMENT', 'Adjustment'), ('WRITE_OFF', 'Write-off')], max_length=20)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('medicine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='pharmacy.medicine')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['medicine', '-created_at'], name='pharmacy_st_medicin_617c49_idx'), models.Index(fields=['reason', 'created_at'], name='pharmacy_st_reason_aebeb9_idx')],
+            },
+        ),
+        migrations.RunPython(record_opening_stock, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_opening_batches(apps, schema_editor):
+    """Move existing stock into one batch per medicine so stock_quantity equals the batch sum"""
+    Medicine = apps.get_model('pharmacy', 'Medicine')
+    MedicineBatch = apps.get_model('pharmacy', 'MedicineBatch')
+    StockMovement = apps.get_model('pharmacy', 'StockMovement')
+    for medicine in Medicine.objects.filter(stock_quantity__gt=0).iterator():
+        batch = MedicineBatch.objects.create(
+            medicine=medicine,
+            lot_number='UNSPECIFIED',
+            quantity=medicine.stock_quantity,
+            expiry_date=medicine.expiry_date,
+            cost_price=medicine.purchase_price,
+        )
+        StockMovement.objects.filter(medicine=medicine, reason='OPENING').update(batch=batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pharmacy', '0003_stockmovement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicineBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lot_number', models.CharField(max_length=50)),
+                ('quantity', models.IntegerField(default=0)),
+                ('expiry_date', models.DateField()),
+                ('cost_price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('medicine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batches', to='pharmacy.medicine')),
+            ],
+            options={
+                'ordering': ['expiry_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='stockmovement',
+            name='batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='pharmacy.medicinebatch'),
+        ),
+        migrations.AddIndex(
+            model_name='medicinebatch',
+            index=models.Index(fields=['medicine', 'expiry_date'], name='pharmacy_me_medicin_8410d3_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='medicinebatch',
+            unique_together={('medicine', 'lot_number')},
+        ),
+        migrations.RunPython(create_opening_batches, migrations.RunPython.noop),
+    ]
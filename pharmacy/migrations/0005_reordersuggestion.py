@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suppliers', '0001_initial'),
+        ('pharmacy', '0004_medicinebatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReorderSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('daily_consumption', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('days_of_cover', models.DecimalField(blank=True, decimal_places=1, max_digits=10, null=True)),
+                ('current_stock', models.IntegerField(default=0)),
+                ('suggested_quantity', models.IntegerField(default=0)),
+                ('generated_at', models.DateTimeField()),
+                ('medicine', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reorder_suggestion', to='pharmacy.medicine')),
+                ('purchase_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reorder_suggestions', to='suppliers.purchaseorder')),
+            ],
+            options={
+                'ordering': ['days_of_cover'],
+                'indexes': [models.Index(fields=['days_of_cover'], name='pharmacy_re_days_of_5ac23f_idx')],
+            },
+        ),
+    ]
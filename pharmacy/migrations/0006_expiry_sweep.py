@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pharmacy', '0005_reordersuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('days', models.IntegerField(choices=[(30, 'Within 30 days'), (60, 'Within 60 days'), (90, 'Within 90 days')])),
+                ('expiry_date', models.DateField()),
+                ('quantity', models.IntegerField()),
+                ('value', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['expiry_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpirySweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_at', models.DateTimeField(auto_now_add=True)),
+                ('swept_through', models.DateField()),
+                ('batches_written_off', models.IntegerField(default=0)),
+                ('quantity_written_off', models.IntegerField(default=0)),
+                ('value_lost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+            options={
+                'ordering': ['-run_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='medicine',
+            name='expiry_date',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='medicinebatch',
+            index=models.Index(fields=['expiry_date', 'quantity'], name='pharmacy_me_expiry__582edc_idx'),
+        ),
+        migrations.AddField(
+            model_name='expirybucket',
+            name='batch',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_buckets', to='pharmacy.medicinebatch'),
+        ),
+        migrations.AddField(
+            model_name='expirybucket',
+            name='medicine',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_buckets', to='pharmacy.medicine'),
+        ),
+        migrations.AddIndex(
+            model_name='expirybucket',
+            index=models.Index(fields=['days', 'expiry_date'], name='pharmacy_ex_days_4a446a_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pharmacy', '0007_medicine_pharmacy_me_stock_q_37693e_idx'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='medicinebatch',
+            unique_together={('medicine', 'lot_number', 'expiry_date')},
+        ),
+    ]
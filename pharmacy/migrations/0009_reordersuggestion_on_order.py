@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pharmacy', '0008_medicinebatch_lot_expiry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reordersuggestion',
+            name='on_order',
+            field=models.IntegerField(default=0),
+        ),
+    ]
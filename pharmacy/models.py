@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.auth.models import User
 
 class Medicine(models.Model):
     UNIT_CHOICES = [
@@ -17,7 +18,7 @@ class Medicine(models.Model):
     description = models.TextField(blank=True)
     stock_quantity = models.IntegerField(default=0)
     unit = models.CharField(max_length=50, choices=UNIT_CHOICES)
-    expiry_date = models.DateField()
+    expiry_date = models.DateField(db_index=True)
     purchase_price = models.DecimalField(max_digits=10, decimal_places=2)
     selling_price = models.DecimalField(max_digits=10, decimal_places=2)
     reorder_level = models.IntegerField(default=10)
@@ -38,4 +39,125 @@ class Medicine(models.Model):
         return 0
     
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['stock_quantity']),  # In-stock and low-stock filters
+        ]
+
+class MedicineBatch(models.Model):
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='batches')
+    lot_number = models.CharField(max_length=50)
+    quantity = models.IntegerField(default=0)  # Quantity remaining in this lot
+    expiry_date = models.DateField()
+    cost_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    received_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.medicine.name} - Lot {self.lot_number} ({self.quantity})"
+    
+    @property
+    def is_expired(self):
+        from django.utils import timezone
+        return self.expiry_date < timezone.now().date()
+    
+    class Meta:
+        ordering = ['expiry_date']
+        # A lot is one expiry date; receipts without a lot number share DEFAULT_LOT, one batch per expiry
+        unique_together = ['medicine', 'lot_number', 'expiry_date']
+        indexes = [
+            models.Index(fields=['medicine', 'expiry_date']),
+            models.Index(fields=['expiry_date', 'quantity']),
+        ]
+
+
+class StockMovement(models.Model):
+    REASON_CHOICES = [
+        ('OPENING', 'Opening Stock'),
+        ('RECEIPT', 'Stock Receipt'),
+        ('DISPENSE', 'Dispensed'),
+        ('RETURN', 'Returned'),
+        ('ADJUSTMENT', 'Adjustment'),
+        ('WRITE_OFF', 'Write-off'),
+    ]
+    # The reasons a stock update form may give for each direction
+    ADD_REASONS = ('RECEIPT', 'RETURN', 'ADJUSTMENT')
+    REMOVE_REASONS = ('DISPENSE', 'WRITE_OFF', 'ADJUSTMENT')
+    
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='movements')
+    batch = models.ForeignKey(MedicineBatch, on_delete=models.SET_NULL, null=True, blank=True, related_name='movements')
+    delta = models.IntegerField()  # Positive adds stock, negative removes it
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_movements')
+    note = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.medicine.name} {self.delta:+d} ({self.get_reason_display()})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['medicine', '-created_at']),
+            models.Index(fields=['reason', 'created_at']),
+        ]
+
+
+class ReorderSuggestion(models.Model):
+    medicine = models.OneToOneField(Medicine, on_delete=models.CASCADE, related_name='reorder_suggestion')
+    daily_consumption = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    days_of_cover = models.DecimalField(max_digits=10, decimal_places=1, null=True, blank=True)  # Null when nothing was dispensed
+    current_stock = models.IntegerField(default=0)
+    on_order = models.IntegerField(default=0)  # Units on open purchase orders
+    suggested_quantity = models.IntegerField(default=0)  # Net of on_order
+    purchase_order = models.ForeignKey('suppliers.PurchaseOrder', on_delete=models.SET_NULL, null=True, blank=True,
+                                       related_name='reorder_suggestions')
+    generated_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"Reorder {self.suggested_quantity} x {self.medicine.name}"
+    
+    class Meta:
+        ordering = ['days_of_cover']
+        indexes = [
+            models.Index(fields=['days_of_cover']),
+        ]
+
+
+class ExpirySweep(models.Model):
+    run_at = models.DateTimeField(auto_now_add=True)
+    swept_through = models.DateField()  # Batches expiring before this date were written off
+    batches_written_off = models.IntegerField(default=0)
+    quantity_written_off = models.IntegerField(default=0)
+    value_lost = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # At batch cost price
+    
+    def __str__(self):
+        return f"Expiry sweep {self.run_at:%Y-%m-%d %H:%M} ({self.value_lost})"
+    
+    class Meta:
+        ordering = ['-run_at']
+
+
+class ExpiryBucket(models.Model):
+    BUCKET_CHOICES = [
+        (30, 'Within 30 days'),
+        (60, 'Within 60 days'),
+        (90, 'Within 90 days'),
+    ]
+    
+    # One row per in-stock batch expiring within 90 days, rebuilt by each sweep
+    medicine = models.ForeignKey(Medicine, on_delete=models.CASCADE, related_name='expiry_buckets')
+    batch = models.ForeignKey(MedicineBatch, on_delete=models.CASCADE, related_name='expiry_buckets')
+    days = models.IntegerField(choices=BUCKET_CHOICES)
+    expiry_date = models.DateField()
+    quantity = models.IntegerField()
+    value = models.DecimalField(max_digits=12, decimal_places=2)  # Quantity at cost price
+    computed_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.medicine.name} - Lot {self.batch.lot_number} ({self.get_days_display()})"
+    
+    class Meta:
+        ordering = ['expiry_date']
+        indexes = [
+            models.Index(fields=['days', 'expiry_date']),
+        ]
@@ -0,0 +1,107 @@
+# pharmacy/reorder.py
+"""
+Reorder suggestions driven by consumption velocity.
+
+Daily consumption is the quantity dispensed over a rolling window divided by
+the window length, computed for the whole catalogue with one aggregate query
+over StockMovement. A medicine needs reordering when its days of cover
+(stock / daily consumption) would run out before a new delivery arrives, or
+when stock is at or below its static reorder level. Units already on open
+purchase orders are netted off the suggested quantity. The result is
+materialized into ReorderSuggestion so pages read a small table instead of
+recomputing it per request.
+"""
+import math
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from suppliers.models import PurchaseOrderItem
+
+from .models import Medicine, ReorderSuggestion
+
+WINDOW_DAYS = 30
+LEAD_DAYS = 7
+TARGET_DAYS = 30
+
+OPEN_ORDER_STATUSES = ['PENDING', 'APPROVED']
+
+
+def consumption_rates(window_days=WINDOW_DAYS):
+    """
+    Yield (pk, name, stock, reorder level, units dispensed in the window)
+    for every medicine, in one query.
+    """
+    since = timezone.now() - timedelta(days=window_days)
+    return Medicine.objects.annotate(
+        dispensed=Coalesce(
+            Sum('movements__delta', filter=Q(movements__reason='DISPENSE', movements__created_at__gte=since)),
+            Value(0),
+        ),
+    ).order_by().values_list('pk', 'name', 'stock_quantity', 'reorder_level', 'dispensed')
+
+
+def open_orders_by_medicine():
+    """
+    Map medicine pk to [the open PurchaseOrder due soonest, units on all open
+    orders]. Items not yet linked to a medicine are matched by lower-cased
+    name instead.
+    """
+    by_medicine, by_name = {}, {}
+    items = PurchaseOrderItem.objects.filter(
+        purchase_order__status__in=OPEN_ORDER_STATUSES
+    ).order_by(
+        'purchase_order__expected_delivery', 'purchase_order__order_date'
+    ).values_list('medicine_id', 'item_name', 'purchase_order_id', 'quantity')
+    for medicine_id, item_name, order_id, quantity in items:
+        if medicine_id:
+            orders = by_medicine.setdefault(medicine_id, [order_id, 0])
+        else:
+            orders = by_name.setdefault(item_name.strip().lower(), [order_id, 0])
+        orders[1] += quantity
+    return by_medicine, by_name
+
+
+def generate_reorder_suggestions(window_days=WINDOW_DAYS, lead_days=LEAD_DAYS, target_days=TARGET_DAYS):
+    """
+    Rebuild the ReorderSuggestion table. Returns the number of suggestions.
+
+    ``lead_days`` is how long a delivery takes; medicines with less cover
+    than that are suggested. ``target_days`` is how much cover a reorder
+    should restore.
+    """
+    now = timezone.now()
+    orders_by_medicine, orders_by_name = open_orders_by_medicine()
+    suggestions = []
+
+    for pk, name, stock, reorder_level, dispensed in consumption_rates(window_days):
+        daily = Decimal(-dispensed) / window_days
+        days_of_cover = (Decimal(stock) / daily).quantize(Decimal('0.1')) if daily > 0 else None
+
+        running_out = days_of_cover is not None and days_of_cover < lead_days
+        if not running_out and stock > reorder_level:
+            continue
+
+        order_id, on_order = orders_by_medicine.get(pk) or orders_by_name.get(name.strip().lower()) or (None, 0)
+        target_stock = max(math.ceil(daily * (lead_days + target_days)), reorder_level)
+        suggestions.append(ReorderSuggestion(
+            medicine_id=pk,
+            daily_consumption=daily.quantize(Decimal('0.01')),
+            days_of_cover=days_of_cover,
+            current_stock=stock,
+            on_order=on_order,
+            # Nothing more to order when open orders already restore the target
+            suggested_quantity=max(target_stock - stock - on_order, 0 if on_order else 1),
+            purchase_order_id=order_id,
+            generated_at=now,
+        ))
+
+    with transaction.atomic():
+        ReorderSuggestion.objects.all().delete()
+        ReorderSuggestion.objects.bulk_create(suggestions, batch_size=500)
+
+    return len(suggestions)
@@ -0,0 +1,176 @@
+# pharmacy/stock.py
+"""
+Stock service for medicines.
+
+Stock is held in MedicineBatch lots; Medicine.stock_quantity is kept as the
+denormalized sum of its batches so list pages never have to aggregate, and
+Medicine.expiry_date tracks the earliest expiry still in stock.
+
+Every change starts with a single conditional UPDATE on the medicine row
+(``stock_quantity = stock_quantity + delta``, guarded by
+``stock_quantity >= -delta`` for removals). That row lock serializes
+concurrent changes to the same medicine, so batch allocation, batch updates
+and the StockMovement ledger rows written afterwards in the same transaction
+can never oversell or lose a receipt.
+
+Removals are allocated first-expiry-first-out: the in-date batches are read
+in one query ordered by expiry, and the allocated quantities are subtracted
+with one UPDATE ... CASE statement. Every change also rebuilds the
+medicine's ExpiryBucket rows (see pharmacy.expiry).
+"""
+from django.db import transaction
+from django.db.models import F, Case, When, Value, IntegerField, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from hospital_management.fragments import bump
+
+from .models import Medicine, MedicineBatch, StockMovement
+
+DEFAULT_LOT = 'UNSPECIFIED'
+
+
+class InsufficientStock(Exception):
+    """Raised when a removal would take stock below zero."""
+
+
+def _apply_to_medicine(medicine, delta):
+    rows = Medicine.objects.filter(pk=medicine.pk)
+    if delta < 0:
+        rows = rows.filter(stock_quantity__gte=-delta)
+    if not rows.update(stock_quantity=F('stock_quantity') + delta, updated_at=timezone.now()):
+        raise InsufficientStock(f'Insufficient stock for {medicine.name}')
+    transaction.on_commit(lambda: bump('pharmacy.Medicine'))  # A bulk UPDATE sends no post_save
+
+
+def _refresh_expiry(medicine):
+    """Point Medicine.expiry_date at the earliest batch still holding stock"""
+    earliest = MedicineBatch.objects.filter(
+        medicine=medicine, quantity__gt=0
+    ).aggregate(earliest=Min('expiry_date'))['earliest']
+    if earliest:
+        Medicine.objects.filter(pk=medicine.pk).update(expiry_date=earliest)
+
+
+def refresh_expiry_dates(medicine_ids):
+    """Bulk version of _refresh_expiry: one UPDATE for all the given medicines"""
+    earliest = MedicineBatch.objects.filter(
+        medicine=OuterRef('pk'), quantity__gt=0
+    ).order_by().values('medicine').annotate(earliest=Min('expiry_date')).values('earliest')
+    Medicine.objects.filter(pk__in=medicine_ids).update(
+        expiry_date=Coalesce(Subquery(earliest), F('expiry_date'))
+    )
+    # Every bulk stock change (receiving, expiry sweeps) ends here
+    transaction.on_commit(lambda: bump('pharmacy.Medicine'))
+
+
+def _user_or_none(user):
+    return user if user is not None and user.is_authenticated else None
+
+
+def _add_stock(medicine, quantity, reason, user, note, lot_number, expiry_date, cost_price):
+    _apply_to_medicine(medicine, quantity)
+
+    batch, created = MedicineBatch.objects.get_or_create(
+        medicine=medicine,
+        lot_number=lot_number or DEFAULT_LOT,
+        expiry_date=expiry_date or medicine.expiry_date,
+        defaults={'cost_price': medicine.purchase_price if cost_price is None else cost_price},
+    )
+    MedicineBatch.objects.filter(pk=batch.pk).update(quantity=F('quantity') + quantity)
+
+    return [StockMovement.objects.create(
+        medicine=medicine,
+        batch=batch,
+        delta=quantity,
+        reason=reason,
+        user=_user_or_none(user),
+        note=note[:255],
+    )]
+
+
+def allocate_fefo(medicine, quantity, include_expired=False):
+    """
+    Plan a removal of ``quantity`` across batches, earliest expiry first.
+
+    Returns a list of (batch pk, quantity taken). Expired batches are skipped
+    unless ``include_expired`` is set. Raises InsufficientStock when the
+    usable batches cannot cover the quantity.
+    """
+    batches = MedicineBatch.objects.filter(medicine=medicine, quantity__gt=0)
+    if not include_expired:
+        batches = batches.filter(expiry_date__gte=timezone.now().date())
+    batches = batches.select_for_update().order_by('expiry_date', 'pk').values_list('pk', 'quantity')
+
+    allocations = []
+    remaining = quantity
+    for pk, available in batches:
+        take = min(available, remaining)
+        allocations.append((pk, take))
+        remaining -= take
+        if not remaining:
+            break
+
+    if remaining:
+        raise InsufficientStock(f'Only {quantity - remaining} {medicine.unit} of {medicine.name} available in date')
+    return allocations
+
+
+def _remove_stock(medicine, quantity, reason, user, note, include_expired):
+    _apply_to_medicine(medicine, -quantity)
+
+    allocations = allocate_fefo(medicine, quantity, include_expired=include_expired)
+    MedicineBatch.objects.filter(pk__in=[pk for pk, _ in allocations]).update(
+        quantity=F('quantity') - Case(
+            *[When(pk=pk, then=Value(take)) for pk, take in allocations],
+            output_field=IntegerField(),
+        )
+    )
+
+    user = _user_or_none(user)
+    return StockMovement.objects.bulk_create([
+        StockMovement(
+            medicine=medicine,
+            batch_id=pk,
+            delta=-take,
+            reason=reason,
+            user=user,
+            note=note[:255],
+        )
+        for pk, take in allocations
+    ])
+
+
+def adjust_stock(medicine, delta, reason, user=None, note='', lot_number=None,
+                 expiry_date=None, cost_price=None, include_expired=False):
+    """
+    Apply ``delta`` to a medicine's stock and record the movements.
+
+    Additions go into the batch for the given lot and expiry date (created on
+    first receipt); removals are taken first-expiry-first-out. Returns the StockMovement rows written.
+    """
+    if delta == 0:
+        raise ValueError('Stock change must not be zero')
+
+    from .expiry import rebuild_expiry_buckets  # expiry builds on this module
+
+    with transaction.atomic():
+        if delta > 0:
+            movements = _add_stock(medicine, delta, reason, user, note, lot_number, expiry_date, cost_price)
+        else:
+            movements = _remove_stock(medicine, -delta, reason, user, note, include_expired)
+        _refresh_expiry(medicine)
+        rebuild_expiry_buckets(medicine_ids=[medicine.pk])
+
+    medicine.refresh_from_db(fields=['stock_quantity', 'expiry_date', 'updated_at'])
+    return movements
+
+
+def receive_stock(medicine, quantity, user=None, note='', reason='RECEIPT',
+                  lot_number=None, expiry_date=None, cost_price=None):
+    return adjust_stock(medicine, abs(quantity), reason, user=user, note=note,
+                        lot_number=lot_number, expiry_date=expiry_date, cost_price=cost_price)
+
+
+def dispense_stock(medicine, quantity, user=None, note='', reason='DISPENSE'):
+    return adjust_stock(medicine, -abs(quantity), reason, user=user, note=note)
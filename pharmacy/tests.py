@@ -1,3 +1,223 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from suppliers.models import PurchaseOrder, PurchaseOrderItem, Supplier
+
+from .expiry import rebuild_expiry_buckets, sweep_expired
+from .models import ExpiryBucket, ExpirySweep, Medicine, MedicineBatch, ReorderSuggestion, StockMovement
+from .reorder import generate_reorder_suggestions
+from .stock import DEFAULT_LOT, InsufficientStock, allocate_fefo, dispense_stock, receive_stock
+
+
+class MedicineStockViewTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.medicine = Medicine.objects.create(
+            medicine_id='MED001', name='Paracetamol', category='Analgesic', manufacturer='Square',
+            unit='Strip', expiry_date=date(2030, 1, 1), purchase_price=10, selling_price=12,
+        )
+        receive_stock(self.medicine, 20, lot_number='L1', expiry_date=date(2030, 6, 1))
+
+    def test_update_leaves_expiry_to_the_batches(self):
+        self.client.post(reverse('pharmacy:medicine_update', args=[self.medicine.pk]), {
+            'name': 'Paracetamol 500', 'category': 'Analgesic', 'manufacturer': 'Square', 'unit': 'Strip',
+            'stock_quantity': 25, 'expiry_date': '2040-01-01', 'purchase_price': 10, 'selling_price': 12,
+        })
+        self.medicine.refresh_from_db()
+        self.assertEqual(self.medicine.name, 'Paracetamol 500')
+        self.assertEqual(self.medicine.stock_quantity, 25)
+        self.assertEqual(self.medicine.expiry_date, date(2030, 6, 1))
+
+    def test_removal_cannot_be_recorded_as_a_receipt(self):
+        url = reverse('pharmacy:update_stock', args=[self.medicine.pk])
+        self.client.post(url, {'action': 'remove', 'quantity': 5, 'reason': 'RECEIPT'})
+        self.client.post(url, {'action': 'remove', 'quantity': 3, 'reason': 'WRITE_OFF'})
+        self.medicine.refresh_from_db()
+        self.assertEqual(self.medicine.stock_quantity, 17)
+        self.assertEqual(list(self.medicine.movements.filter(delta__lt=0).values_list('reason', flat=True)),
+                         ['WRITE_OFF'])
+        self.assertFalse(StockMovement.objects.filter(reason='RECEIPT', delta__lt=0).exists())
+
+
+class StockBatchTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.medicine = Medicine.objects.create(
+            medicine_id='MED001', name='Amoxicillin', category='Antibiotic', manufacturer='Beximco',
+            unit='Strip', expiry_date=self.today + timedelta(days=365), purchase_price=5, selling_price=8,
+        )
+
+    def expires_in(self, days):
+        return self.today + timedelta(days=days)
+
+    def test_receipts_without_a_lot_keep_their_expiry_dates(self):
+        receive_stock(self.medicine, 10, expiry_date=self.expires_in(200))
+        receive_stock(self.medicine, 5, expiry_date=self.expires_in(60))
+        receive_stock(self.medicine, 3, expiry_date=self.expires_in(200))
+        batches = self.medicine.batches.order_by('expiry_date').values_list('lot_number', 'expiry_date', 'quantity')
+        self.assertEqual(list(batches), [
+            (DEFAULT_LOT, self.expires_in(60), 5),
+            (DEFAULT_LOT, self.expires_in(200), 13),
+        ])
+        self.assertEqual(self.medicine.expiry_date, self.expires_in(60))
+
+    def test_removals_take_the_earliest_expiring_batches_first(self):
+        receive_stock(self.medicine, 10, lot_number='LATE', expiry_date=self.expires_in(300))
+        receive_stock(self.medicine, 4, lot_number='SOON', expiry_date=self.expires_in(30))
+        receive_stock(self.medicine, 6, expiry_date=self.expires_in(90))
+        MedicineBatch.objects.create(medicine=self.medicine, lot_number='OLD', quantity=50,
+                                     expiry_date=self.expires_in(-1))
+
+        dispense_stock(self.medicine, 12)
+        remaining = dict(self.medicine.batches.values_list('lot_number', 'quantity'))
+        self.assertEqual(remaining, {'SOON': 0, DEFAULT_LOT: 0, 'LATE': 8, 'OLD': 50})
+        self.assertEqual(self.medicine.stock_quantity, 8)
+        self.assertEqual(self.medicine.expiry_date, self.expires_in(-1))  # Expired stock is still on the shelf
+
+        with self.assertRaises(InsufficientStock):
+            allocate_fefo(self.medicine, 9)
+
+
+class ReorderSuggestionTests(TestCase):
+
+    def make_medicine(self, name, stock, reorder_level=10):
+        return Medicine.objects.create(
+            medicine_id=f'MED{Medicine.objects.count() + 1:03d}', name=name, category='Analgesic',
+            manufacturer='Square', unit='Strip', expiry_date=date(2030, 1, 1), purchase_price=1, selling_price=2,
+            stock_quantity=stock, reorder_level=reorder_level,
+        )
+
+    def dispensed(self, medicine, quantity, days_ago=1):
+        movement = StockMovement.objects.create(medicine=medicine, delta=-quantity, reason='DISPENSE')
+        StockMovement.objects.filter(pk=movement.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def order(self, item_name, quantity, medicine=None):
+        supplier, _ = Supplier.objects.get_or_create(
+            supplier_id='SUP001', defaults={'company_name': 'Square', 'contact_person': 'Rahim', 'category': 'MEDICINE',
+                                            'email': 'sales@example.com', 'phone': '01700000000', 'address': 'Dhaka'},
+        )
+        order = PurchaseOrder.objects.create(order_number=f'PO-{PurchaseOrder.objects.count() + 1}',
+                                             supplier=supplier, order_date=date(2025, 1, 1))
+        PurchaseOrderItem.objects.create(purchase_order=order, medicine=medicine, item_name=item_name,
+                                         quantity=quantity, unit_price=1, total_price=quantity)
+        return order
+
+    def test_velocity_sets_cover_and_quantity(self):
+        fast = self.make_medicine('Napa', stock=100)
+        steady = self.make_medicine('Seclo', stock=100)
+        self.dispensed(fast, 450)  # 15 a day over the 30-day window: under 7 days of cover
+        self.dispensed(fast, 1000, days_ago=40)  # Outside the window
+        self.dispensed(steady, 60)  # 2 a day: 50 days of cover
+
+        self.assertEqual(generate_reorder_suggestions(), 1)
+        suggestion = ReorderSuggestion.objects.get()
+        self.assertEqual(suggestion.medicine, fast)
+        self.assertEqual((suggestion.daily_consumption, suggestion.days_of_cover), (15, Decimal('6.7')))
+        self.assertEqual(suggestion.suggested_quantity, 15 * (7 + 30) - 100)
+
+    def test_open_orders_are_netted_off(self):
+        linked = self.make_medicine('Napa', stock=5)
+        by_name = self.make_medicine('Seclo 20mg', stock=5)
+        covered = self.make_medicine('Fexo', stock=5)
+        first = self.order('Napa', 2, medicine=linked)
+        self.order('Napa', 1, medicine=linked)
+        self.order(' seclo 20MG ', 3)
+        self.order('Fexo', 50, medicine=covered)
+        self.order('Ace', 100)  # Unrelated
+
+        generate_reorder_suggestions()
+        suggestions = {s.medicine_id: s for s in ReorderSuggestion.objects.all()}
+        self.assertEqual((suggestions[linked.pk].on_order, suggestions[linked.pk].suggested_quantity), (3, 2))
+        self.assertEqual(suggestions[linked.pk].purchase_order, first)
+        self.assertEqual((suggestions[by_name.pk].on_order, suggestions[by_name.pk].suggested_quantity), (3, 2))
+        self.assertEqual(suggestions[covered.pk].suggested_quantity, 0)
+
+    def test_reorder_level_alone_triggers_a_suggestion(self):
+        idle = self.make_medicine('Napa', stock=4, reorder_level=10)
+        self.make_medicine('Seclo', stock=11, reorder_level=10)
+        generate_reorder_suggestions()
+        suggestion = ReorderSuggestion.objects.get()
+        self.assertEqual((suggestion.medicine, suggestion.days_of_cover, suggestion.suggested_quantity), (idle, None, 6))
+
+    def test_medicine_list_shows_low_stock_before_suggestions_are_generated(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        low = self.make_medicine('Napa', stock=3)
+        self.make_medicine('Seclo', stock=50)
+        response = self.client.get(reverse('pharmacy:medicine_list'))
+        self.assertEqual(response.context['low_stock_count'], 1)
+        self.assertEqual(list(response.context['low_stock_medicines']), [low])
+        response = self.client.get(reverse('pharmacy:medicine_list'), {'stock': 'low'})
+        self.assertEqual(list(response.context['medicines']), [low])
+
+        generate_reorder_suggestions()
+        response = self.client.get(reverse('pharmacy:medicine_list'))
+        self.assertEqual(response.context['low_stock_medicines'][0].suggested_quantity, 7)
+
+
+class ExpiryTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.napa = self.make_medicine('Napa')
+        self.seclo = self.make_medicine('Seclo')
+
+    def make_medicine(self, name):
+        return Medicine.objects.create(
+            medicine_id=f'MED-{name}', name=name, category='Analgesic', manufacturer='Square', unit='Strip',
+            expiry_date=date(2030, 1, 1), purchase_price=1, selling_price=2,
+        )
+
+    def receive(self, medicine, quantity, days, cost_price=Decimal('2.50')):
+        receive_stock(medicine, quantity, lot_number=f'D{days}', expiry_date=self.today + timedelta(days=days),
+                      cost_price=cost_price)
+
+    def test_sweep_writes_off_expired_stock_in_bulk(self):
+        self.receive(self.napa, 10, -5)
+        self.receive(self.napa, 4, -1, cost_price=Decimal('1.00'))
+        self.receive(self.napa, 7, 20)
+        self.receive(self.seclo, 3, -30)
+        self.receive(self.seclo, 2, 0)  # Expires today, still saleable
+
+        with CaptureQueriesContext(connection) as queries:
+            sweep = sweep_expired(self.today)
+        stock_updates = [query['sql'] for query in queries.captured_queries
+                         if query['sql'].startswith('UPDATE "pharmacy_medicine" SET "stock_quantity"')]
+        self.assertEqual(len(stock_updates), 1)
+        self.assertIn('CASE', stock_updates[0])
+
+        self.assertEqual((sweep.batches_written_off, sweep.quantity_written_off, sweep.value_lost),
+                         (3, 17, Decimal('36.50')))
+        self.napa.refresh_from_db()
+        self.seclo.refresh_from_db()
+        self.assertEqual((self.napa.stock_quantity, self.seclo.stock_quantity), (7, 2))
+        self.assertEqual(self.napa.expiry_date, self.today + timedelta(days=20))
+        self.assertEqual(sorted(StockMovement.objects.filter(reason='WRITE_OFF').values_list('delta', flat=True)),
+                         [-10, -4, -3])
+        self.assertEqual(sweep_expired(self.today).batches_written_off, 0)
+        self.assertEqual(ExpirySweep.objects.count(), 2)
+
+    def test_buckets_do_not_overlap(self):
+        for days in (0, 30, 31, 60, 61, 90, 91):
+            self.receive(self.napa, 1, days)
+        self.assertEqual(rebuild_expiry_buckets(self.today), 6)
+        buckets = dict(ExpiryBucket.objects.values_list('batch__lot_number', 'days'))
+        self.assertEqual(buckets, {'D0': 30, 'D30': 30, 'D31': 60, 'D60': 60, 'D61': 90, 'D90': 90})
+
+    def test_dispensing_keeps_the_buckets_current(self):
+        self.receive(self.napa, 5, 10)
+        self.receive(self.napa, 5, 45)
+        rebuild_expiry_buckets(self.today)
 
-# Create your tests here.
+        dispense_stock(self.napa, 7)
+        self.assertEqual(list(ExpiryBucket.objects.values_list('days', 'quantity')), [(60, 3)])
+        self.receive(self.seclo, 4, 15)
+        self.assertEqual(ExpiryBucket.objects.get(medicine=self.seclo).quantity, 4)
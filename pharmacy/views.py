@@ -1,8 +1,10 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import transaction
 from django.db.models import Q, F
-from .models import Medicine
+from .models import Medicine, StockMovement
+from .stock import adjust_stock, receive_stock, dispense_stock, InsufficientStock
 
 @login_required
 def medicine_list(request):
@@ -19,24 +21,55 @@ def medicine_list(request):
             Q(manufacturer__icontains=search_query)
         )
     
-    # Low stock medicines
+    # Low stock medicines, live; the reorder suggestions (refreshed by the
+    # generate_reorder_suggestions command) only add quantities and cover
     low_stock = medicines.filter(stock_quantity__lte=F('reorder_level'))
+    stock_filter = request.GET.get('stock', '')
+    if stock_filter == 'low':
+        medicines = low_stock
+    elif stock_filter == 'out':
+        medicines = medicines.filter(stock_quantity__lte=0)
+    
+    low_stock_medicines = low_stock.annotate(
+        daily_consumption=F('reorder_suggestion__daily_consumption'),
+        days_of_cover=F('reorder_suggestion__days_of_cover'),
+        on_order=F('reorder_suggestion__on_order'),
+        suggested_quantity=F('reorder_suggestion__suggested_quantity'),
+        purchase_order_number=F('reorder_suggestion__purchase_order__order_number'),
+        suggested_at=F('reorder_suggestion__generated_at'),
+    ).order_by(F('days_of_cover').asc(nulls_last=True), 'stock_quantity')
     
     context = {
         'medicines': medicines,
         'search_query': search_query,
+        'stock_filter': stock_filter,
         'total_medicines': Medicine.objects.count(),
         'low_stock_count': low_stock.count(),
-        'low_stock_medicines': low_stock[:5],
+        'low_stock_medicines': low_stock_medicines[:5],
     }
     return render(request, 'pharmacy/medicine_list.html', context)
 
 
+def _reason_choices(reasons):
+    labels = dict(StockMovement.REASON_CHOICES)
+    return [(reason, labels[reason]) for reason in reasons]
+
+
 @login_required
 def medicine_detail(request, pk):
     """Display detailed view of a medicine"""
     medicine = get_object_or_404(Medicine, pk=pk)
-    return render(request, 'pharmacy/medicine_detail.html', {'medicine': medicine})
+    movements = medicine.movements.select_related('user', 'batch')[:20]
+    batches = medicine.batches.filter(quantity__gt=0).order_by('expiry_date')
+    
+    context = {
+        'medicine': medicine,
+        'movements': movements,
+        'batches': batches,
+        'add_reasons': _reason_choices(StockMovement.ADD_REASONS),
+        'remove_reasons': _reason_choices(StockMovement.REMOVE_REASONS),
+    }
+    return render(request, 'pharmacy/medicine_detail.html', context)
 
 
 @login_required
@@ -88,7 +121,6 @@ def medicine_create(request):
                 category=category,
                 manufacturer=manufacturer,
                 description=description,
-                stock_quantity=stock_quantity,
                 unit=unit,
                 expiry_date=expiry_date,
                 purchase_price=purchase_price,
@@ -96,6 +128,10 @@ def medicine_create(request):
                 reorder_level=reorder_level
             )
             
+            # Opening stock goes through the ledger like any other movement
+            if stock_quantity > 0:
+                receive_stock(medicine, stock_quantity, user=request.user, reason='OPENING')
+            
             messages.success(request, f'Medicine "{medicine.name}" added successfully!')
             return redirect('pharmacy:medicine_detail', pk=medicine.pk)
             
@@ -131,13 +167,12 @@ def medicine_update(request, pk):
             description = request.POST.get('description', '').strip()
             stock_quantity = int(request.POST.get('stock_quantity', 0))
             unit = request.POST.get('unit', '').strip()
-            expiry_date = request.POST.get('expiry_date')
             purchase_price = float(request.POST.get('purchase_price', 0))
             selling_price = float(request.POST.get('selling_price', 0))
             reorder_level = int(request.POST.get('reorder_level', 10))
             
             # Validate required fields
-            if not all([name, category, manufacturer, unit, expiry_date]):
+            if not all([name, category, manufacturer, unit]):
                 messages.error(request, 'All required fields must be filled!')
                 return render(request, 'pharmacy/medicine_form.html', {
                     'medicine': medicine,
@@ -149,14 +184,22 @@ def medicine_update(request, pk):
             medicine.category = category
             medicine.manufacturer = manufacturer
             medicine.description = description
-            medicine.stock_quantity = stock_quantity
             medicine.unit = unit
-            medicine.expiry_date = expiry_date
             medicine.purchase_price = purchase_price
             medicine.selling_price = selling_price
             medicine.reorder_level = reorder_level
             
-            medicine.save()
+            # Stock and expiry are never overwritten from the form: a changed
+            # quantity is recorded as an adjustment against the current stock,
+            # and the expiry date follows the earliest batch
+            with transaction.atomic():
+                medicine.save(update_fields=[
+                    'name', 'category', 'manufacturer', 'description', 'unit',
+                    'purchase_price', 'selling_price', 'reorder_level', 'updated_at',
+                ])
+                stock_change = stock_quantity - medicine.stock_quantity
+                if stock_change:
+                    adjust_stock(medicine, stock_change, 'ADJUSTMENT', user=request.user, note='Edited on medicine form')
             
             messages.success(request, f'Medicine "{medicine.name}" updated successfully!')
             return redirect('pharmacy:medicine_detail', pk=medicine.pk)
@@ -202,18 +245,27 @@ def update_stock(request, pk):
                 messages.error(request, 'Quantity must be greater than zero!')
                 return redirect('pharmacy:medicine_detail', pk=pk)
             
+            reason = request.POST.get('reason', '')
+            allowed = StockMovement.ADD_REASONS if action == 'add' else StockMovement.REMOVE_REASONS
+            if reason and reason not in allowed:
+                messages.error(request, 'That reason does not apply to this stock update!')
+                return redirect('pharmacy:medicine_detail', pk=pk)
+            note = request.POST.get('note', '').strip()
+            
             if action == 'add':
-                medicine.stock_quantity += quantity
+                receive_stock(
+                    medicine, quantity, user=request.user, note=note, reason=reason or 'RECEIPT',
+                    lot_number=request.POST.get('lot_number', '').strip() or None,
+                    expiry_date=request.POST.get('batch_expiry_date') or None,
+                    cost_price=request.POST.get('cost_price') or None,
+                )
                 messages.success(request, f'Added {quantity} {medicine.unit} to stock!')
             elif action == 'remove':
-                if medicine.stock_quantity < quantity:
-                    messages.error(request, 'Insufficient stock quantity!')
-                    return redirect('pharmacy:medicine_detail', pk=pk)
-                medicine.stock_quantity -= quantity
+                dispense_stock(medicine, quantity, user=request.user, note=note, reason=reason or 'DISPENSE')
                 messages.success(request, f'Removed {quantity} {medicine.unit} from stock!')
             
-            medicine.save()
-            
+        except InsufficientStock:
+            messages.error(request, 'Insufficient stock quantity!')
         except ValueError:
             messages.error(request, 'Invalid quantity!')
         except Exception as e:
@@ -0,0 +1,84 @@
+# reports/conditional.py
+"""
+Conditional GET for report pages.
+
+A report declares the rows it is built from as a ReportSource: querysets
+with the timestamp field that changes whenever a row does (``updated_at``
+for most models). One aggregate per queryset gives the newest timestamp
+and the row count; together they make the ETag, so edits, inserts and
+deletes all change it, and the newest timestamp is the Last-Modified date.
+A browser revalidating an unchanged report gets a 304 after those
+aggregates, without the report being computed or rendered.
+
+Reports that end before today are historical: their rows rarely change, so
+they are sent with ``Cache-Control: private, max-age=REPORT_HISTORY_MAX_AGE``
+and the browser does not ask again for that long. Current reports get
+``private, no-cache`` and are revalidated on every view.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+DEFAULT_HISTORY_MAX_AGE = 60 * 60 * 24
+
+
+class ReportSource:
+    """The (queryset, timestamp field) pairs a report reads, and the last day it covers."""
+
+    def __init__(self, sources, through=None):
+        self.sources = sources
+        self.through = through
+
+    @property
+    def historical(self):
+        return self.through is not None and self.through < timezone.localdate()
+
+    def fingerprint(self):
+        """(ETag value, Last-Modified) over every source."""
+        parts, newest = [], None
+        for queryset, field in self.sources:
+            row = queryset.order_by().aggregate(newest=Max(field), rows=Count('pk'))
+            parts.append(f"{row['rows']}@{row['newest'].isoformat() if row['newest'] else '-'}")
+            if row['newest'] and (newest is None or row['newest'] > newest):
+                newest = row['newest']
+        return hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest(), newest
+
+
+def conditional_report(source):
+    """
+    Answer conditional GETs for a report view. ``source(request, *args,
+    **kwargs)`` returns the view's ReportSource.
+    """
+    def decorator(view):
+        def fingerprint(request, *args, **kwargs):
+            if not hasattr(request, '_report_fingerprint'):
+                request._report_source = source(request, *args, **kwargs)
+                request._report_fingerprint = request._report_source.fingerprint()
+            return request._report_fingerprint
+
+        def etag(request, *args, **kwargs):
+            # The page header shows the signed-in user, so their copies are not interchangeable
+            return f'{request.user.pk}-{fingerprint(request, *args, **kwargs)[0]}'
+
+        def last_modified(request, *args, **kwargs):
+            return fingerprint(request, *args, **kwargs)[1]
+
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD') and response.status_code in (200, 304):
+                if request._report_source.historical:
+                    max_age = getattr(settings, 'REPORT_HISTORY_MAX_AGE', DEFAULT_HISTORY_MAX_AGE)
+                    patch_cache_control(response, private=True, max_age=max_age)
+                else:
+                    patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
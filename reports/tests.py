@@ -1,3 +1,42 @@
+from datetime import date, time
+
 from django.test import TestCase
+from django.urls import reverse
+
+from appointments.models import Appointment
+from hospital_management.testing import REQUEST_QUERIES, SampleDataMixin
+
+
+class ConditionalReportTests(SampleDataMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patient, self.doctor = self.make_patient(), self.make_doctor()
+        self.url = reverse('reports:daily_appointments_report') + '?date=2024-01-10'
+
+    def book(self, appointment_id):
+        return Appointment.objects.create(
+            appointment_id=appointment_id, patient=self.patient, doctor=self.doctor,
+            appointment_date=date(2024, 1, 10), appointment_time=time(10, 30),
+            appointment_type='Consultation', symptoms='Fever',
+        )
+
+    def test_unchanged_report_is_not_modified(self):
+        self.book('APT000001')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=86400', response['Cache-Control'])
+
+        with self.assertNumQueries(REQUEST_QUERIES + 1):  # One aggregate for the fingerprint
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_row_changes_etag(self):
+        self.book('APT000001')
+        etag = self.client.get(self.url)['ETag']
+        self.book('APT000002')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
 
-# Create your tests here.
+    def test_current_report_is_revalidated(self):
+        response = self.client.get(reverse('reports:daily_appointments_report'))
+        self.assertIn('no-cache', response['Cache-Control'])
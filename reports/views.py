@@ -3,43 +3,87 @@ from django.contrib.auth.decorators import login_required
 from django.db.models import Sum, Count, Q, F
 from django.http import HttpResponse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, time, timedelta
 from patients.models import Patient
 from appointments.models import Appointment
 from billing.models import Bill
-from pharmacy.models import Medicine
+from pharmacy.models import Medicine, ExpirySweep, ExpiryBucket
+from asgiref.sync import sync_to_async
+from hospital_management.streaming import stream_csv
+from hospital_management.widgets import Widget, async_login_required, load_widgets
+from .conditional import ReportSource, conditional_report
 
-@login_required
-def reports_home(request):
+
+def _report_date(request):
+    """The ?date= of a daily report, today by default"""
+    date_str = request.GET.get('date')
+    if date_str:
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
+    return timezone.localdate()
+
+
+def _report_range(request):
+    """The ?start_date=&end_date= of a range report, the current month so far by default"""
+    start_date_str = request.GET.get('start_date')
+    end_date_str = request.GET.get('end_date')
+    if start_date_str and end_date_str:
+        return (datetime.strptime(start_date_str, '%Y-%m-%d').date(),
+                datetime.strptime(end_date_str, '%Y-%m-%d').date())
+    today = timezone.localdate()
+    return today.replace(day=1), today
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _daily_appointments_source(request):
+    report_date = _report_date(request)
+    return ReportSource([(Appointment.objects.filter(appointment_date=report_date), 'updated_at')], through=report_date)
+
+
+def _daily_billing_source(request):
+    report_date = _report_date(request)
+    day_start, day_end = _day_bounds(report_date)
+    bills = Bill.objects.filter(created_at__gte=day_start, created_at__lt=day_end)
+    return ReportSource([(bills, 'updated_at')], through=report_date)
+
+
+def _medicine_stock_source(request):
+    return ReportSource([(Medicine.objects.all(), 'updated_at'), (ExpirySweep.objects.all(), 'run_at')])
+
+
+def _doctor_appointments_source(request):
+    from doctors.models import Doctor
+    start_date, end_date = _report_range(request)
+    appointments = Appointment.objects.filter(appointment_date__gte=start_date, appointment_date__lte=end_date)
+    return ReportSource([(appointments, 'updated_at'), (Doctor.objects.all(), 'updated_at')], through=end_date)
+
+
+@async_login_required
+async def reports_home(request):
     """Reports dashboard with overview statistics"""
-    total_appointments = Appointment.objects.count()
-    total_revenue = Bill.objects.filter(status='PAID').aggregate(
-        total=Sum('total_amount')
-    )['total'] or 0
-    total_patients = Patient.objects.count()
-    medicines_in_stock = Medicine.objects.filter(stock_quantity__gt=0).count()
-    
-    context = {
-        'total_appointments': total_appointments,
-        'total_revenue': total_revenue,
-        'total_patients': total_patients,
-        'medicines_in_stock': medicines_in_stock,
-    }
-    return render(request, 'reports/reports_home.html', context)
+    # Must match the {% versioned_cache %} summary cards in reports_home.html
+    summary = Widget('reports-summary', ['appointments.Appointment', 'billing.Bill', 'patients.Patient', 'pharmacy.Medicine'], {
+        'total_appointments': Appointment.objects.count,
+        'total_revenue': lambda: Bill.objects.filter(status='PAID').aggregate(
+            total=Sum('total_amount')
+        )['total'] or 0,
+        'total_patients': Patient.objects.count,
+        'medicines_in_stock': Medicine.objects.filter(stock_quantity__gt=0).count,
+    })
+    context = await load_widgets([summary])
+    return await sync_to_async(render)(request, 'reports/reports_home.html', context)
 
 
 @login_required
+@conditional_report(_daily_appointments_source)
 def daily_appointments_report(request):
     """Daily appointments report"""
     from doctors.models import Doctor
     
-    # Get date from request or use today
-    date_str = request.GET.get('date')
-    if date_str:
-        from datetime import datetime
-        report_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-    else:
-        report_date = timezone.now().date()
+    report_date = _report_date(request)
     
     # Get appointments for the selected date
     appointments = Appointment.objects.filter(
@@ -85,19 +129,15 @@ def daily_appointments_report(request):
 
 
 @login_required
+@conditional_report(_daily_billing_source)
 def daily_billing_report(request):
     """Daily billing report with real data"""
-    # Get date from request or use today
-    date_str = request.GET.get('date')
-    if date_str:
-        from datetime import datetime
-        report_date = datetime.strptime(date_str, '%Y-%m-d').date()
-    else:
-        report_date = timezone.now().date()
+    report_date = _report_date(request)
     
-    # Get today's bills
+    # Get the day's bills; a range on created_at can use its index, created_at__date cannot
+    day_start, day_end = _day_bounds(report_date)
     bills = Bill.objects.filter(
-        created_at__date=report_date
+        created_at__gte=day_start, created_at__lt=day_end
     ).select_related('patient__user').order_by('-created_at')
     
     # Calculate statistics
@@ -138,6 +178,7 @@ def daily_billing_report(request):
 
 
 @login_required
+@conditional_report(_medicine_stock_source)
 def medicine_stock_report(request):
     """Medicine stock report with real data"""
     
@@ -179,12 +220,13 @@ def medicine_stock_report(request):
         Q(stock_quantity=0) | Q(stock_quantity__lte=10)
     ).order_by('stock_quantity')
     
-    # Expiring soon (within 30 days)
-    thirty_days_from_now = timezone.now().date() + timedelta(days=30)
-    expiring_medicines = medicines.filter(
-        expiry_date__lte=thirty_days_from_now,
-        expiry_date__gte=timezone.now().date()
-    ).order_by('expiry_date')
+    # Expiring soon, precomputed by the sweep_expired_stock command and kept current by stock changes
+    expiring_medicines = ExpiryBucket.objects.filter(days=30).select_related('medicine', 'batch')
+    expiry_buckets = {
+        row['days']: row
+        for row in ExpiryBucket.objects.values('days').annotate(quantity=Sum('quantity'), value=Sum('value'))
+    }
+    last_sweep = ExpirySweep.objects.first()
     
     # All medicines for complete inventory
     all_medicines = medicines.order_by('name')
@@ -213,6 +255,8 @@ def medicine_stock_report(request):
         # Lists
         'critical_medicines': critical_medicines[:10],  # Top 10 critical
         'expiring_medicines': expiring_medicines[:10],  # Top 10 expiring
+        'expiry_buckets': [expiry_buckets.get(days, {'days': days, 'quantity': 0, 'value': 0}) for days in (30, 60, 90)],
+        'last_sweep': last_sweep,
         'all_medicines': all_medicines,
     }
     
@@ -220,23 +264,12 @@ def medicine_stock_report(request):
 
 
 @login_required
+@conditional_report(_doctor_appointments_source)
 def doctor_appointments_report(request):
     """Doctor appointments report with real data"""
     from doctors.models import Doctor
     
-    # Get date range from request
-    start_date_str = request.GET.get('start_date')
-    end_date_str = request.GET.get('end_date')
-    
-    if start_date_str and end_date_str:
-        from datetime import datetime
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-    else:
-        # Default to current month
-        today = timezone.now().date()
-        start_date = today.replace(day=1)
-        end_date = today
+    start_date, end_date = _report_range(request)
     
     # Get all doctors with appointment counts
     doctors = Doctor.objects.all().select_related('user')
@@ -629,31 +662,27 @@ def export_report_excel(request, report_type):
 
 @login_required
 def export_report_csv(request, report_type):
-    """Export report as CSV"""
-    import csv
-    
+    """Export report as CSV, streamed so large tables are never held in memory"""
+    if report_type == 'medicine_stock':
+        header = ['ID', 'Name', 'Category', 'Manufacturer', 'Stock',
+                  'Purchase Price', 'Selling Price', 'Expiry', 'Status']
+        return stream_csv(request, f'{report_type}_report.csv', header,
+                          Medicine.objects.order_by('pk'), _medicine_stock_row)
+
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="{report_type}_report.csv"'
-    
-    writer = csv.writer(response)
-    
-    # Add headers and data based on report type
-    if report_type == 'medicine_stock':
-        medicines = Medicine.objects.all()
-        writer.writerow(['ID', 'Name', 'Category', 'Manufacturer', 'Stock', 
-                        'Purchase Price', 'Selling Price', 'Expiry', 'Status'])
-        
-        for medicine in medicines:
-            writer.writerow([
-                medicine.medicine_id,
-                medicine.name,
-                medicine.category,
-                medicine.manufacturer or 'N/A',
-                medicine.stock_quantity,
-                float(medicine.purchase_price) if medicine.purchase_price else 0,
-                float(medicine.selling_price) if medicine.selling_price else 0,
-                medicine.expiry_date.strftime('%Y-%m-%d') if medicine.expiry_date else 'N/A',
-                'In Stock' if medicine.stock_quantity > 0 else 'Out of Stock'
-            ])
-    
-    return response
\ No newline at end of file
+    return response
+
+
+def _medicine_stock_row(medicine):
+    return [
+        medicine.medicine_id,
+        medicine.name,
+        medicine.category,
+        medicine.manufacturer or 'N/A',
+        medicine.stock_quantity,
+        float(medicine.purchase_price) if medicine.purchase_price else 0,
+        float(medicine.selling_price) if medicine.selling_price else 0,
+        medicine.expiry_date.strftime('%Y-%m-%d') if medicine.expiry_date else 'N/A',
+        'In Stock' if medicine.stock_quantity > 0 else 'Out of Stock'
+    ]
@@ -0,0 +1,7 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'object_id', 'body', 'updated_at']
+    list_filter = ['kind']
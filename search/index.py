@@ -0,0 +1,148 @@
+# search/index.py
+"""
+Full-text search over patients, doctors, bills and medical records.
+
+Each searchable object has one SearchDocument row holding its searchable
+text (IDs, names, phone numbers, diagnosis), so a search touches a single
+table instead of joining auth_user for every keystroke. The body is indexed
+by an SQLite FTS5 table (kept in sync by triggers) or, on PostgreSQL, by a
+GIN index over its tsvector; see migration 0002. Other databases fall back
+to a plain ``icontains`` scan of the document table.
+
+Documents are kept current by the signals in search.signals. Migration
+0003 indexes the rows that existed before, and the ``rebuild_search_index``
+command rebuilds the documents in bulk.
+"""
+import re
+
+from django.apps import apps as global_apps
+from django.db import connection
+from django.db.models import Case, When, Value, IntegerField
+from django.utils import timezone
+
+from .models import SearchDocument
+
+SEARCH_LIMIT = 500
+INDEX_CHUNK_SIZE = 2000
+
+FTS_TABLE = 'search_searchdocument_fts'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+# Model labels rather than classes, so a migration can index through its historical models
+SOURCES = {
+    'patient': ('patients.Patient', ['patient_id', 'user__first_name', 'user__last_name', 'phone_number']),
+    'doctor': ('doctors.Doctor', ['employee_id', 'user__first_name', 'user__last_name', 'specialization', 'phone_number']),
+    'bill': ('billing.Bill', ['bill_number', 'patient__patient_id', 'patient__user__first_name', 'patient__user__last_name']),
+    'medical_record': ('medical_records.MedicalRecord', ['patient__patient_id', 'patient__user__first_name',
+                                                         'patient__user__last_name', 'doctor__user__first_name',
+                                                         'doctor__user__last_name', 'diagnosis']),
+}
+
+
+def index_objects(kind, pks=None, apps=global_apps):
+    """
+    Create or refresh the documents for ``kind`` (all objects when ``pks`` is
+    None). Rows are read with values_list and upserted in chunks. Returns the
+    number of documents written.
+    """
+    label, fields = SOURCES[kind]
+    model = apps.get_model(label)
+    document_model = apps.get_model('search', 'SearchDocument')
+    rows = model.objects.order_by('pk')
+    if pks is not None:
+        rows = rows.filter(pk__in=list(pks))
+    rows = rows.values_list('pk', *fields)
+
+    now = timezone.now()
+    written = 0
+    documents = []
+    for pk, *values in rows.iterator(chunk_size=INDEX_CHUNK_SIZE):
+        documents.append(document_model(
+            kind=kind,
+            object_id=pk,
+            body=' '.join(str(value) for value in values if value),
+            updated_at=now,
+        ))
+        if len(documents) >= INDEX_CHUNK_SIZE:
+            written += _upsert(document_model, documents)
+            documents = []
+    if documents:
+        written += _upsert(document_model, documents)
+    return written
+
+
+def _upsert(document_model, documents):
+    document_model.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['body', 'updated_at'],
+    )
+    return len(documents)
+
+
+def remove_objects(kind, pks):
+    SearchDocument.objects.filter(kind=kind, object_id__in=list(pks)).delete()
+
+
+def rebuild_index(kinds=None, apps=global_apps):
+    """Reindex every object of the given kinds (all kinds by default)."""
+    document_model = apps.get_model('search', 'SearchDocument')
+    counts = {}
+    for kind in kinds or SOURCES:
+        document_model.objects.filter(kind=kind).delete()
+        counts[kind] = index_objects(kind, apps=apps)
+    return counts
+
+
+def _tokens(query):
+    return _TOKEN_RE.findall(query.lower())
+
+
+def search_ids(kind, query, limit=SEARCH_LIMIT):
+    """
+    Return the pks of ``kind`` objects matching every word of ``query`` as a
+    prefix, best match first.
+    """
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        sql = (
+            f'SELECT d.object_id FROM {FTS_TABLE} f '
+            f'JOIN search_searchdocument d ON d.id = f.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.kind = %s '
+            f'ORDER BY f.rank LIMIT %s'
+        )
+        params = [match, kind, limit]
+    elif connection.vendor == 'postgresql':
+        match = ' & '.join(f'{token}:*' for token in tokens)
+        sql = (
+            "SELECT object_id FROM search_searchdocument "
+            "WHERE kind = %s AND to_tsvector('simple', body) @@ to_tsquery('simple', %s) "
+            "ORDER BY ts_rank(to_tsvector('simple', body), to_tsquery('simple', %s)) DESC LIMIT %s"
+        )
+        params = [kind, match, match, limit]
+    else:
+        documents = SearchDocument.objects.filter(kind=kind)
+        for token in tokens:
+            documents = documents.filter(body__icontains=token)
+        return list(documents.values_list('object_id', flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_queryset(queryset, kind, query, limit=SEARCH_LIMIT):
+    """Restrict ``queryset`` to the search hits for ``query``, keeping rank order."""
+    ids = search_ids(kind, query, limit=limit)
+    if not ids:
+        return queryset.none()
+    rank = Case(*[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+                output_field=IntegerField())
+    return queryset.filter(pk__in=ids).order_by(rank)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import rebuild_index
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents (run once after installing, then kept current by signals)'
+
+    def add_arguments(self, parser):
+        # Checked in handle(): argparse rejects an empty list against ``choices`` for nargs='*'
+        parser.add_argument('kinds', nargs='*', help='Kinds to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        valid = [kind for kind, _ in SearchDocument.KIND_CHOICES]
+        unknown = set(options['kinds']) - set(valid)
+        if unknown:
+            raise CommandError(f'Unknown kind(s): {", ".join(sorted(unknown))}; choose from {", ".join(valid)}')
+        for kind, count in rebuild_index(options['kinds'] or None).items():
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {kind} document(s)'))
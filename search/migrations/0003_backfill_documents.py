@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def backfill_documents(apps, schema_editor):
+    # Rows saved before the search app was installed have no document yet
+    from search.index import rebuild_index
+    rebuild_index(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+        ('patients', '0001_initial'),
+        ('doctors', '0002_remove_doctor_experience_doctor_experience_years_and_more'),
+        ('billing', '0003_bill_billing_bil_status_db3467_idx_and_more'),
+        ('medical_records', '0004_medicalrecord_medical_rec_patient_8e3f47_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import models
+
+class SearchDocument(models.Model):
+    KIND_CHOICES = [
+        ('patient', 'Patient'),
+        ('doctor', 'Doctor'),
+        ('bill', 'Bill'),
+        ('medical_record', 'Medical Record'),
+    ]
+    
+    # Denormalized text of one searchable object; the full-text index is built over ``body``
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    body = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
+    
+    class Meta:
+        unique_together = ['kind', 'object_id']
@@ -0,0 +1,71 @@
+# search/signals.py
+"""Keep SearchDocument rows in step with the objects they describe."""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from billing.models import Bill
+from doctors.models import Doctor
+from medical_records.models import MedicalRecord
+from patients.models import Patient
+
+from .index import index_objects, remove_objects
+
+NAME_FIELDS = {'first_name', 'last_name'}
+
+
+def _reindex_patient_dependents(patient_ids):
+    # Bills and records carry the patient's ID and name in their documents
+    index_objects('bill', Bill.objects.filter(patient_id__in=patient_ids).values_list('pk', flat=True))
+    index_objects('medical_record', MedicalRecord.objects.filter(patient_id__in=patient_ids).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Patient)
+def index_patient(sender, instance, created, **kwargs):
+    index_objects('patient', [instance.pk])
+    if not created:
+        _reindex_patient_dependents([instance.pk])
+
+
+@receiver(post_save, sender=Doctor)
+def index_doctor(sender, instance, created, **kwargs):
+    index_objects('doctor', [instance.pk])
+    if not created:
+        index_objects('medical_record', instance.medical_records.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Bill)
+def index_bill(sender, instance, **kwargs):
+    index_objects('bill', [instance.pk])
+
+
+@receiver(post_save, sender=MedicalRecord)
+def index_medical_record(sender, instance, **kwargs):
+    index_objects('medical_record', [instance.pk])
+
+
+@receiver(post_save, sender=User)
+def reindex_user_names(sender, instance, created, update_fields=None, **kwargs):
+    # Skip new users (their patient/doctor row does not exist yet) and saves
+    # that cannot change a name, such as the last_login update on every login
+    if created or (update_fields is not None and not NAME_FIELDS & set(update_fields)):
+        return
+
+    patient_ids = list(Patient.objects.filter(user=instance).values_list('pk', flat=True))
+    if patient_ids:
+        index_objects('patient', patient_ids)
+        _reindex_patient_dependents(patient_ids)
+
+    doctor_ids = list(Doctor.objects.filter(user=instance).values_list('pk', flat=True))
+    if doctor_ids:
+        index_objects('doctor', doctor_ids)
+        index_objects('medical_record', MedicalRecord.objects.filter(doctor_id__in=doctor_ids).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Patient)
+@receiver(post_delete, sender=Doctor)
+@receiver(post_delete, sender=Bill)
+@receiver(post_delete, sender=MedicalRecord)
+def remove_document(sender, instance, **kwargs):
+    kind = {Patient: 'patient', Doctor: 'doctor', Bill: 'bill', MedicalRecord: 'medical_record'}[sender]
+    remove_objects(kind, [instance.pk])
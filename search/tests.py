@@ -0,0 +1,53 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from patients.models import Patient
+
+from .index import rebuild_index, search_ids
+from .models import SearchDocument
+
+
+class SearchIndexTests(TestCase):
+
+    def make_patient(self, first_name, last_name):
+        number = Patient.objects.count() + 1
+        user = User.objects.create_user(f'patient{number}', first_name=first_name, last_name=last_name)
+        return Patient.objects.create(
+            user=user, patient_id=f'PAT{number:05d}', date_of_birth=date(1990, 1, 1), gender='M',
+            blood_group='A+', phone_number='01700000000', address='Dhaka', emergency_contact='01800000000',
+        )
+
+    def test_documents_follow_saves_and_deletes(self):
+        patient = self.make_patient('Rahim', 'Uddin')
+        self.assertEqual(search_ids('patient', 'rah udd'), [patient.pk])
+
+        patient.user.last_name = 'Chowdhury'
+        patient.user.save()
+        self.assertEqual(search_ids('patient', 'udd'), [])
+        self.assertEqual(search_ids('patient', 'chow'), [patient.pk])
+
+        patient.delete()
+        self.assertEqual(search_ids('patient', 'rahim'), [])
+        self.assertFalse(SearchDocument.objects.exists())
+
+    def test_stronger_matches_rank_first(self):
+        weak = self.make_patient('Rahim', 'Uddin')
+        strong = self.make_patient('Rahim', 'Rahim')
+        self.make_patient('Karim', 'Uddin')
+        self.assertEqual(search_ids('patient', 'rahim'), [strong.pk, weak.pk])
+
+    def test_icontains_fallback_on_other_databases(self):
+        patient = self.make_patient('Rahim', 'Uddin')
+        self.make_patient('Karim', 'Uddin')
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            self.assertEqual(search_ids('patient', 'him udd'), [patient.pk])
+
+    def test_rebuild_indexes_rows_without_documents(self):
+        patient = self.make_patient('Rahim', 'Uddin')
+        SearchDocument.objects.all().delete()
+        self.assertEqual(rebuild_index(['patient']), {'patient': 1})
+        self.assertEqual(search_ids('patient', 'rahim'), [patient.pk])
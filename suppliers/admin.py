@@ -1,6 +1,6 @@
 # suppliers/admin.py
 from django.contrib import admin
-from .models import Supplier, PurchaseOrder, PurchaseOrderItem
+from .models import Supplier, PurchaseOrder, PurchaseOrderItem, SupplierPerformance
 
 @admin.register(Supplier)
 class SupplierAdmin(admin.ModelAdmin):
@@ -8,12 +8,31 @@ class SupplierAdmin(admin.ModelAdmin):
     list_filter = ['category', 'status']
     search_fields = ['supplier_id', 'company_name']
 
+class PurchaseOrderItemInline(admin.TabularInline):
+    model = PurchaseOrderItem
+    extra = 0
+    raw_id_fields = ['medicine']
+    readonly_fields = ['total_price']
+
 @admin.register(PurchaseOrder)
 class PurchaseOrderAdmin(admin.ModelAdmin):
-    list_display = ['order_number', 'supplier', 'order_date', 'total_amount', 'status']
+    list_display = ['order_number', 'supplier', 'order_date', 'total_amount', 'status', 'received_at']
     list_filter = ['status', 'order_date']
+    readonly_fields = ['total_amount', 'received_at']
+    inlines = [PurchaseOrderItemInline]
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        form.instance.update_total()
 
 @admin.register(PurchaseOrderItem)
 class PurchaseOrderItemAdmin(admin.ModelAdmin):
-    list_display = ['purchase_order', 'item_name', 'quantity', 'unit_price', 'total_price']
+    list_display = ['purchase_order', 'item_name', 'medicine', 'quantity', 'unit_price', 'total_price']
+    raw_id_fields = ['purchase_order', 'medicine']
+
 
+@admin.register(SupplierPerformance)
+class SupplierPerformanceAdmin(admin.ModelAdmin):
+    list_display = ['supplier', 'order_count', 'delivered_count', 'total_spend', 'on_time_ratio', 'avg_lead_days', 'refreshed_at']
+    search_fields = ['supplier__company_name', 'supplier__supplier_id']
+    readonly_fields = ['refreshed_at']
@@ -0,0 +1,80 @@
+# suppliers/analytics.py
+"""
+Supplier performance figures.
+
+Order count, spend, on-time ratio, fill ratio and average lead time are computed for any
+number of suppliers with one grouped query over PurchaseOrder, and cached in
+SupplierPerformance. A supplier's row is refreshed whenever one of its orders
+changes status (see suppliers.signals), so the comparison page only reads the
+cached table.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Sum, Avg, F, Q, DurationField, ExpressionWrapper
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Supplier, PurchaseOrder, SupplierPerformance
+
+DELIVERED = Q(status='DELIVERED', received_at__isnull=False)
+
+
+def performance_rows(supplier_ids=None):
+    """Yield one dict of raw figures per supplier that has orders (one query)."""
+    orders = PurchaseOrder.objects.all()
+    if supplier_ids is not None:
+        orders = orders.filter(supplier_id__in=supplier_ids)
+
+    lead_time = ExpressionWrapper(TruncDate('received_at') - F('order_date'), output_field=DurationField())
+    return orders.order_by().values('supplier_id').annotate(
+        order_count=Count('pk', filter=~Q(status='CANCELLED')),
+        delivered_count=Count('pk', filter=DELIVERED),
+        total_spend=Sum('total_amount', filter=DELIVERED),
+        due_count=Count('pk', filter=DELIVERED & Q(expected_delivery__isnull=False)),
+        on_time_count=Count('pk', filter=DELIVERED & Q(received_at__date__lte=F('expected_delivery'))),
+        avg_lead=Avg(lead_time, filter=DELIVERED),
+    )
+
+
+def refresh_supplier_performance(supplier_ids=None):
+    """Recompute and upsert SupplierPerformance for the given suppliers (all by default)."""
+    if supplier_ids is None:
+        supplier_ids = list(Supplier.objects.values_list('pk', flat=True))
+    supplier_ids = list(supplier_ids)
+    rows = {row['supplier_id']: row for row in performance_rows(supplier_ids)}
+    now = timezone.now()
+
+    performance = []
+    for supplier_id in supplier_ids:
+        row = rows.get(supplier_id, {})
+        due_count = row.get('due_count') or 0
+        order_count = row.get('order_count') or 0
+        avg_lead = row.get('avg_lead')
+        performance.append(SupplierPerformance(
+            supplier_id=supplier_id,
+            order_count=order_count,
+            delivered_count=row.get('delivered_count') or 0,
+            total_spend=row.get('total_spend') or 0,
+            on_time_count=row.get('on_time_count') or 0,
+            on_time_ratio=(
+                Decimal(row['on_time_count'] * 100 / due_count).quantize(Decimal('0.01')) if due_count else None
+            ),
+            fill_ratio=(
+                Decimal(row['delivered_count'] * 100 / order_count).quantize(Decimal('0.01')) if order_count else None
+            ),
+            avg_lead_days=(
+                Decimal(avg_lead / timedelta(days=1)).quantize(Decimal('0.1')) if avg_lead is not None else None
+            ),
+            refreshed_at=now,
+        ))
+
+    SupplierPerformance.objects.bulk_create(
+        performance,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['supplier'],
+        update_fields=['order_count', 'delivered_count', 'total_spend', 'on_time_count',
+                       'on_time_ratio', 'fill_ratio', 'avg_lead_days', 'refreshed_at'],
+    )
+    return len(performance)
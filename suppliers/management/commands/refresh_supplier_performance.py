@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from suppliers.analytics import refresh_supplier_performance
+
+
+class Command(BaseCommand):
+    help = 'Recompute cached supplier performance figures for every supplier'
+
+    def handle(self, *args, **options):
+        count = refresh_supplier_performance()
+        self.stdout.write(self.style.SUCCESS(f'Refreshed performance for {count} supplier(s)'))
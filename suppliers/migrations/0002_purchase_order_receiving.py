@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def link_items_to_medicines(apps, schema_editor):
+    """Link existing items whose name matches a medicine (case-insensitive)"""
+    Medicine = apps.get_model('pharmacy', 'Medicine')
+    PurchaseOrderItem = apps.get_model('suppliers', 'PurchaseOrderItem')
+    medicines = {}
+    for pk, name in Medicine.objects.order_by('-pk').values_list('pk', 'name'):
+        medicines[name.strip().lower()] = pk
+    for item in PurchaseOrderItem.objects.filter(medicine__isnull=True).iterator():
+        medicine_id = medicines.get(item.item_name.strip().lower())
+        if medicine_id:
+            PurchaseOrderItem.objects.filter(pk=item.pk).update(medicine_id=medicine_id)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pharmacy', '0006_expiry_sweep'),
+        ('suppliers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='received_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='purchaseorderitem',
+            name='expiry_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='purchaseorderitem',
+            name='lot_number',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='purchaseorderitem',
+            name='medicine',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purchase_order_items', to='pharmacy.medicine'),
+        ),
+        migrations.RunPython(link_items_to_medicines, migrations.RunPython.noop),
+    ]
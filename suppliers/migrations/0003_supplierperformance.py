@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suppliers', '0002_purchase_order_receiving'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplierPerformance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_count', models.IntegerField(default=0)),
+                ('delivered_count', models.IntegerField(default=0)),
+                ('total_spend', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('on_time_count', models.IntegerField(default=0)),
+                ('on_time_ratio', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('avg_lead_days', models.DecimalField(blank=True, decimal_places=1, max_digits=6, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+                ('supplier', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='performance', to='suppliers.supplier')),
+            ],
+            options={
+                'ordering': ['supplier__company_name'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('suppliers', '0003_supplierperformance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplierperformance',
+            name='fill_ratio',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+    ]
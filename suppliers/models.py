@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Sum, F
 from django.core.validators import MinValueValidator
 
 class Supplier(models.Model):
@@ -64,26 +65,59 @@ class PurchaseOrder(models.Model):
     total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     notes = models.TextField(blank=True)
+    received_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.order_number} - {self.supplier.company_name}"
     
+    def update_total(self):
+        """Recompute total_amount from the items with one aggregate query"""
+        self.total_amount = self.items.aggregate(
+            total=Sum(F('quantity') * F('unit_price'))
+        )['total'] or 0
+        PurchaseOrder.objects.filter(pk=self.pk).update(total_amount=self.total_amount)
+        return self.total_amount
+    
     class Meta:
         ordering = ['-order_date']
 
 
 class PurchaseOrderItem(models.Model):
     purchase_order = models.ForeignKey(PurchaseOrder, on_delete=models.CASCADE, related_name='items')
+    medicine = models.ForeignKey('pharmacy.Medicine', on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='purchase_order_items')
     item_name = models.CharField(max_length=200)
     quantity = models.IntegerField(validators=[MinValueValidator(1)])
     unit_price = models.DecimalField(max_digits=10, decimal_places=2)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    lot_number = models.CharField(max_length=50, blank=True)  # Batch received; defaults to the order number
+    expiry_date = models.DateField(null=True, blank=True)
     
     def save(self, *args, **kwargs):
         self.total_price = self.quantity * self.unit_price
+        if self.medicine_id and not self.item_name:
+            self.item_name = self.medicine.name
         super().save(*args, **kwargs)
     
     def __str__(self):
-        return f"{self.item_name} - {self.quantity} units"
\ No newline at end of file
+        return f"{self.item_name} - {self.quantity} units"
+
+class SupplierPerformance(models.Model):
+    # Cached figures per supplier, refreshed by suppliers.analytics whenever an order changes status
+    supplier = models.OneToOneField(Supplier, on_delete=models.CASCADE, related_name='performance')
+    order_count = models.IntegerField(default=0)
+    delivered_count = models.IntegerField(default=0)
+    total_spend = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Delivered orders only
+    on_time_count = models.IntegerField(default=0)
+    on_time_ratio = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # Percent of delivered orders with a due date
+    fill_ratio = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # Percent of orders (not cancelled) delivered
+    avg_lead_days = models.DecimalField(max_digits=6, decimal_places=1, null=True, blank=True)
+    refreshed_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.supplier.company_name} performance"
+    
+    class Meta:
+        ordering = ['supplier__company_name']
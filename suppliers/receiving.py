@@ -0,0 +1,126 @@
+# suppliers/receiving.py
+"""
+Receiving purchase orders into pharmacy stock.
+
+On delivery every item linked to a Medicine is received at once: medicine
+stock is raised with one UPDATE ... CASE, lots that already exist are topped
+up with another, new lots are bulk-inserted, and RECEIPT movements are
+written in batches. Items without a linked medicine (equipment, stationery,
+...) are left out of inventory. An order with a lot that has already
+expired is refused as a whole, so expired stock never becomes saleable.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Case, When, Value, IntegerField, Q
+from django.utils import timezone
+
+from pharmacy.expiry import rebuild_expiry_buckets
+from pharmacy.models import Medicine, MedicineBatch, StockMovement
+from pharmacy.stock import refresh_expiry_dates
+
+from .models import PurchaseOrder
+
+
+class ReceivingError(Exception):
+    """Raised when a purchase order cannot be received."""
+
+
+def _bulk_increment(queryset, amounts, field):
+    """Add ``amounts[pk]`` to ``field`` for each row, in one UPDATE ... CASE."""
+    if not amounts:
+        return 0
+    return queryset.filter(pk__in=amounts).update(**{
+        field: F(field) + Case(
+            *[When(pk=pk, then=Value(amount)) for pk, amount in amounts.items()],
+            output_field=IntegerField(),
+        ),
+    })
+
+
+def receive_purchase_order(order, user=None):
+    """
+    Mark ``order`` DELIVERED and add its medicine items to stock.
+
+    Returns the number of StockMovement rows written. Raises ReceivingError
+    if the order was already delivered or is cancelled, or if any lot has
+    already expired.
+    """
+    user = user if user is not None and user.is_authenticated else None
+
+    with transaction.atomic():
+        # Lock the order so it cannot be received twice concurrently
+        order = PurchaseOrder.objects.select_for_update().get(pk=order.pk)
+        if order.status in ('DELIVERED', 'CANCELLED'):
+            raise ReceivingError(f'Purchase order {order.order_number} is already {order.get_status_display().lower()}')
+
+        items = list(order.items.filter(medicine__isnull=False).select_related('medicine'))
+        today = timezone.now().date()
+        expired = [item.item_name for item in items if (item.expiry_date or item.medicine.expiry_date) < today]
+        if expired:
+            raise ReceivingError(f'Cannot receive {order.order_number}: expired stock for {", ".join(expired)}')
+
+        # Quantities per medicine and per (medicine, lot, expiry)
+        per_medicine = defaultdict(int)
+        per_lot = {}
+        for item in items:
+            lot = (item.medicine_id, item.lot_number or order.order_number, item.expiry_date or item.medicine.expiry_date)
+            per_medicine[item.medicine_id] += item.quantity
+            if lot in per_lot:
+                per_lot[lot]['quantity'] += item.quantity
+            else:
+                per_lot[lot] = {'quantity': item.quantity, 'cost_price': item.unit_price}
+
+        movements = []
+        if per_lot:
+            _bulk_increment(Medicine.objects.all(), per_medicine, 'stock_quantity')
+
+            lots = Q()
+            for medicine_id, lot_number, expiry_date in per_lot:
+                lots |= Q(medicine_id=medicine_id, lot_number=lot_number, expiry_date=expiry_date)
+            batches = {
+                (batch.medicine_id, batch.lot_number, batch.expiry_date): batch
+                for batch in MedicineBatch.objects.select_for_update().filter(lots).only(
+                    'pk', 'medicine_id', 'lot_number', 'expiry_date')
+            }
+            _bulk_increment(
+                MedicineBatch.objects.all(),
+                {batch.pk: per_lot[lot]['quantity'] for lot, batch in batches.items()},
+                'quantity',
+            )
+
+            new_batches = MedicineBatch.objects.bulk_create([
+                MedicineBatch(
+                    medicine_id=medicine_id,
+                    lot_number=lot_number,
+                    quantity=lot['quantity'],
+                    expiry_date=expiry_date,
+                    cost_price=lot['cost_price'],
+                )
+                for (medicine_id, lot_number, expiry_date), lot in per_lot.items()
+                if (medicine_id, lot_number, expiry_date) not in batches
+            ])
+            batches.update({(batch.medicine_id, batch.lot_number, batch.expiry_date): batch for batch in new_batches})
+
+            note = f'Received on purchase order {order.order_number}'
+            movements = StockMovement.objects.bulk_create([
+                StockMovement(
+                    medicine_id=medicine_id,
+                    batch_id=batches[(medicine_id, lot_number, expiry_date)].pk,
+                    delta=lot['quantity'],
+                    reason='RECEIPT',
+                    user=user,
+                    note=note,
+                )
+                for (medicine_id, lot_number, expiry_date), lot in per_lot.items()
+            ], batch_size=500)
+
+            refresh_expiry_dates(list(per_medicine))
+            rebuild_expiry_buckets(medicine_ids=list(per_medicine))
+
+        order.update_total()
+        order.status = 'DELIVERED'
+        order.received_at = timezone.now()
+        order.save(update_fields=['status', 'received_at', 'updated_at'])
+
+    return len(movements)
@@ -0,0 +1,23 @@
+# suppliers/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .analytics import refresh_supplier_performance
+from .models import PurchaseOrder
+
+
+def _refresh_later(supplier_id):
+    # Run after commit so the figures see the saved order
+    transaction.on_commit(lambda: refresh_supplier_performance([supplier_id]))
+
+
+@receiver(post_save, sender=PurchaseOrder)
+def refresh_on_order_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'status' in update_fields:
+        _refresh_later(instance.supplier_id)
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+def refresh_on_order_delete(sender, instance, **kwargs):
+    _refresh_later(instance.supplier_id)
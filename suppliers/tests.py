@@ -1,3 +1,215 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from hospital_management.testing import DetailQueryTestCase
+from pharmacy.models import Medicine, StockMovement
+from pharmacy.stock import receive_stock
+
+from .analytics import refresh_supplier_performance
+from .models import Supplier, PurchaseOrder, PurchaseOrderItem, SupplierPerformance
+from .receiving import ReceivingError, receive_purchase_order
+
+
+class PurchaseOrderDetailQueryTests(DetailQueryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        supplier = Supplier.objects.create(
+            supplier_id='SUP001', company_name='Square Pharma', contact_person='Rahim',
+            email='sales@example.com', phone='01700000000', address='Dhaka',
+        )
+        self.order = PurchaseOrder.objects.create(order_number='PO-0001', supplier=supplier, order_date=date(2024, 1, 10))
+
+    def add_items(self, number):
+        for _ in range(number):
+            medicine = Medicine.objects.create(
+                medicine_id=f'MED{Medicine.objects.count() + 1:04d}', name='Napa', category='Tablet',
+                manufacturer='Beximco', unit='Strip', expiry_date=date(2026, 1, 1),
+                purchase_price=1, selling_price=2,
+            )
+            PurchaseOrderItem.objects.create(purchase_order=self.order, medicine=medicine, quantity=10, unit_price=1)
+
+    def test_purchase_order_detail_query_count_is_fixed(self):
+        # Order with its supplier, then the items with their medicines
+        self.add_items(1)
+        self.assertDetailQueries('suppliers:purchase_order_detail', self.order.pk, 2)
+        self.add_items(4)
+        self.assertDetailQueries('suppliers:purchase_order_detail', self.order.pk, 2)
+
+
+class ReceivePurchaseOrderTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.supplier = Supplier.objects.create(
+            supplier_id='SUP001', company_name='Square Pharma', contact_person='Rahim', category='MEDICINE',
+            email='sales@example.com', phone='01700000000', address='Dhaka',
+        )
+        self.napa = self.make_medicine('Napa')
+        self.seclo = self.make_medicine('Seclo')
+        receive_stock(self.napa, 20, lot_number='L1', expiry_date=self.expires_in(200))
+
+    def make_medicine(self, name):
+        return Medicine.objects.create(
+            medicine_id=f'MED-{name}', name=name, category='Analgesic', manufacturer='Square', unit='Strip',
+            expiry_date=self.today + timedelta(days=365), purchase_price=1, selling_price=2,
+        )
+
+    def expires_in(self, days):
+        return self.today + timedelta(days=days)
+
+    def make_order(self, *items):
+        order = PurchaseOrder.objects.create(order_number=f'PO-{PurchaseOrder.objects.count() + 1}',
+                                             supplier=self.supplier, order_date=self.today)
+        for medicine, quantity, unit_price, lot_number, expiry_date in items:
+            PurchaseOrderItem.objects.create(
+                purchase_order=order, medicine=medicine, item_name=medicine.name if medicine else 'Gloves',
+                quantity=quantity, unit_price=unit_price, lot_number=lot_number, expiry_date=expiry_date,
+            )
+        return order
+
+    def test_receiving_adds_every_lot_to_stock_in_bulk(self):
+        order = self.make_order(
+            (self.napa, 10, Decimal('1.50'), 'L1', self.expires_in(200)),  # Tops up the existing lot
+            (self.napa, 5, Decimal('1.60'), 'L2', self.expires_in(300)),
+            (self.seclo, 8, Decimal('3.00'), '', None),  # Lot and expiry default to the order and the medicine
+            (None, 2, Decimal('50.00'), '', None),  # Not a medicine: left out of stock
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(receive_purchase_order(order), 3)
+        stock_updates = [query['sql'] for query in queries.captured_queries
+                         if query['sql'].startswith('UPDATE "pharmacy_medicine" SET "stock_quantity"')]
+        self.assertEqual(len(stock_updates), 1)
+        self.assertIn('CASE', stock_updates[0])
+
+        self.napa.refresh_from_db()
+        self.seclo.refresh_from_db()
+        self.assertEqual((self.napa.stock_quantity, self.seclo.stock_quantity), (35, 8))
+        self.assertEqual(dict(self.napa.batches.values_list('lot_number', 'quantity')), {'L1': 30, 'L2': 5})
+        seclo_batch = self.seclo.batches.get()
+        self.assertEqual((seclo_batch.lot_number, seclo_batch.expiry_date, seclo_batch.cost_price),
+                         (order.order_number, self.seclo.expiry_date, Decimal('3.00')))
+        receipts = StockMovement.objects.filter(note=f'Received on purchase order {order.order_number}')
+        self.assertEqual(sorted(receipts.values_list('batch__lot_number', 'delta')),
+                         [('L1', 10), ('L2', 5), (order.order_number, 8)])
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'DELIVERED')
+        self.assertIsNotNone(order.received_at)
+        self.assertEqual(order.total_amount, Decimal('147.00'))
+
+    def test_an_order_is_received_once(self):
+        order = self.make_order((self.seclo, 8, Decimal('3.00'), '', None))
+        receive_purchase_order(order)
+        with self.assertRaisesMessage(ReceivingError, 'already delivered'):
+            receive_purchase_order(order)
+        self.seclo.refresh_from_db()
+        self.assertEqual(self.seclo.stock_quantity, 8)
+        self.assertEqual(StockMovement.objects.filter(medicine=self.seclo).count(), 1)
+
+    def test_expired_lots_are_refused(self):
+        order = self.make_order(
+            (self.seclo, 8, Decimal('3.00'), 'FRESH', self.expires_in(100)),
+            (self.napa, 5, Decimal('1.00'), 'OLD', self.expires_in(-1)),
+        )
+        with self.assertRaisesMessage(ReceivingError, 'expired stock for Napa'):
+            receive_purchase_order(order)
+        order.refresh_from_db()
+        self.seclo.refresh_from_db()
+        self.assertEqual((order.status, self.seclo.stock_quantity), ('PENDING', 0))
+        self.assertFalse(self.seclo.batches.exists())
+
+
+class SupplierPerformanceTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.supplier = Supplier.objects.create(
+            supplier_id='SUP001', company_name='Square Pharma', contact_person='Rahim', category='MEDICINE',
+            email='sales@example.com', phone='01700000000', address='Dhaka',
+        )
+
+    def days_ago(self, days):
+        return self.today - timedelta(days=days)
+
+    def make_order(self, total, status='PENDING', ordered=10, expected=None, received=None):
+        order = PurchaseOrder.objects.create(
+            order_number=f'PO-{PurchaseOrder.objects.count() + 1}', supplier=self.supplier,
+            order_date=self.days_ago(ordered), expected_delivery=expected and self.days_ago(expected),
+            total_amount=total, status=status,
+        )
+        if received is not None:
+            PurchaseOrder.objects.filter(pk=order.pk).update(
+                received_at=timezone.make_aware(datetime.combine(self.days_ago(received), time(12))),
+            )
+        return order
+
+    def test_figures_come_from_one_grouped_query(self):
+        self.make_order(100, 'DELIVERED', ordered=10, expected=3, received=5)   # on time, 5 days
+        self.make_order(50, 'DELIVERED', ordered=10, expected=6, received=3)    # late, 7 days
+        self.make_order(20, 'DELIVERED', ordered=4, received=2)                 # no due date, 2 days
+        self.make_order(30)
+        self.make_order(999, 'CANCELLED')
+
+        refresh_supplier_performance([self.supplier.pk])
+
+        performance = self.supplier.performance
+        self.assertEqual((performance.order_count, performance.delivered_count), (4, 3))
+        self.assertEqual(performance.total_spend, Decimal('170.00'))
+        self.assertEqual(performance.on_time_count, 1)
+        self.assertEqual(performance.on_time_ratio, Decimal('50.00'))
+        self.assertEqual(performance.fill_ratio, Decimal('75.00'))
+        self.assertEqual(performance.avg_lead_days, Decimal('4.7'))
+
+    def test_a_supplier_without_orders_has_no_ratios(self):
+        refresh_supplier_performance()
+        performance = self.supplier.performance
+        self.assertEqual((performance.order_count, performance.total_spend), (0, 0))
+        self.assertIsNone(performance.on_time_ratio)
+        self.assertIsNone(performance.fill_ratio)
+        self.assertIsNone(performance.avg_lead_days)
+
+    def test_refresh_updates_the_existing_row(self):
+        self.make_order(100, 'DELIVERED', ordered=5, received=1)
+        refresh_supplier_performance([self.supplier.pk])
+        first = SupplierPerformance.objects.get()
+
+        self.make_order(40)
+        refresh_supplier_performance([self.supplier.pk])
+
+        second = SupplierPerformance.objects.get()
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual((second.order_count, second.fill_ratio), (2, Decimal('50.00')))
+        self.assertGreater(second.refreshed_at, first.refreshed_at)
+
+    def test_saving_an_order_refreshes_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            order = self.make_order(80)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.supplier.performance.order_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'CANCELLED'
+            order.save(update_fields=['status'])
+        self.supplier.performance.refresh_from_db()
+        self.assertEqual(self.supplier.performance.order_count, 0)
+
+    def test_unrelated_field_updates_do_not_refresh(self):
+        order = self.make_order(80)
+        with self.captureOnCommitCallbacks() as callbacks:
+            order.notes = 'Call before delivery'
+            order.save(update_fields=['notes'])
+        self.assertEqual(callbacks, [])
 
-# Create your tests here.
+    def test_deleting_an_order_refreshes_after_commit(self):
+        order = self.make_order(80)
+        refresh_supplier_performance([self.supplier.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            order.delete()
+        self.supplier.performance.refresh_from_db()
+        self.assertEqual(self.supplier.performance.order_count, 0)
@@ -7,6 +7,7 @@ urlpatterns = [
     # Supplier Management
     path('', views.supplier_list, name='supplier_list'),
     path('create/', views.supplier_create, name='supplier_create'),
+    path('performance/', views.supplier_performance, name='supplier_performance'),
     path('<int:pk>/', views.supplier_detail, name='supplier_detail'),
     path('<int:pk>/update/', views.supplier_update, name='supplier_update'),
     path('<int:pk>/delete/', views.supplier_delete, name='supplier_delete'),
@@ -16,4 +17,5 @@ urlpatterns = [
     path('orders/create/', views.purchase_order_create, name='purchase_order_create'),
     path('orders/<int:pk>/', views.purchase_order_detail, name='purchase_order_detail'),
     path('orders/<int:pk>/update/', views.purchase_order_update, name='purchase_order_update'),
+    path('orders/<int:pk>/receive/', views.purchase_order_receive, name='purchase_order_receive'),
 ]
\ No newline at end of file
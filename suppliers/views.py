@@ -1,7 +1,18 @@
 # suppliers/views.py
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from .models import Supplier, PurchaseOrder
+from django.contrib import messages
+from django.db.models import F, Prefetch
+from hospital_management.detail import DetailGraph
+from .models import Supplier, PurchaseOrder, PurchaseOrderItem, SupplierPerformance
+from .receiving import receive_purchase_order, ReceivingError
+
+PURCHASE_ORDER_DETAIL = DetailGraph(
+    'suppliers:purchase_order_detail', PurchaseOrder,
+    select_related=['supplier'],
+    prefetch_related=[Prefetch('items', queryset=PurchaseOrderItem.objects.select_related('medicine'))],
+)
+
 
 @login_required
 def supplier_list(request):
@@ -11,7 +22,39 @@ def supplier_list(request):
 @login_required
 def supplier_detail(request, pk):
     supplier = get_object_or_404(Supplier, pk=pk)
-    return render(request, 'suppliers/supplier_detail.html', {'supplier': supplier})
+    performance = SupplierPerformance.objects.filter(supplier=supplier).first()
+    recent_orders = supplier.purchase_orders.all()[:10]
+    return render(request, 'suppliers/supplier_detail.html', {
+        'supplier': supplier,
+        'performance': performance,
+        'recent_orders': recent_orders,
+    })
+
+SUPPLIER_PERFORMANCE_SORTS = {
+    'spend': F('total_spend').desc(),
+    'orders': F('order_count').desc(),
+    'on_time': F('on_time_ratio').desc(nulls_last=True),
+    'fill_rate': F('fill_ratio').desc(nulls_last=True),
+    'lead_time': F('avg_lead_days').asc(nulls_last=True),
+    'name': F('supplier__company_name').asc(),
+}
+
+@login_required
+def supplier_performance(request):
+    """Compare cached performance figures across all suppliers"""
+    sort = request.GET.get('sort', 'spend')
+    rows = SupplierPerformance.objects.select_related('supplier').order_by(
+        SUPPLIER_PERFORMANCE_SORTS.get(sort, SUPPLIER_PERFORMANCE_SORTS['spend']), 'supplier__company_name'
+    )
+    category = request.GET.get('category', '')
+    if category:
+        rows = rows.filter(supplier__category=category)
+    return render(request, 'suppliers/supplier_performance.html', {
+        'rows': rows,
+        'sort': sort,
+        'category': category,
+        'category_choices': Supplier.CATEGORY_CHOICES,
+    })
 
 @login_required
 def supplier_create(request):
@@ -41,8 +84,21 @@ def purchase_order_create(request):
 
 @login_required
 def purchase_order_detail(request, pk):
+    order = PURCHASE_ORDER_DETAIL.get_or_404(pk=pk)
+    items = order.items.all()
+    return render(request, 'suppliers/purchase_order_detail.html', {'order': order, 'items': items})
+
+@login_required
+def purchase_order_receive(request, pk):
+    """Mark a purchase order delivered and receive its medicines into stock"""
     order = get_object_or_404(PurchaseOrder, pk=pk)
-    return render(request, 'suppliers/purchase_order_detail.html', {'order': order})
+    if request.method == 'POST':
+        try:
+            received = receive_purchase_order(order, user=request.user)
+            messages.success(request, f'Purchase order {order.order_number} received ({received} stock entries)')
+        except ReceivingError as e:
+            messages.error(request, str(e))
+    return redirect('suppliers:purchase_order_detail', pk=pk)
 
 @login_required
 def purchase_order_update(request, pk):